@@ -0,0 +1,95 @@
+import os
+import json
+import argparse
+from typing import List
+
+from config import MODULES_CONFIG_JSON_PATH
+from utils.catalog_diff_utils import (
+    CatalogPatch, load_catalog, save_catalog, diff_catalogs, apply_patch_chain, count_patch_operations,
+)
+
+# 公開中の設定ファイルが置かれているディレクトリ
+DEFAULT_CATALOG_DIR = os.path.dirname(MODULES_CONFIG_JSON_PATH)
+
+
+def write_patch(patch: CatalogPatch, path: str) -> None:
+    """パッチを空白を省いたJSONとして書き込む。"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(patch, f, ensure_ascii=False, separators=(',', ':'))
+
+def read_patches(paths: List[str]) -> List[CatalogPatch]:
+    """パッチファイルを指定順に読み込む。"""
+    patches: List[CatalogPatch] = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            patches.append(json.load(f))
+    return patches
+
+def run_diff(args: argparse.Namespace) -> None:
+    """2つのカタログディレクトリの差分パッチを生成する。"""
+    try:
+        base = load_catalog(args.base_dir)
+        target = load_catalog(args.target_dir)
+    except (OSError, ValueError) as e:
+        print(f"[FATAL ERROR] Failed to load catalog: {e}")
+        return
+    patch = diff_catalogs(base, target)
+    write_patch(patch, args.output)
+
+    counts = count_patch_operations(patch)
+    print(f"[ACTION] Patch written to: {args.output} ({os.path.getsize(args.output)} bytes)")
+    print(
+        f"[INFO] adds: {counts['adds']}, updates: {counts['updates']}, "
+        f"deletes: {counts['deletes']}, orders: {counts['orders']}"
+    )
+    print(f"[INFO] base: {patch['baseHash'][:12]} -> target: {patch['targetHash'][:12]}")
+
+def run_apply(args: argparse.Namespace) -> None:
+    """カタログディレクトリにパッチのチェーンを適用する。"""
+    try:
+        catalog = load_catalog(args.base_dir)
+    except (OSError, ValueError) as e:
+        print(f"[FATAL ERROR] Failed to load catalog: {e}")
+        return
+    patches = read_patches(args.patches)
+    try:
+        result = apply_patch_chain(catalog, patches)
+    except ValueError as e:
+        print(f"[FATAL ERROR] Failed to apply patches: {e}")
+        return
+
+    output_dir = args.output_dir or args.base_dir
+    save_catalog(output_dir, result)
+    print(f"[ACTION] {len(patches)} patch(es) applied. Catalog saved to: {output_dir}")
+    if patches:
+        print(f"[INFO] Catalog hash: {patches[-1]['targetHash'][:12]}")
+
+def main():
+    """コマンドライン引数を処理し、差分生成またはパッチ適用を実行します。"""
+    parser = argparse.ArgumentParser(
+        description="設定カタログ (seeds/plants/modules_config.json) の差分パッチを生成・適用します。"
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    diff_parser = subparsers.add_parser('diff', help="2つのカタログの差分パッチを生成する")
+    diff_parser.add_argument('--base-dir', required=True, help="変更前のカタログディレクトリ")
+    diff_parser.add_argument(
+        '--target-dir',
+        default=DEFAULT_CATALOG_DIR,
+        help=f"変更後のカタログディレクトリ (デフォルト: {DEFAULT_CATALOG_DIR})"
+    )
+    diff_parser.add_argument('-o', '--output', required=True, help="出力するパッチファイルのパス")
+    diff_parser.set_defaults(func=run_diff)
+
+    apply_parser = subparsers.add_parser('apply', help="カタログにパッチを順に適用する")
+    apply_parser.add_argument('--base-dir', required=True, help="パッチ適用前のカタログディレクトリ")
+    apply_parser.add_argument('--output-dir', default=None, help="出力先 (省略時はbase-dirを上書き)")
+    apply_parser.add_argument('patches', nargs='+', help="適用するパッチファイル (適用順)")
+    apply_parser.set_defaults(func=run_apply)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+import argparse
+
+from config import ROOT_DIR_KEY, SEEDS_DIR_KEY, PLANTS_DIR_KEY, PARTS_DIR_KEY, MODULES_DIR_KEY
+from utils.module_config_utils import get_directory_keys
+from utils.catalog_migration_utils import (
+    DEFAULT_MOVE_WORKERS, MigrationPlan, parse_seed_renames, parse_plant_renames,
+    plan_migration, run_migration, load_current_catalog, recover_interrupted_commit,
+)
+
+# --dry-run で表示する移動計画の最大件数
+PREVIEW_MOVE_COUNT = 10
+
+
+def print_plan(plan: MigrationPlan) -> None:
+    """移行計画の概要を表示する。"""
+    for plant_key, new_plant_key in plan['renamed_plants'].items():
+        print(f"[INFO] Rename plant key: {plant_key} -> {new_plant_key}")
+    print(f"[INFO] Modules rewritten: {plan['rewritten_modules']}, assets to move: {len(plan['moves'])}")
+    for source, destination in plan['moves'][:PREVIEW_MOVE_COUNT]:
+        print(f"    {source} -> {destination}")
+    if len(plan['moves']) > PREVIEW_MOVE_COUNT:
+        print(f"    ... and {len(plan['moves']) - PREVIEW_MOVE_COUNT} more")
+    if plan['dropped_atlas_frames']:
+        print(
+            f"[INFO] atlasFrame removed from {plan['dropped_atlas_frames']} moved module(s). "
+            f"{len(plan['stale_atlases'])} atlas(es) will be removed and rebuilt after the migration."
+        )
+
+def main():
+    """コマンドライン引数を処理し、カタログの一括移行を実行します。"""
+    parser = argparse.ArgumentParser(
+        description="Seed/Plantの名前変更やディレクトリ構成の変更に合わせて、設定カタログと画像アセットを一括で移行します。"
+    )
+    parser.add_argument('--rename-seed', action='append', default=[], metavar='OLD=NEW', help="Seedの名前変更 (複数指定可)")
+    parser.add_argument('--rename-plant', action='append', default=[], metavar='SEED/OLD=NEW', help="Plantの名前変更 (複数指定可)")
+    parser.add_argument('--root-dir-key', default=ROOT_DIR_KEY, help=f"移行後の ROOT_DIR_KEY (デフォルト: {ROOT_DIR_KEY})")
+    parser.add_argument('--seeds-dir-key', default=SEEDS_DIR_KEY, help=f"移行後の SEEDS_DIR_KEY (デフォルト: {SEEDS_DIR_KEY})")
+    parser.add_argument('--plants-dir-key', default=PLANTS_DIR_KEY, help=f"移行後の PLANTS_DIR_KEY (デフォルト: {PLANTS_DIR_KEY})")
+    parser.add_argument('--parts-dir-key', default=PARTS_DIR_KEY, help=f"移行後の PARTS_DIR_KEY (デフォルト: {PARTS_DIR_KEY})")
+    parser.add_argument('--modules-dir-key', default=MODULES_DIR_KEY, help=f"移行後の MODULES_DIR_KEY (デフォルト: {MODULES_DIR_KEY})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_MOVE_WORKERS, help="アセット移動の並列数")
+    parser.add_argument('--dry-run', action='store_true', help="計画を表示するだけで、ファイルを変更しない")
+    args = parser.parse_args()
+
+    directory_keys = {
+        'ROOT_DIR_KEY': args.root_dir_key,
+        'SEEDS_DIR_KEY': args.seeds_dir_key,
+        'PLANTS_DIR_KEY': args.plants_dir_key,
+        'PARTS_DIR_KEY': args.parts_dir_key,
+        'MODULES_DIR_KEY': args.modules_dir_key,
+    }
+
+    print("--- [START] Catalog Migration ---")
+    # 前回の移行が設定ファイルの入れ替え途中で中断していれば、先に完了させる
+    recover_interrupted_commit()
+    try:
+        plan = plan_migration(
+            load_current_catalog(),
+            seed_renames=parse_seed_renames(args.rename_seed),
+            plant_renames=parse_plant_renames(args.rename_plant),
+            directory_keys=directory_keys,
+        )
+    except ValueError as e:
+        print(f"[FATAL ERROR] Migration plan is invalid: {e}")
+        return
+
+    print_plan(plan)
+    if not plan['changed']:
+        print("[INFO] Nothing to migrate.")
+        return
+    if args.dry_run:
+        print("[INFO] Dry run. No files were changed.")
+        return
+
+    try:
+        run_migration(plan, workers=args.workers)
+    except IOError as e:
+        print(f"[FATAL ERROR] Migration aborted: {e}")
+        return
+
+    if directory_keys != get_directory_keys():
+        print("[WARNING] Update the directory keys in config.py to match the migrated layout.")
+    print("--- [END] Catalog Migration Finished ---")
+
+if __name__ == '__main__':
+    main()
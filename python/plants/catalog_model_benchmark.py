@@ -0,0 +1,132 @@
+import gc
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+from utils.catalog_model import Catalog, CatalogModel
+from utils.module_config_utils import get_plant_key, get_module_key, get_module_image_directory_path
+from utils.catalog_diff_utils import load_catalog, compute_catalog_hash
+
+RARITIES = ('N', 'R', 'SR', 'SSR', 'XSR')
+
+# モジュールを名前で引くためのキー (seedType, plantType, partType, moduleType)
+ModuleNameKey = Tuple[str, str, str, str]
+
+
+def generate_catalog_json(seed_count: int, plant_count: int, part_count: int, module_count: int) -> str:
+    """ベンチマーク用に、実際の設定ファイルと同じ形の合成カタログをJSON文字列で生成する。"""
+    catalog: Catalog = {'seeds': {}, 'plants': {}, 'modules': {}}
+    for seed_index in range(seed_count):
+        seed_type = f"seed{seed_index}"
+        seed_plants = catalog['seeds'].setdefault(seed_type, {'plants': {}})['plants']
+        for plant_index in range(plant_count):
+            plant_type = f"Plant{plant_index}"
+            seed_plants[plant_type] = {
+                'minSize': 100, 'maxSize': 200, 'rarity': RARITIES[plant_index % len(RARITIES)], 'weight': 50,
+            }
+            parts = {}
+            for part_index in range(part_count):
+                part_type = f"Part{part_index}"
+                parts[part_type] = {}
+                for module_index in range(module_count):
+                    module_type = f"{part_type}_V{module_index}"
+                    parts[part_type][module_type] = {
+                        'moduleRarity': RARITIES[module_index % len(RARITIES)], 'weight': 100,
+                    }
+                    directory_path = get_module_image_directory_path(seed_type, plant_type, part_type, module_type)
+                    catalog['modules'][get_module_key(seed_type, plant_type, part_type, module_type)] = {
+                        'imgPath': f"{directory_path}/{module_type.lower()}.png",
+                        'zIndex': part_index * 10,
+                    }
+            catalog['plants'][get_plant_key(seed_type, plant_type)] = {'modules': parts}
+    return json.dumps(catalog)
+
+def measure_memory(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """build() が返したオブジェクトが保持しているメモリ量 (バイト) を計測する。"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def measure_time(func: Callable[[ModuleNameKey], Any], names: List[ModuleNameKey]) -> float:
+    """全ての名前を引くのにかかった時間 (秒) を返す。"""
+    start = time.perf_counter()
+    for name in names:
+        func(name)
+    return time.perf_counter() - start
+
+def run_benchmark(catalog_json: str, lookup_count: int) -> None:
+    catalog_dict, dict_bytes = measure_memory(lambda: json.loads(catalog_json))
+    model, model_bytes = measure_memory(lambda: CatalogModel(json.loads(catalog_json)))
+
+    # 変換が損失なしであることを確認する
+    if model.to_catalog() != catalog_dict:
+        print("[FATAL ERROR] Round trip mismatch: CatalogModel.to_catalog() differs from the source JSON.")
+        return
+    print(f"[INFO] Round trip OK (catalog hash: {compute_catalog_hash(catalog_dict)[:12]})")
+
+    module_count = len(catalog_dict['modules'])
+    print(f"[INFO] Catalog: {len(catalog_dict['seeds'])} seed(s), {len(catalog_dict['plants'])} plant(s), {module_count} module(s)")
+    print(f"[INFO] Memory  dict: {dict_bytes / 1024:.1f} KiB, model: {model_bytes / 1024:.1f} KiB "
+          f"({model_bytes / dict_bytes * 100 if dict_bytes else 0:.0f}%)")
+
+    names = [
+        (option.seed_type, option.plant_type, module.part_type, module.module_type)
+        for option, module in model.iter_linked_modules()
+    ]
+    if not names:
+        print("[WARNING] No modules to look up.")
+        return
+    rng = random.Random(0)
+    names = [rng.choice(names) for _ in range(lookup_count)]
+    modules_config = catalog_dict['modules']
+
+    lookups = [
+        (
+            'zIndex',
+            lambda name: modules_config[get_module_key(*name)]['zIndex'],
+            lambda name: model.get_module_setting(*name).z_index,
+        ),
+        (
+            'directory',
+            lambda name: get_module_image_directory_path(*name),
+            lambda name: model.get_module_option(*name).directory_path,
+        ),
+    ]
+    for label, dict_lookup, model_lookup in lookups:
+        dict_seconds = measure_time(dict_lookup, names)
+        model_seconds = measure_time(model_lookup, names)
+        print(f"[INFO] Lookup {label:<9} x{lookup_count}  dict: {dict_seconds * 1000:.1f} ms, "
+              f"model: {model_seconds * 1000:.1f} ms ({dict_seconds / model_seconds if model_seconds else 0:.1f}x faster)")
+
+def main():
+    """コマンドライン引数を処理し、辞書版とカタログモデルのメモリ量・参照時間を比較します。"""
+    parser = argparse.ArgumentParser(
+        description="設定カタログを入れ子の辞書で持つ場合と CatalogModel で持つ場合のメモリ量・参照時間を比較します。"
+    )
+    parser.add_argument('--catalog-dir', default=None, help="合成データの代わりに使うカタログディレクトリ")
+    parser.add_argument('--seeds', type=int, default=10, help="合成するSeed数")
+    parser.add_argument('--plants', type=int, default=100, help="Seedごとに合成するPlant数")
+    parser.add_argument('--parts', type=int, default=4, help="Plantごとに合成するPart数")
+    parser.add_argument('--modules', type=int, default=5, help="Partごとに合成するModule数")
+    parser.add_argument('--lookups', type=int, default=200000, help="参照回数")
+    args = parser.parse_args()
+
+    if args.catalog_dir:
+        try:
+            catalog_json = json.dumps(load_catalog(args.catalog_dir))
+        except (OSError, ValueError) as e:
+            print(f"[FATAL ERROR] Failed to load catalog: {e}")
+            return
+    else:
+        catalog_json = generate_catalog_json(args.seeds, args.plants, args.parts, args.modules)
+    run_benchmark(catalog_json, args.lookups)
+
+if __name__ == '__main__':
+    main()
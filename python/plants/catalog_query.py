@@ -0,0 +1,76 @@
+import sys
+import argparse
+
+from utils.catalog_model import load_catalog_model
+from utils.catalog_query_utils import CatalogIndex, aggregate_rows, write_rows
+
+# 集計のグループ化に使える列
+PLANT_GROUP_FIELDS = ('seedType', 'rarity')
+MODULE_GROUP_FIELDS = ('seedType', 'plantKey', 'partType', 'moduleRarity')
+
+
+def add_common_filters(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--seed', default=None, help="Seedで絞り込む")
+    parser.add_argument('--module-rarity', default=None, help="moduleRarityで絞り込む")
+    parser.add_argument('--part', default=None, help="Part Typeで絞り込む")
+    parser.add_argument('--min-weight', type=float, default=None, help="weightの下限 (含む)")
+    parser.add_argument('--max-weight', type=float, default=None, help="weightの上限 (含む)")
+
+def query_plants(index: CatalogIndex, args: argparse.Namespace):
+    plants = index.filter_plants(
+        seed_type=args.seed,
+        rarity=args.rarity,
+        module_rarity=args.module_rarity,
+        part_type=args.part,
+        missing_part_type=args.missing_part,
+        min_weight=args.min_weight,
+        max_weight=args.max_weight,
+    )
+    return [index.plant_row(option) for option in plants]
+
+def query_modules(index: CatalogIndex, args: argparse.Namespace):
+    modules = index.filter_modules(
+        seed_type=args.seed,
+        module_rarity=args.module_rarity,
+        part_type=args.part,
+        min_weight=args.min_weight,
+        max_weight=args.max_weight,
+    )
+    return [index.module_row(module) for module in modules]
+
+def main():
+    """コマンドライン引数を処理し、カタログに対する絞り込み・集計の結果を出力します。"""
+    parser = argparse.ArgumentParser(
+        description="設定カタログ (seeds/plants/modules_config.json) をインデックス化し、Plant/Moduleを絞り込み・集計します。"
+    )
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument('--format', choices=('json', 'csv'), default='json', help="出力形式 (デフォルト: json)")
+    output_parser.add_argument('-o', '--output', default=None, help="出力ファイル (省略時は標準出力)")
+    subparsers = parser.add_subparsers(dest='target', required=True)
+
+    plants_parser = subparsers.add_parser('plants', parents=[output_parser], help="Plantを絞り込む")
+    add_common_filters(plants_parser)
+    plants_parser.add_argument('--rarity', default=None, help="Plantのrarityで絞り込む")
+    plants_parser.add_argument('--missing-part', default=None, help="このPartを持たないPlantのみ")
+    plants_parser.add_argument('--group-by', choices=PLANT_GROUP_FIELDS, default=None, help="指定した列ごとに件数・weightを集計する")
+
+    modules_parser = subparsers.add_parser('modules', parents=[output_parser], help="Moduleを絞り込む")
+    add_common_filters(modules_parser)
+    modules_parser.add_argument('--group-by', choices=MODULE_GROUP_FIELDS, default=None, help="指定した列ごとに件数・weightを集計する")
+
+    args = parser.parse_args()
+
+    index = CatalogIndex(load_catalog_model())
+    rows = query_plants(index, args) if args.target == 'plants' else query_modules(index, args)
+    if args.group_by:
+        rows = aggregate_rows(rows, args.group_by)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write_rows(rows, args.format, f)
+        print(f"[ACTION] {len(rows)} row(s) written to: {args.output}")
+    else:
+        write_rows(rows, args.format, sys.stdout)
+
+if __name__ == '__main__':
+    main()
@@ -11,8 +11,23 @@ MODULES_CONFIG_JSON_PATH = 'public/assets/json/plantsConfig/modules_config.json'
 PLANTS_CONFIG_JSON_PATH = 'public/assets/json/plantsConfig/plants_config.json'
 # Seedの設定を更新するJSONファイルパス
 SEEDS_CONFIG_JSON_PATH = 'public/assets/json/plantsConfig/seeds_config.json'
+# Plant/Seedごとのプリロード対象アセット一覧を保存するJSONファイルパス
+PRELOAD_MANIFEST_JSON_PATH = 'public/assets/json/plantsConfig/preload_manifest.json'
 
 # 画像アセットが格納されているディレクトリのベースパス
 IMAGE_BASE_DIR = 'python/plants/images'
 
-CONFIG_FILE_PATH = 'python/plants/new_plants.json'
\ No newline at end of file
+CONFIG_FILE_PATH = 'python/plants/new_plants.json'
+# スキャフォールドで生成したPlant定義ファイル (<seed>/<plant>/new_plants.json) を出力するディレクトリ
+NEW_PLANTS_DIR = 'python/plants/new_plants'
+
+# スプライトアトラスの出力ディレクトリキー (ROOT_DIR_KEY 配下に作成)
+ATLAS_DIR_KEY = 'atlases'
+
+# ビルド用キャッシュ (入力ハッシュなど) を保存するディレクトリ
+CACHE_DIR = 'python/plants/.cache'
+# アトラスの入力ハッシュとフレーム情報を記録するマニフェストJSONファイルパス
+ATLAS_MANIFEST_JSON_PATH = 'python/plants/.cache/atlas_manifest.json'
+
+# モジュール画像の縮小版 (LOD) を生成する倍率 (1.0 は元画像そのもの)
+LOD_SCALES = (1.0, 0.5, 0.25)
@@ -1,12 +1,29 @@
 import json
 import os
 import argparse
-from typing import Dict, Any, List, Union
-from config import CONFIG_FILE_PATH
+from typing import Dict, Any, List, Union, Tuple, Optional
+from config import CONFIG_FILE_PATH, IMAGE_BASE_DIR, NEW_PLANTS_DIR
 
 # --- グローバル定数 ---
 # リセット対象のJSONファイルのパス
 
+# スキャフォールド時のパーツの重なり順 (前にあるほど奥に描画される)
+# ここに無いパーツは、これらの後ろにアルファベット順で並ぶ
+DEFAULT_PART_ORDER = ['Pot', 'Root', 'Stem', 'Leaf', 'Flower', 'Fruit']
+# パーツごとのzIndexの間隔
+PART_Z_INDEX_STEP = 10
+# ファイル名の末尾がこれらに一致する場合、モジュールのレアリティとして扱う
+KNOWN_MODULE_RARITIES = ['N', 'R', 'SR', 'SSR', 'UR', 'XSR']
+# スキャフォールド時のモジュールの重みのデフォルト値
+DEFAULT_MODULE_WEIGHT = 100
+# スキャフォールド時のPlantのサイズ・シード抽選の重みのデフォルト値 (ローダーは0を受け付けない)
+DEFAULT_PLANT_MIN_SIZE = 100
+DEFAULT_PLANT_MAX_SIZE = 200
+DEFAULT_PLANT_WEIGHT = 100
+DEFAULT_PLANT_RARITY = 'N'
+# ローダーが0や空文字を受け付けないPlant定義のフィールド
+REQUIRED_PLANT_FIELDS = ("seed_type", "plant_type", "min_size", "max_size", "rarity", "weight")
+
 
 def create_default_module_data(index: int) -> Dict[str, Union[str, int]]:
     """
@@ -76,10 +93,191 @@ def reset_new_plants_json(part_count: int) -> None:
         print(f"[FATAL ERROR] Failed to write file {CONFIG_FILE_PATH}: {e}")
         return
 
+# --- スキャフォールド (画像ディレクトリからの自動生成) ---
+
+def infer_module_names(image_filename: str) -> Optional[Tuple[str, str]]:
+    """
+    画像ファイル名から PartType と ModuleType を推測します。
+    先頭のトークンをパーツ名 (先頭大文字)、残りのトークンを大文字にして連結したものをモジュール名とします。
+
+    Args:
+        image_filename: 画像ファイル名 (例: 'stem_v0.png', 'flower_sr.png')
+
+    Returns:
+        (PartType, ModuleType) (例: ('Stem', 'Stem_V0'), ('Flower', 'Flower_SR'))
+        命名規則に合わない場合はNone
+    """
+    stem, ext = os.path.splitext(image_filename)
+    tokens = [token for token in stem.split('_') if token]
+    if ext.lower() != '.png' or len(tokens) < 2 or '@' in stem:
+        # '@' を含むファイルは縮小画像 (LOD) なので対象外
+        return None
+    part_type = tokens[0].capitalize()
+    module_type = '_'.join([part_type] + [token.upper() for token in tokens[1:]])
+    return part_type, module_type
+
+def get_part_z_index(part_type: str, part_types: List[str]) -> int:
+    """DEFAULT_PART_ORDER に基づき、パーツのデフォルトzIndexを返します。"""
+    known = [p for p in DEFAULT_PART_ORDER if p in part_types]
+    unknown = sorted(p for p in part_types if p not in DEFAULT_PART_ORDER)
+    return (known + unknown).index(part_type) * PART_Z_INDEX_STEP
+
+def get_image_filename_reference(image_path: str) -> str:
+    """
+    ローダーが IMAGE_BASE_DIR と結合して開ける image_filename を返します。
+    IMAGE_BASE_DIR 配下なら相対パス、それ以外なら絶対パスになります。
+    """
+    absolute_path = os.path.abspath(image_path)
+    base_dir = os.path.abspath(IMAGE_BASE_DIR)
+    if os.path.commonpath([absolute_path, base_dir]) == base_dir:
+        return os.path.relpath(absolute_path, base_dir).replace(os.sep, '/')
+    return absolute_path
+
+def scan_plant_image_groups(
+    image_dir: str,
+    seed_type: str,
+    plant_type: str,
+) -> Dict[Tuple[str, str], List[str]]:
+    """
+    画像ディレクトリを1回だけ走査し、Plantごとの画像ファイルパスを集めます。
+    - image_dir 直下の画像: 引数の seed_type / plant_type のPlantとして扱う
+    - image_dir/<seed>/<plant>/ 配下の画像: ディレクトリ名をSeed/Plantとして扱う
+
+    Returns:
+        {(seed_type, plant_type): [画像ファイルパス, ...]}
+    """
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for current_dir, dir_names, file_names in os.walk(image_dir):
+        dir_names.sort()
+        relative_parts = os.path.relpath(current_dir, image_dir).split(os.sep)
+        if relative_parts == ['.']:
+            group_key = (seed_type, plant_type)
+        elif len(relative_parts) == 2:
+            group_key = (relative_parts[0], relative_parts[1])
+        else:
+            # <seed>/ 直下や、より深い階層の画像は規則外として無視する
+            continue
+        png_files = [name for name in sorted(file_names) if name.lower().endswith('.png')]
+        if png_files:
+            groups.setdefault(group_key, []).extend(os.path.join(current_dir, name) for name in png_files)
+    return groups
+
+def build_plant_definition(
+    seed_type: str,
+    plant_type: str,
+    image_paths: List[str],
+    plant_defaults: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    画像ファイルの一覧から、new_plants.json 形式のPlant定義を構築します。
+
+    Args:
+        seed_type: シードタイプ
+        plant_type: 植物タイプ
+        image_paths: このPlantの画像ファイルパス
+        plant_defaults: min_size / max_size / rarity / weight の値
+    """
+    modules_by_part: Dict[str, List[Dict[str, Union[str, int]]]] = {}
+    for image_path in image_paths:
+        names = infer_module_names(os.path.basename(image_path))
+        if names is None:
+            print(f"[WARNING] File name does not follow '<part>_<variant>.png': {image_path}. Skipping.")
+            continue
+        part_type, module_type = names
+        last_token = module_type.split('_')[-1]
+        modules_by_part.setdefault(part_type, []).append({
+            "moduleType": module_type,
+            "moduleRarity": last_token if last_token in KNOWN_MODULE_RARITIES else "",
+            "weight": DEFAULT_MODULE_WEIGHT,
+            "zIndex": 0,
+            "image_filename": get_image_filename_reference(image_path),
+        })
+
+    # パーツの重なり順でzIndexを割り当て、定義もその順に並べる
+    part_types = list(modules_by_part)
+    ordered_parts = sorted(part_types, key=lambda p: get_part_z_index(p, part_types))
+    for part_type in ordered_parts:
+        for module_item in modules_by_part[part_type]:
+            module_item["zIndex"] = get_part_z_index(part_type, part_types)
+
+    return {
+        "seed_type": seed_type,
+        "plant_type": plant_type,
+        "min_size": plant_defaults.get("min_size", DEFAULT_PLANT_MIN_SIZE),
+        "max_size": plant_defaults.get("max_size", DEFAULT_PLANT_MAX_SIZE),
+        "rarity": plant_defaults.get("rarity", DEFAULT_PLANT_RARITY),
+        "weight": plant_defaults.get("weight", DEFAULT_PLANT_WEIGHT),
+        "modules": {part_type: modules_by_part[part_type] for part_type in ordered_parts},
+    }
+
+def scaffold_new_plants_json(
+    image_dir: str = IMAGE_BASE_DIR,
+    seed_type: str = "",
+    plant_type: str = "",
+    plant_defaults: Optional[Dict[str, Any]] = None,
+    output_dir: str = NEW_PLANTS_DIR,
+) -> List[str]:
+    """
+    画像ディレクトリのファイル名規則から、new_plants.json 形式のPlant定義を自動生成します。
+    Plantの数に関わらず、output_dir に '<seed>/<plant>/new_plants.json' として1Plant1ファイルで書き出します。
+    (CONFIG_FILE_PATH は上書きしない。ディレクトリ名はSeed/Plant名の表記のまま)
+    ローダーが読み込めない定義 (Seed/Plant名や必須フィールドが空) が1つでもある場合は何も書き出しません。
+
+    Args:
+        image_dir: 走査する画像ディレクトリ
+        seed_type: image_dir 直下の画像に使うシードタイプ
+        plant_type: image_dir 直下の画像に使う植物タイプ
+        plant_defaults: すべてのPlantに設定する min_size / max_size / rarity / weight
+        output_dir: 定義ファイルの出力先
+
+    Returns:
+        書き出した定義ファイルのパス
+    """
+    print(f"--- [START] Scaffolding plant definitions from {image_dir} ---")
+    groups = scan_plant_image_groups(image_dir, seed_type, plant_type)
+    if not groups:
+        print(f"[WARNING] No PNG images found in: {image_dir}")
+        return []
+
+    if (seed_type, plant_type) in groups and not (seed_type and plant_type):
+        print(f"[FATAL ERROR] Images found directly in {image_dir}. Specify --seed and --plant for them.")
+        return []
+
+    definitions = [
+        build_plant_definition(seed, plant, paths, plant_defaults or {})
+        for (seed, plant), paths in sorted(groups.items())
+    ]
+    for definition in definitions:
+        missing = [key for key in REQUIRED_PLANT_FIELDS if not definition[key]]
+        if missing:
+            print(
+                f"[FATAL ERROR] {definition['seed_type']}/{definition['plant_type']}: "
+                f"{', '.join(missing)} must not be empty or zero. Nothing was written."
+            )
+            return []
+
+    written: List[str] = []
+    try:
+        for definition in definitions:
+            output_path = os.path.join(
+                output_dir, definition['seed_type'], definition['plant_type'], os.path.basename(CONFIG_FILE_PATH)
+            )
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(definition, f, indent=4, ensure_ascii=False)
+            written.append(output_path)
+    except Exception as e:
+        print(f"[FATAL ERROR] Failed to write scaffolded definitions: {e}")
+        return written
+
+    module_count = sum(len(items) for d in definitions for items in d["modules"].values())
+    print(f"[SUCCESS] Generated {len(definitions)} plant definition(s) with {module_count} module(s).")
+    return written
+
 def main():
     """コマンドライン引数を処理し、リセット関数を実行します。"""
     parser = argparse.ArgumentParser(
-        description="新しい植物設定ファイル (new_plants.json) をデフォルト値でリセットします。"
+        description="新しい植物設定ファイル (new_plants.json) をデフォルト値でリセットします (--scaffold 指定時は画像から自動生成します)。"
     )
     parser.add_argument(
         'part_count', # 引数名を part_count に変更
@@ -89,7 +287,45 @@ def main():
         help="生成するパーツの数 (デフォルト: 2)"
     )
     
+    parser.add_argument(
+        '--scaffold',
+        nargs='?',
+        const=IMAGE_BASE_DIR,
+        default=None,
+        metavar='IMAGE_DIR',
+        help=f"画像ファイル名からPlant定義を自動生成する (ディレクトリ省略時: {IMAGE_BASE_DIR})"
+    )
+    parser.add_argument('--seed', default="", help="スキャフォールド時、画像ディレクトリ直下の画像のシードタイプ")
+    parser.add_argument('--plant', default="", help="スキャフォールド時、画像ディレクトリ直下の画像の植物タイプ")
+    parser.add_argument('--min-size', type=int, default=DEFAULT_PLANT_MIN_SIZE, help=f"スキャフォールド時の最小サイズ (デフォルト: {DEFAULT_PLANT_MIN_SIZE})")
+    parser.add_argument('--max-size', type=int, default=DEFAULT_PLANT_MAX_SIZE, help=f"スキャフォールド時の最大サイズ (デフォルト: {DEFAULT_PLANT_MAX_SIZE})")
+    parser.add_argument('--rarity', default=DEFAULT_PLANT_RARITY, help=f"スキャフォールド時の植物のレアリティ (デフォルト: {DEFAULT_PLANT_RARITY})")
+    parser.add_argument('--weight', type=int, default=DEFAULT_PLANT_WEIGHT, help=f"スキャフォールド時のシード抽選の重み (デフォルト: {DEFAULT_PLANT_WEIGHT})")
+    parser.add_argument(
+        '--output-dir',
+        default=NEW_PLANTS_DIR,
+        help=f"スキャフォールドしたPlant定義の出力先 (<seed>/<plant>/new_plants.json、デフォルト: {NEW_PLANTS_DIR})"
+    )
+    
     args = parser.parse_args()
+
+    if args.scaffold is not None:
+        if args.min_size <= 0 or args.max_size < args.min_size or args.weight <= 0 or not args.rarity:
+            print("[ERROR] --min-size と --weight は1以上、--max-size は --min-size 以上、--rarity は空でない必要があります。")
+            return
+        scaffold_new_plants_json(
+            image_dir=args.scaffold,
+            seed_type=args.seed,
+            plant_type=args.plant,
+            plant_defaults={
+                "min_size": args.min_size,
+                "max_size": args.max_size,
+                "rarity": args.rarity,
+                "weight": args.weight,
+            },
+            output_dir=args.output_dir,
+        )
+        return
     
     if args.part_count < 0:
         print("[ERROR] パーツの数は0以上である必要があります。")
@@ -99,11 +335,4 @@ def main():
     reset_new_plants_json(args.part_count)
 
 if __name__ == '__main__':
-    # スクリプトを実行する代わりに、直接関数を呼び出すテストをシミュレーション
-    # デフォルトのパーツ数2で実行する場合:
-    print("--- [TEST RUN] Resetting config with 2 parts ---")
-    reset_new_plants_json(part_count=2)
-    
-    # 別のパーツ数で実行する場合:
-    print("\n--- [TEST RUN] Resetting config with 3 parts ---")
-    reset_new_plants_json(part_count=3)
+    main()
@@ -1,8 +1,9 @@
 import json
 import os
 import shutil
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from config import SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH, IMAGE_BASE_DIR, CONFIG_FILE_PATH
+from utils.reverse_generation_cache import get_reverse_cache_key, lookup_reverse_result, store_reverse_result
 
 # --- ヘルパー関数 ---
 
@@ -191,6 +192,32 @@ def reverse_engineer_new_plants_json(
     return result_data, modules_config
 
 
+def reverse_engineer_new_plants_json_cached(
+    seed_type: str,
+    plant_type: str
+) -> Optional[Dict[str, Any]]:
+    """
+    reverse_engineer_new_plants_json のキャッシュ付き版。
+    設定ファイルのフィンガープリントが変わっていなければ、パースも再構築もせずに結果を返します。
+    (プレビューなど、同じPlantを繰り返し逆生成するツール向け。modules_config は返しません)
+    """
+    # 逆生成と同じく、Seedは小文字・Plant名は大文字小文字を区別してキャッシュする
+    cache_key = get_reverse_cache_key(seed_type, plant_type)
+    cached_result, fingerprint = lookup_reverse_result(cache_key)
+    if cached_result is not None:
+        print(f"[INFO] Reverse engineering cache hit: {cache_key}")
+        # 非キャッシュ版と同じく、呼び出し時のSeed表記をそのまま返す
+        cached_result['seed_type'] = seed_type
+        return cached_result
+
+    result_tuple = reverse_engineer_new_plants_json(seed_type, plant_type)
+    if not result_tuple:
+        return None
+    result_data, _ = result_tuple
+    store_reverse_result(cache_key, get_plant_key(seed_type, plant_type), fingerprint, result_data)
+    return result_data
+
+
 if __name__ == '__main__':
     print("\n-----------------------------------------------------")
     print("設定ファイルの逆生成を実行します。")
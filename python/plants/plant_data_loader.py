@@ -1,7 +1,8 @@
 import os
 import json
-from typing import Dict, Any, List, Union
-from config import CONFIG_FILE_PATH, IMAGE_BASE_DIR
+import argparse
+from typing import Dict, Any, List, Union, Optional, Sequence, Set, Tuple
+from config import CONFIG_FILE_PATH, IMAGE_BASE_DIR, LOD_SCALES
 
 # 依存するコアロジックをインポート
 # plant_creation_logic.py は、さらに module_config_utils.py に依存しています
@@ -19,38 +20,58 @@ LoaderModuleMap = Dict[str, List[LoaderModuleItem]]
 # JSONファイル全体のデータ構造
 PlantLoaderData = Dict[str, Union[str, int, LoaderModuleMap]]
 
-# --- メインロジック関数 ---
+# create_new_plantに渡す直前のPlant定義 (modulesは画像パス付きのモジュールのリスト)
+PlantDefinition = Dict[str, Any]
+
+# --- ヘルパー関数定義 ---
 
-def load_and_create_plant(allow_overwrite: bool = False) -> None:
+def list_plant_definition_files(path: str) -> List[str]:
     """
-    指定されたJSONファイルからPlant設定を読み込み、
-    画像ファイルをバイト列に変換し、create_new_plantを実行する。
-    上書きフラグをcreate_new_plantに渡す。
+    Plant定義JSONファイル、またはディレクトリ配下 (サブディレクトリを含む) の *.json を列挙する。
+    スキャフォールドの出力 (<seed>/<plant>/new_plants.json) もそのまま読み込める。
+    """
+    if not os.path.isdir(path):
+        return [path]
+    config_paths: List[str] = []
+    for current_dir, dir_names, file_names in os.walk(path):
+        dir_names.sort()
+        config_paths.extend(
+            os.path.join(current_dir, name) for name in sorted(file_names) if name.lower().endswith('.json')
+        )
+    return config_paths
+
+def parse_plant_definition(config_path: str) -> Optional[PlantDefinition]:
+    """
+    Plant定義JSONファイルを読み込んで検証し、create_new_plantの引数に近い形に変換する。
+    画像ファイルはまだ読み込まず、各モジュールに 'image_path' を持たせる。
     
     Args:
-        allow_overwrite: 既存のデータを上書きすることを許可するかどうか。
+        config_path: 読み込むPlant定義JSONファイルのパス。
+        
+    Returns:
+        {'seed_type', 'plant_type', 'min_size', 'max_size', 'rarity', 'weight', 'modules': [...]}
+        JSONが不正な場合はNone
     """
     plant_type = "UNKNOWN" # エラーログ用
     seed_type = "UNKNOWN" # エラーログ用
-    print(f"--- [START] Plant Data Loading Process (Overwrite: {allow_overwrite}) ---")
 
     try:
         # 1. 設定JSONファイルの読み込み
-        with open(CONFIG_FILE_PATH, 'r', encoding='utf-8') as f:
+        with open(config_path, 'r', encoding='utf-8') as f:
             plant_loader_data = json.load(f)
-        print(f"[ACTION] Successfully loaded JSON from: {CONFIG_FILE_PATH}")
+        print(f"[ACTION] Successfully loaded JSON from: {config_path}")
 
     except FileNotFoundError:
-        print(f"[FATAL ERROR] JSON file not found: {CONFIG_FILE_PATH}")
+        print(f"[FATAL ERROR] JSON file not found: {config_path}")
         print("Please ensure the file exists in the specified relative path.")
-        return
+        return None
     except json.JSONDecodeError:
-        print(f"[FATAL ERROR] Failed to decode JSON from: {CONFIG_FILE_PATH}")
+        print(f"[FATAL ERROR] Failed to decode JSON from: {config_path}")
         print("Please check the JSON file format for errors.")
-        return
+        return None
     except Exception as e:
         print(f"[FATAL ERROR] An unexpected error occurred during JSON loading: {e}")
-        return
+        return None
 
     # 2. PlantOptionのフラットな引数を抽出
     try:
@@ -78,10 +99,10 @@ def load_and_create_plant(allow_overwrite: bool = False) -> None:
             
     except (KeyError, TypeError, ValueError) as e:
         print(f"[FATAL ERROR] JSON structure is invalid or missing required keys for {seed_type}_{plant_type}: {e}")
-        return
+        return None
 
-    # 3. モジュールデータの変換と画像ファイルの読み込み
-    module_data_list: List[Dict[str, Any]] = []
+    # 3. モジュールデータの変換 (画像パスの解決)
+    module_items_list: List[Dict[str, Any]] = []
 
     for part_type, module_items in modules_raw.items():
         if not isinstance(module_items, list):
@@ -99,41 +120,83 @@ def load_and_create_plant(allow_overwrite: bool = False) -> None:
             image_filename_raw = module_copy.pop('image_filename', None)
             if not isinstance(image_filename_raw, (str, int)):
                 print(f"[FATAL ERROR] 'image_filename' is missing or not a string/int in module: {module_copy}. Skipping.")
-                return 
+                return None
                 
-            image_filename = str(image_filename_raw)
-            image_full_path = os.path.join(IMAGE_BASE_DIR, image_filename)
+            module_copy['image_path'] = os.path.join(IMAGE_BASE_DIR, str(image_filename_raw))
+            module_items_list.append(module_copy)
 
-            try:
-                with open(image_full_path, 'rb') as f:
-                    image_data_bytes = f.read()
-                print(f"[ACTION] Successfully read image: {image_full_path}")
-                
-                module_copy['image'] = image_data_bytes
-                module_data_list.append(module_copy)
+    return {
+        'seed_type': seed_type,
+        'plant_type': plant_type,
+        'min_size': min_size,
+        'max_size': max_size,
+        'rarity': rarity,
+        'weight': weight,
+        'modules': module_items_list,
+    }
+
+def read_module_images(module_items: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """
+    各モジュールの 'image_path' から画像を読み込み、'image' にバイト列を格納したリストを返す。
+    1つでも画像が見つからない場合はNoneを返す。
+    """
+    module_data_list: List[Dict[str, Any]] = []
+    for module_item in module_items:
+        module_copy = dict(module_item)
+        image_full_path = module_copy.pop('image_path')
+        try:
+            with open(image_full_path, 'rb') as f:
+                image_data_bytes = f.read()
+            print(f"[ACTION] Successfully read image: {image_full_path}")
+            
+            module_copy['image'] = image_data_bytes
+            module_data_list.append(module_copy)
+
+        except FileNotFoundError:
+            print(f"[FATAL ERROR] Image file not found: {image_full_path}")
+            print("Aborting entire plant creation.")
+            return None # 1つでも画像がなければ処理を中断する
 
-            except FileNotFoundError:
-                print(f"[FATAL ERROR] Image file not found: {image_full_path}")
-                print("Aborting entire plant creation.")
-                return # 1つでも画像がなければ処理を中断する
-                
     if not module_data_list:
         print("[FATAL ERROR] No valid module data was processed after image checks.")
-        return
+        return None
+    return module_data_list
 
-    # 4. create_new_plantの呼び出し
+def register_plant_definition(
+    definition: PlantDefinition,
+    module_data_list: List[Dict[str, Any]],
+    allow_overwrite: bool = False,
+    optimize_images: bool = False,
+    lod_scales: Optional[Sequence[float]] = None,
+    module_filter: Optional[Set[Tuple[str, str]]] = None
+) -> bool:
+    """
+    create_new_plantを呼び出し、エラーを表示する。
+    
+    Args:
+        module_filter: 指定した場合、この (partType, moduleType) のモジュールだけ画像と設定を書き直す。
+        
+    Returns:
+        登録に成功したかどうか
+    """
+    seed_type = definition['seed_type']
+    plant_type = definition['plant_type']
     try:
         create_new_plant(
             seed_type=seed_type,
             new_plant_type=plant_type,
-            min_size=min_size,
-            max_size=max_size,
-            rarity=rarity,
-            weight=weight,
+            min_size=definition['min_size'],
+            max_size=definition['max_size'],
+            rarity=definition['rarity'],
+            weight=definition['weight'],
             module_data_list=module_data_list,
-            allow_overwrite=allow_overwrite # プロンプトから取得したフラグを渡す
+            allow_overwrite=allow_overwrite, # プロンプトから取得したフラグを渡す
+            optimize_images=optimize_images,
+            lod_scales=lod_scales,
+            module_filter=module_filter
         )
         print(f"--- [END] Plant data processing finished successfully for {seed_type}_{plant_type}. ---")
+        return True
     
     except ValueError as e:
         print(f"\n[FATAL ERROR] Integrity Check Failed: {e}")
@@ -143,9 +206,85 @@ def load_and_create_plant(allow_overwrite: bool = False) -> None:
         print("Check permissions or file system integrity.")
     except Exception as e:
         print(f"\n[FATAL ERROR] An unexpected error occurred during plant creation: {e}")
+    return False
+
+# --- メインロジック関数 ---
+
+def load_and_create_plant(
+    allow_overwrite: bool = False,
+    optimize_images: bool = False,
+    lod_scales: Optional[Sequence[float]] = None,
+    config_path: str = CONFIG_FILE_PATH
+) -> None:
+    """
+    指定されたJSONファイルからPlant設定を読み込み、
+    画像ファイルをバイト列に変換し、create_new_plantを実行する。
+    上書きフラグをcreate_new_plantに渡す。
+    
+    Args:
+        allow_overwrite: 既存のデータを上書きすることを許可するかどうか。
+        optimize_images: 保存前にモジュール画像をロスレス最適化するかどうか。
+        lod_scales: 指定した場合、各倍率の縮小画像 (LOD) を生成する。
+        config_path: 読み込むPlant定義JSONファイルのパス。
+    """
+    print(f"--- [START] Plant Data Loading Process (Overwrite: {allow_overwrite}) ---")
+
+    # 1-3. 定義JSONの読み込み・検証とモジュールデータの変換
+    definition = parse_plant_definition(config_path)
+    if definition is None:
+        return
+
+    # 3. 画像ファイルの読み込み
+    module_data_list = read_module_images(definition['modules'])
+    if module_data_list is None:
+        return
+
+    # 4. create_new_plantの呼び出し
+    register_plant_definition(
+        definition,
+        module_data_list,
+        allow_overwrite=allow_overwrite,
+        optimize_images=optimize_images,
+        lod_scales=lod_scales
+    )
+
+
+def load_and_create_plants(
+    path: str,
+    allow_overwrite: bool = False,
+    optimize_images: bool = False,
+    lod_scales: Optional[Sequence[float]] = None
+) -> None:
+    """
+    Plant定義JSONファイル、またはそれらを含むディレクトリを読み込み、順にPlantを登録する。
+    (config_reset_utility.py --scaffold で生成した場合は出力先ディレクトリを指定する)
+    
+    Args:
+        path: Plant定義JSONファイル、またはディレクトリのパス。
+    """
+    config_paths = list_plant_definition_files(path)
+    if os.path.isdir(path):
+        print(f"[INFO] Found {len(config_paths)} plant definition file(s) in: {path}")
+
+    for config_path in config_paths:
+        load_and_create_plant(
+            allow_overwrite=allow_overwrite,
+            optimize_images=optimize_images,
+            lod_scales=lod_scales,
+            config_path=config_path
+        )
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Plant定義JSONを読み込み、設定カタログに登録します。")
+    parser.add_argument(
+        'path',
+        nargs='?',
+        default=CONFIG_FILE_PATH,
+        help=f"Plant定義JSONファイル、またはディレクトリ (デフォルト: {CONFIG_FILE_PATH})"
+    )
+    args = parser.parse_args()
+
     # ユーザーに上書きを許可するかどうかを尋ねる
     print("--------------------------------------------------")
     print("設定ファイルの重複が見つかった場合、既存のデータを上書きしますか？")
@@ -157,9 +296,24 @@ if __name__ == '__main__':
     if overwrite_flag:
         print("[INFO] 上書きモードが有効になりました。")
 
+    optimize_input = input("画像をロスレス最適化してから保存しますか？ (y/n, nがデフォルト): ").strip().lower()
+    optimize_flag = optimize_input in ('y', 'yes')
+    if optimize_flag:
+        print("[INFO] PNG最適化が有効になりました。")
+
+    lod_input = input(f"縮小画像 {LOD_SCALES} を生成しますか？ (y/n, nがデフォルト): ").strip().lower()
+    lod_scales = LOD_SCALES if lod_input in ('y', 'yes') else None
+    if lod_scales:
+        print("[INFO] 縮小画像 (LOD) の生成が有効になりました。")
+
     print("--- Starting Plant Data Loader ---")
     
     # ロジック関数にフラグを渡す
-    load_and_create_plant(allow_overwrite=overwrite_flag)
+    load_and_create_plants(
+        args.path,
+        allow_overwrite=overwrite_flag,
+        optimize_images=optimize_flag,
+        lod_scales=lod_scales
+    )
     
     print("--- Plant Data Loader Finished ---")
\ No newline at end of file
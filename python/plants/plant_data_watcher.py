@@ -0,0 +1,376 @@
+import os
+import time
+import hashlib
+import argparse
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple
+
+from config import (
+    CONFIG_FILE_PATH, LOD_SCALES,
+    SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH, PRELOAD_MANIFEST_JSON_PATH,
+)
+from plant_data_loader import (
+    PlantDefinition, list_plant_definition_files, parse_plant_definition, read_module_images, register_plant_definition,
+)
+from utils.module_config_utils import get_plant_key
+from utils.config_io_utils import begin_config_batch, flush_config_batch, end_config_batch
+from utils.reverse_generation_cache import get_config_fingerprint, retag_reverse_results
+
+# inotify が使える環境 (Linux + inotify_simple) ではファイル変更イベントで起床する。
+# 使えない場合は一定間隔のポーリングにフォールバックする。
+try:
+    from inotify_simple import INotify, flags
+except ImportError:
+    INotify = None
+    flags = None
+
+
+# -------------------------
+
+# ポーリング間隔 (秒)
+DEFAULT_POLL_INTERVAL = 1.0
+
+# 最後の変更からこの秒数だけ変更が無ければ取り込む (エディタの連続保存をまとめる)
+DEFAULT_DEBOUNCE_SECONDS = 0.5
+
+# 監視中はメモリ上に保持し、取り込みサイクルごとに1回だけ書き込む設定ファイル
+BATCHED_CONFIG_PATHS = (
+    SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH, PRELOAD_MANIFEST_JSON_PATH,
+)
+
+# --- データ構造の定義 (型ヒント用) ---
+# ファイルの (mtime_ns, size)。存在しない場合は None
+FileStamp = Optional[Tuple[int, int]]
+
+# モジュールの識別子 (partType, moduleType)
+ModuleId = Tuple[str, str]
+
+# 監視状態
+# {
+#   'stamps': { path: FileStamp },            最後に観測した stat
+#   'hashes': { path: sha256 },               最後に取り込んだ時点の内容ハッシュ
+#   'definitions': { path: PlantDefinition }, 最後に取り込んだPlant定義
+#   'pending': set(path),                     取り込み待ちの変更ファイル
+#   'last_change': float,                     最後に変更を観測した時刻
+# }
+WatcherState = Dict[str, Any]
+
+# --- ヘルパー関数定義 ---
+
+def list_definition_files(path: str) -> List[str]:
+    """Plant定義JSONファイル、またはディレクトリ配下 (サブディレクトリを含む) の *.json を列挙する。"""
+    return list_plant_definition_files(path)
+
+def get_file_stamp(path: str) -> FileStamp:
+    """ファイル内容を読まずに変更を検出するための (mtime_ns, size) を返す。"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def hash_file(path: str) -> Optional[str]:
+    """ファイル内容のsha256を返す (読めない場合はNone)。"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def get_module_id(module_item: Dict[str, Any]) -> ModuleId:
+    return (str(module_item['partType']), str(module_item['moduleType']))
+
+def get_watched_paths(watch_path: str, state: WatcherState) -> Set[str]:
+    """監視対象 (定義JSONと、それらが参照する画像) のパスを返す。"""
+    paths = set(list_definition_files(watch_path))
+    paths.update(state['definitions'])
+    for definition in state['definitions'].values():
+        for module_item in definition['modules']:
+            paths.add(module_item['image_path'])
+    return paths
+
+def scan_for_changes(watch_path: str, state: WatcherState) -> bool:
+    """
+    監視対象のstatを前回と比較し、変わったファイルを取り込み待ちに追加する。
+    statが変わったファイルだけを後で読み直すため、変更の無い画像は一切読まない。
+
+    Returns:
+        今回のスキャンで変更を検出したかどうか
+    """
+    changed = False
+    for path in get_watched_paths(watch_path, state):
+        stamp = get_file_stamp(path)
+        if state['stamps'].get(path, 'unseen') != stamp:
+            state['stamps'][path] = stamp
+            state['pending'].add(path)
+            changed = True
+    if changed:
+        state['last_change'] = time.monotonic()
+    return changed
+
+def get_changed_modules(
+    old_definition: PlantDefinition,
+    new_definition: PlantDefinition,
+    changed_images: Set[str],
+) -> Set[ModuleId]:
+    """定義の差分と画像の変更から、書き直しが必要なモジュールを返す。"""
+    old_modules = {get_module_id(item): item for item in old_definition['modules']}
+    changed_modules: Set[ModuleId] = set()
+    for module_item in new_definition['modules']:
+        module_id = get_module_id(module_item)
+        if old_modules.get(module_id) != module_item or module_item['image_path'] in changed_images:
+            changed_modules.add(module_id)
+    return changed_modules
+
+def is_plant_option_changed(old_definition: PlantDefinition, new_definition: PlantDefinition) -> bool:
+    """PlantOption、またはモジュールの構成 (PLANT_SETTINGS/SEED_SETTINGS) が変わったかどうか。"""
+    if old_definition['modules'] == new_definition['modules']:
+        return any(
+            old_definition[key] != new_definition[key]
+            for key in ('min_size', 'max_size', 'rarity', 'weight')
+        )
+    return True
+
+def build_module_data_list(
+    definition: PlantDefinition,
+    module_filter: Optional[Set[ModuleId]],
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    create_new_plant に渡すモジュールデータを構築する。
+    画像は module_filter に含まれるモジュールの分だけ読み込む (他のモジュールは設定値のみ)。
+    """
+    targets = [
+        item for item in definition['modules']
+        if module_filter is None or get_module_id(item) in module_filter
+    ]
+    loaded = read_module_images(targets) if targets else []
+    if loaded is None:
+        return None
+    images = {get_module_id(item): item['image'] for item in loaded}
+
+    module_data_list: List[Dict[str, Any]] = []
+    for module_item in definition['modules']:
+        module_data = dict(module_item)
+        module_data.pop('image_path')
+        module_id = get_module_id(module_item)
+        if module_id in images:
+            module_data['image'] = images[module_id]
+        module_data_list.append(module_data)
+    return module_data_list
+
+def remember_definition(config_path: str, definition: PlantDefinition, state: WatcherState) -> None:
+    """取り込んだ定義と、定義JSON・参照画像の内容ハッシュを記録する。"""
+    state['definitions'][config_path] = definition
+    for path in [config_path] + [item['image_path'] for item in definition['modules']]:
+        state['hashes'][path] = hash_file(path)
+        state['stamps'].setdefault(path, get_file_stamp(path))
+
+def flush_catalog_configs() -> None:
+    """取り込みサイクル中にメモリ上で更新した設定ファイルを書き込み、逆生成キャッシュを付け替える。"""
+    fingerprint_before_write = get_config_fingerprint()
+    written_paths = flush_config_batch()
+    if not written_paths:
+        return
+    retag_reverse_results(fingerprint_before_write)
+    print(f"[ACTION] Catalog written: {', '.join(written_paths)}")
+
+# --- メインロジック関数 ---
+
+def apply_pending_changes(
+    watch_path: str,
+    state: WatcherState,
+    optimize_images: bool = False,
+    lod_scales: Optional[Sequence[float]] = None,
+) -> int:
+    """
+    取り込み待ちのファイルを読み直し、内容が変わったPlant定義・モジュールだけを再登録する。
+
+    Returns:
+        再登録したPlantの数
+    """
+    pending = state['pending']
+    state['pending'] = set()
+
+    # statが変わっても内容が同じファイル (touch、同内容での再保存) は無視する
+    changed_paths = {path for path in pending if hash_file(path) != state['hashes'].get(path)}
+    if not changed_paths:
+        return 0
+
+    definition_paths = list_definition_files(watch_path)
+    for removed_path in set(state['definitions']) - set(definition_paths):
+        removed = state['definitions'].pop(removed_path)
+        print(
+            f"[WARNING] Plant definition removed: {removed_path}. "
+            f"{get_plant_key(removed['seed_type'], removed['plant_type'])} is kept in the catalog."
+        )
+
+    registered_count = 0
+    for config_path in definition_paths:
+        old_definition = state['definitions'].get(config_path)
+
+        if config_path in changed_paths:
+            new_definition = parse_plant_definition(config_path)
+            if new_definition is None:
+                print(f"[WARNING] Skipping invalid plant definition until it is saved again: {config_path}")
+                continue
+        elif old_definition is None:
+            continue # 前回読み込めなかった定義は、再度保存されるまで待つ
+        else:
+            new_definition = old_definition
+
+        new_plant_key = get_plant_key(new_definition['seed_type'], new_definition['plant_type'])
+        module_filter: Optional[Set[ModuleId]]
+        if old_definition is None or new_plant_key != get_plant_key(old_definition['seed_type'], old_definition['plant_type']):
+            # 新しい定義、またはPlantキーが変わった場合は全モジュールを登録する
+            module_filter = None
+            print(f"[INFO] Full import for {new_plant_key}: {config_path}")
+        else:
+            module_filter = get_changed_modules(old_definition, new_definition, changed_paths)
+            if not module_filter and not is_plant_option_changed(old_definition, new_definition):
+                continue
+            print(f"[INFO] Re-importing {len(module_filter)} changed module(s) for {new_plant_key}: {sorted(module_filter)}")
+
+        module_data_list = build_module_data_list(new_definition, module_filter)
+        if module_data_list is None:
+            continue
+
+        if register_plant_definition(
+            new_definition,
+            module_data_list,
+            allow_overwrite=True,
+            optimize_images=optimize_images,
+            lod_scales=lod_scales,
+            module_filter=module_filter,
+        ):
+            remember_definition(config_path, new_definition, state)
+            registered_count += 1
+
+    return registered_count
+
+def create_watcher_state() -> WatcherState:
+    return {
+        'stamps': {},
+        'hashes': {},
+        'definitions': {},
+        'pending': set(),
+        'last_change': 0.0,
+    }
+
+def take_snapshot(watch_path: str, state: WatcherState) -> None:
+    """現在のPlant定義と画像を読み込み、変更検出の基準とする (カタログへの登録は行わない)。"""
+    for config_path in list_definition_files(watch_path):
+        definition = parse_plant_definition(config_path)
+        if definition is not None:
+            remember_definition(config_path, definition, state)
+        else:
+            state['hashes'][config_path] = hash_file(config_path)
+    scan_for_changes(watch_path, state)
+    state['pending'] = set()
+
+def update_inotify_watches(inotify: Any, watch_descriptors: Dict[str, int], watch_path: str, state: WatcherState) -> None:
+    """監視対象ファイルを含むディレクトリにinotifyの監視を追加する。"""
+    mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.MOVED_FROM | flags.CREATE | flags.DELETE | flags.MODIFY
+    directories = {os.path.dirname(path) or '.' for path in get_watched_paths(watch_path, state)}
+    if os.path.isdir(watch_path):
+        # まだ定義ファイルの無いサブディレクトリ (新しい <seed>/<plant>/) への追加も検出する
+        directories.update(current_dir for current_dir, _, _ in os.walk(watch_path))
+    for directory in directories - set(watch_descriptors):
+        if os.path.isdir(directory):
+            watch_descriptors[directory] = inotify.add_watch(directory, mask)
+
+def watch_plant_definitions(
+    watch_path: str,
+    interval: float = DEFAULT_POLL_INTERVAL,
+    debounce: float = DEFAULT_DEBOUNCE_SECONDS,
+    use_inotify: bool = True,
+    initial_import: bool = False,
+    optimize_images: bool = False,
+    lod_scales: Optional[Sequence[float]] = None,
+) -> None:
+    """
+    Plant定義JSONと参照画像を監視し、変更のあったPlant/モジュールだけを再登録し続ける。
+    カタログの既存エントリは常に上書きする (allow_overwrite=True)。
+    設定ファイルは監視中メモリ上に保持し、取り込みサイクルごとに1回だけ書き込む。
+
+    Args:
+        watch_path: Plant定義JSONファイル、またはディレクトリのパス。
+        interval: ポーリング間隔 (inotify使用時は最大待ち時間)。
+        debounce: 最後の変更からこの秒数だけ静かになってから取り込む。
+        use_inotify: inotify_simple が使える場合にイベント駆動で待つかどうか。
+        initial_import: 起動時に全Plant定義を登録するかどうか。
+    """
+    state = create_watcher_state()
+    begin_config_batch(BATCHED_CONFIG_PATHS)
+    inotify = None
+    try:
+        if initial_import:
+            # 全定義JSONを取り込み待ちにして、新規定義として登録する
+            scan_for_changes(watch_path, state)
+            apply_pending_changes(watch_path, state, optimize_images, lod_scales)
+            flush_catalog_configs()
+        else:
+            take_snapshot(watch_path, state)
+
+        inotify = INotify() if use_inotify and INotify is not None else None
+        watch_descriptors: Dict[str, int] = {}
+        mode = 'inotify' if inotify is not None else f'polling every {interval}s'
+        print(f"[INFO] Watching {len(state['definitions'])} plant definition(s) in {watch_path} ({mode}). Press Ctrl+C to stop.")
+
+        while True:
+            # 取り込み待ちがある場合は、デバウンスの残り時間だけ待つ
+            timeout = interval
+            if state['pending']:
+                timeout = max(0.0, min(interval, state['last_change'] + debounce - time.monotonic()))
+
+            if inotify is not None:
+                update_inotify_watches(inotify, watch_descriptors, watch_path, state)
+                inotify.read(timeout=int(timeout * 1000))
+            else:
+                time.sleep(timeout)
+
+            scan_for_changes(watch_path, state)
+            if state['pending'] and time.monotonic() - state['last_change'] >= debounce:
+                registered_count = apply_pending_changes(watch_path, state, optimize_images, lod_scales)
+                flush_catalog_configs()
+                if registered_count:
+                    print(f"[INFO] {registered_count} plant(s) re-imported. Watching for further changes...")
+    except KeyboardInterrupt:
+        print("\n[INFO] Watcher stopped.")
+    finally:
+        if inotify is not None:
+            inotify.close()
+        end_config_batch()
+
+def main():
+    """コマンドライン引数を処理し、監視を開始します。"""
+    parser = argparse.ArgumentParser(
+        description="Plant定義JSONと画像を監視し、変更されたPlant/モジュールだけを設定カタログに再登録します。"
+    )
+    parser.add_argument(
+        'path',
+        nargs='?',
+        default=CONFIG_FILE_PATH,
+        help=f"Plant定義JSONファイル、またはディレクトリ (デフォルト: {CONFIG_FILE_PATH})"
+    )
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL, help="ポーリング間隔 (秒)")
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE_SECONDS, help="変更が落ち着くまで待つ秒数")
+    parser.add_argument('--polling', action='store_true', help="inotifyを使わずポーリングで監視する")
+    parser.add_argument('--initial-import', action='store_true', help="起動時に全Plant定義を登録する")
+    parser.add_argument('--optimize', action='store_true', help="画像をロスレス最適化してから保存する")
+    parser.add_argument('--lod', action='store_true', help=f"縮小画像 {LOD_SCALES} を生成する")
+    args = parser.parse_args()
+
+    if not args.polling and INotify is None:
+        print("[INFO] inotify_simple is not installed. Falling back to polling.")
+
+    watch_plant_definitions(
+        args.path,
+        interval=args.interval,
+        debounce=args.debounce,
+        use_inotify=not args.polling,
+        initial_import=args.initial_import,
+        optimize_images=args.optimize,
+        lod_scales=LOD_SCALES if args.lod else None,
+    )
+
+if __name__ == '__main__':
+    main()
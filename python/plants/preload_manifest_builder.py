@@ -0,0 +1,9 @@
+from utils.preload_manifest_utils import rebuild_preload_manifest
+
+
+if __name__ == '__main__':
+    # カタログ全体からプリロードマニフェストを再生成する
+    # (通常は create_new_plant が変更したPlantの分だけ差分更新する)
+    print("--- [START] Rebuilding Preload Manifest ---")
+    rebuild_preload_manifest()
+    print("--- [END] Preload Manifest Rebuilt ---")
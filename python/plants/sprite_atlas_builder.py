@@ -0,0 +1,53 @@
+import argparse
+
+from utils.sprite_atlas_utils import build_sprite_atlases, ATLAS_SCOPES
+
+
+def main():
+    """コマンドライン引数を処理し、スプライトアトラスのビルドを実行します。"""
+    parser = argparse.ArgumentParser(
+        description="モジュール画像をPlant単位またはSeed単位のスプライトアトラスにまとめます。"
+    )
+    parser.add_argument(
+        '--scope',
+        choices=ATLAS_SCOPES,
+        default='plant',
+        help="アトラスの単位 (デフォルト: plant)"
+    )
+    parser.add_argument('--seed', default=None, help="対象のSeed Type (省略時はすべて)")
+    parser.add_argument('--plant', default=None, help="対象のPlant Type (省略時はすべて)")
+    parser.add_argument(
+        '--max-width',
+        type=int,
+        default=2048,
+        help="アトラスの最大幅 (デフォルト: 2048)"
+    )
+    parser.add_argument(
+        '--padding',
+        type=int,
+        default=2,
+        help="フレーム間の余白ピクセル数 (デフォルト: 2)"
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help="入力が変わっていないアトラスも再生成し、別スコープでビルドした atlasFrame も置き換える"
+    )
+
+    args = parser.parse_args()
+
+    if args.max_width <= 0 or args.padding < 0:
+        print("[ERROR] --max-width は1以上、--padding は0以上である必要があります。")
+        return
+
+    build_sprite_atlases(
+        scope=args.scope,
+        seed_type=args.seed,
+        plant_type=args.plant,
+        max_width=args.max_width,
+        padding=args.padding,
+        force=args.force,
+    )
+
+if __name__ == '__main__':
+    main()
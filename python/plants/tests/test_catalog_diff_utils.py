@@ -0,0 +1,116 @@
+import copy
+import json
+
+import pytest
+
+from utils.catalog_diff_utils import (
+    CATALOG_FILES, apply_catalog_patch, apply_patch_chain, compute_catalog_hash, count_patch_operations,
+    diff_catalogs, load_catalog, save_catalog,
+)
+
+
+BASE_CATALOG = {
+    'seeds': {
+        'rare': {'plants': {'Rose': {'minSize': 100, 'maxSize': 200, 'rarity': 'R', 'weight': 10}}},
+        'common': {'plants': {'Daisy': {'minSize': 80, 'maxSize': 120, 'rarity': 'N', 'weight': 100}}},
+    },
+    'plants': {
+        'RARE_ROSE': {'modules': {'stem': {'v0': {'moduleRarity': 'N', 'weight': 100}}}},
+        'COMMON_DAISY': {'modules': {'flower': {'sr': {'moduleRarity': 'SR', 'weight': 5}}}},
+    },
+    'modules': {
+        'RARE_ROSE_STEM_V0': {'imgPath': 'a/stem_v0.png', 'zIndex': 1},
+        'COMMON_DAISY_FLOWER_SR': {'imgPath': 'b/sr.png', 'zIndex': 2},
+    },
+}
+
+def make_target() -> dict:
+    target = copy.deepcopy(BASE_CATALOG)
+    target['seeds']['rare']['plants']['Rose']['weight'] = 20 # update
+    target['plants']['RARE_ROSE']['modules']['stem']['v1'] = {'moduleRarity': 'R', 'weight': 50} # add
+    target['modules']['RARE_ROSE_STEM_V1'] = {'imgPath': 'a/stem_v1.png', 'zIndex': 1} # add
+    del target['modules']['COMMON_DAISY_FLOWER_SR'] # delete
+    del target['plants']['COMMON_DAISY']['modules']['flower']['sr'] # delete
+    target['seeds'] = {'common': target['seeds']['common'], 'rare': target['seeds']['rare']} # reorder
+    return target
+
+def dumps(catalog: dict) -> str:
+    return json.dumps(catalog, ensure_ascii=False)
+
+def test_diff_and_apply_round_trip():
+    target = make_target()
+    patch = diff_catalogs(BASE_CATALOG, target)
+    result = apply_catalog_patch(BASE_CATALOG, patch)
+
+    assert dumps(result) == dumps(target) # キー順序まで一致する
+    assert compute_catalog_hash(result) == patch['targetHash']
+    assert count_patch_operations(patch) == {'adds': 2, 'updates': 1, 'deletes': 2, 'orders': 1}
+
+def test_apply_does_not_modify_base():
+    before = dumps(BASE_CATALOG)
+    apply_catalog_patch(BASE_CATALOG, diff_catalogs(BASE_CATALOG, make_target()))
+
+    assert dumps(BASE_CATALOG) == before
+
+def test_reorder_only_changes_hash_and_round_trips():
+    target = copy.deepcopy(BASE_CATALOG)
+    target['modules'] = dict(reversed(list(target['modules'].items())))
+    patch = diff_catalogs(BASE_CATALOG, target)
+
+    assert patch['baseHash'] != patch['targetHash']
+    assert count_patch_operations(patch) == {'adds': 0, 'updates': 0, 'deletes': 0, 'orders': 1}
+    assert dumps(apply_catalog_patch(BASE_CATALOG, patch)) == dumps(target)
+
+def test_identical_catalogs_produce_empty_patch():
+    patch = diff_catalogs(BASE_CATALOG, copy.deepcopy(BASE_CATALOG))
+
+    assert patch['files'] == {}
+    assert patch['baseHash'] == patch['targetHash']
+
+def test_patch_chain_round_trip():
+    middle = make_target()
+    final = copy.deepcopy(middle)
+    final['modules']['RARE_ROSE_STEM_V1']['zIndex'] = 3
+    patches = [diff_catalogs(BASE_CATALOG, middle), diff_catalogs(middle, final)]
+
+    assert dumps(apply_patch_chain(BASE_CATALOG, patches)) == dumps(final)
+
+def test_apply_rejects_base_hash_mismatch():
+    patch = diff_catalogs(BASE_CATALOG, make_target())
+    other = copy.deepcopy(BASE_CATALOG)
+    other['modules']['RARE_ROSE_STEM_V0']['zIndex'] = 9
+
+    with pytest.raises(ValueError):
+        apply_catalog_patch(other, patch)
+
+def test_patch_chain_rejects_broken_chain():
+    patch = diff_catalogs(BASE_CATALOG, make_target())
+
+    with pytest.raises(ValueError):
+        apply_patch_chain(BASE_CATALOG, [patch, patch])
+
+def test_save_and_load_catalog_round_trip(tmp_path):
+    save_catalog(str(tmp_path), BASE_CATALOG)
+
+    assert dumps(load_catalog(str(tmp_path))) == dumps(BASE_CATALOG)
+
+def test_load_catalog_rejects_missing_directory(tmp_path):
+    missing = tmp_path / 'missing'
+
+    with pytest.raises(FileNotFoundError):
+        load_catalog(str(missing))
+    assert not missing.exists()
+
+def test_load_catalog_rejects_missing_file(tmp_path):
+    save_catalog(str(tmp_path), BASE_CATALOG)
+    (tmp_path / CATALOG_FILES['plants']).unlink()
+
+    with pytest.raises(FileNotFoundError):
+        load_catalog(str(tmp_path))
+
+def test_load_catalog_rejects_invalid_json(tmp_path):
+    save_catalog(str(tmp_path), BASE_CATALOG)
+    (tmp_path / CATALOG_FILES['seeds']).write_text('{', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        load_catalog(str(tmp_path))
@@ -0,0 +1,56 @@
+import json
+
+from utils.catalog_diff_utils import compute_catalog_hash
+from utils.catalog_model import CatalogModel
+
+
+CATALOG = {
+    'seeds': {
+        'rare': {
+            'plants': {
+                'Rose': {'minSize': 100, 'maxSize': 200, 'rarity': 'R', 'weight': 10},
+                # 既知フィールドが後ろにあるレコード
+                'Tulip': {'note': 'x', 'weight': 5, 'rarity': 'N', 'minSize': 1},
+            },
+            'label': 'Rare',
+        },
+        'common': {'label': 'Common', 'plants': {}},
+    },
+    'plants': {
+        'RARE_ROSE': {'modules': {'stem': {'v0': {'weight': 100, 'moduleRarity': 'N'}}}},
+        'RARE_TULIP': {'lastEdited': 1, 'modules': {'stem': {'v0': {'moduleRarity': 'N', 'weight': 1}}}},
+        'ORPHAN_PLANT': {'modules': {}},
+    },
+    'modules': {
+        'RARE_ROSE_STEM_V0': {
+            'imgPath': 'public/assets/images/plantModules/seeds/rare/plants/rose/parts/stem/modules/v0/v0.png',
+            'zIndex': 1,
+        },
+        'RARE_TULIP_STEM_V0': {
+            'atlasFrame': {'atlasPath': 'atlas.png', 'x': 0, 'y': 0, 'width': 1, 'height': 1},
+            'zIndex': 2,
+            'imgPath': 'tulip.png',
+        },
+    },
+}
+
+def test_to_catalog_preserves_values_and_key_order():
+    catalog = CatalogModel(CATALOG).to_catalog()
+
+    assert json.dumps(catalog) == json.dumps(CATALOG)
+    assert compute_catalog_hash(catalog) == compute_catalog_hash(CATALOG)
+
+def test_key_order_is_kept_only_when_it_differs():
+    model = CatalogModel(CATALOG)
+
+    assert model.seeds['rare'].plants['Rose'].key_order is None
+    assert model.seeds['rare'].plants['Tulip'].key_order == ('note', 'weight', 'rarity', 'minSize')
+    assert model.seeds['common'].key_order == ('label', 'plants')
+    assert model.modules['RARE_ROSE_STEM_V0'].key_order is None
+    assert model.modules['RARE_TULIP_STEM_V0'].key_order == ('atlasFrame', 'zIndex', 'imgPath')
+
+def test_modules_are_linked_through_seeds():
+    model = CatalogModel(CATALOG)
+
+    assert model.get_module_setting('rare', 'Rose', 'stem', 'v0') is model.modules['RARE_ROSE_STEM_V0']
+    assert model.plants['ORPHAN_PLANT'].directory_path is None
@@ -0,0 +1,83 @@
+import random
+import struct
+import zlib
+
+import pytest
+
+from utils.png_utils import (
+    PNG_SIGNATURE, RgbaImage, build_png_chunk, build_png_header, decode_png, encode_png, get_png_size,
+    read_png_chunks, parse_png_header,
+)
+from utils.png_optimizer import FULL_SEARCH_MAX_PIXELS, OPTIMIZE_MAX_PIXELS, optimize_png
+
+
+def make_image(width: int, height: int, colors: list, seed: int = 0) -> RgbaImage:
+    rng = random.Random(seed)
+    pixels = bytearray()
+    for _ in range(width * height):
+        pixels.extend(rng.choice(colors))
+    return RgbaImage(width, height, pixels)
+
+def make_noise_image(width: int, height: int, seed: int = 0) -> RgbaImage:
+    rng = random.Random(seed)
+    return RgbaImage(width, height, bytearray(rng.randrange(256) for _ in range(width * height * 4)))
+
+def get_color_type(data: bytes) -> int:
+    return parse_png_header(read_png_chunks(data)[0][1])['colorType']
+
+IMAGES = {
+    'palette_with_alpha': make_image(20, 12, [(255, 0, 0, 255), (0, 255, 0, 128), (0, 0, 0, 0)]),
+    'palette_opaque': make_image(9, 9, [(10, 20, 30, 255), (200, 100, 50, 255)]),
+    'gray': make_image(17, 5, [(v, v, v, 255) for v in range(0, 256, 3)]),
+    'gray_alpha': make_image(8, 8, [(v, v, v, a) for v in range(0, 256, 5) for a in (0, 90, 255)]),
+    'rgb': make_image(12, 12, [(r, g, 7, 255) for r in range(0, 256, 8) for g in range(0, 256, 8)]),
+    'rgba_noise': make_noise_image(16, 16),
+}
+
+@pytest.mark.parametrize('name', sorted(IMAGES))
+def test_optimize_png_is_lossless(name):
+    data = encode_png(IMAGES[name])
+    optimized = optimize_png(data)
+
+    assert len(optimized) <= len(data)
+    assert get_png_size(optimized) == get_png_size(data)
+    assert decode_png(optimized) == decode_png(data)
+
+def test_optimize_png_reduces_color_type():
+    assert get_color_type(optimize_png(encode_png(IMAGES['palette_with_alpha']))) == 3
+    assert get_color_type(optimize_png(encode_png(IMAGES['gray']))) == 0
+
+def test_optimize_png_large_image_uses_fast_path_and_stays_lossless():
+    side = int(FULL_SEARCH_MAX_PIXELS ** 0.5) + 1
+    image = make_image(side, side, [(0, 0, 0, 0), (255, 255, 255, 255), (30, 60, 90, 255)])
+    data = encode_png(image)
+    optimized = optimize_png(data)
+
+    assert len(optimized) <= len(data)
+    assert decode_png(optimized) == image
+
+def test_optimize_png_skips_images_above_limit():
+    header = {'width': OPTIMIZE_MAX_PIXELS + 1, 'height': 1, 'bitDepth': 8, 'colorType': 6}
+    # 1行だけの細長い画像で、画素数の上限を超えさせる
+    data = (
+        PNG_SIGNATURE
+        + build_png_chunk(b'IHDR', build_png_header(header))
+        + build_png_chunk(b'IDAT', zlib.compress(bytes((header['width'] * 4 + 1))))
+        + build_png_chunk(b'IEND', b'')
+    )
+
+    assert optimize_png(data) is data
+
+@pytest.mark.parametrize('data', [
+    b'not a png',
+    encode_png(IMAGES['rgb'])[:40],
+    PNG_SIGNATURE + build_png_chunk(b'IHDR', b'\x00\x01') + build_png_chunk(b'IEND', b''),
+    # パレット画像なのにPLTEが短い (インデックスが範囲外)
+    PNG_SIGNATURE
+    + build_png_chunk(b'IHDR', struct.pack('>IIBBBBB', 4, 1, 8, 3, 0, 0, 0))
+    + build_png_chunk(b'PLTE', b'\x00\x00\x00')
+    + build_png_chunk(b'IDAT', zlib.compress(b'\x00\x05\x05\x05\x05'))
+    + build_png_chunk(b'IEND', b''),
+])
+def test_optimize_png_returns_malformed_input_unchanged(data):
+    assert optimize_png(data) == data
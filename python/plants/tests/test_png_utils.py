@@ -0,0 +1,81 @@
+import random
+import struct
+import zlib
+
+import pytest
+
+from utils.png_utils import (
+    PNG_SIGNATURE, RgbaImage, build_png_chunk, build_png_header, create_blank_image, blit_image,
+    decode_png, encode_png, filter_scanlines, get_png_size, unfilter_scanlines,
+)
+
+
+def make_noise_image(width: int, height: int, seed: int = 0) -> RgbaImage:
+    rng = random.Random(seed)
+    return RgbaImage(width, height, bytearray(rng.randrange(256) for _ in range(width * height * 4)))
+
+def make_png(header_body: bytes, *chunks: bytes) -> bytes:
+    return PNG_SIGNATURE + build_png_chunk(b'IHDR', header_body) + b''.join(chunks) + build_png_chunk(b'IEND', b'')
+
+@pytest.mark.parametrize('width, height', [(1, 1), (7, 3), (16, 16), (33, 5)])
+def test_encode_decode_round_trip(width, height):
+    image = make_noise_image(width, height)
+    data = encode_png(image)
+
+    assert get_png_size(data) == (width, height)
+    assert decode_png(data) == image
+
+@pytest.mark.parametrize('filter_type', [0, 1, 2, 3, 4, None])
+@pytest.mark.parametrize('bpp', [1, 3, 4])
+def test_filter_unfilter_round_trip(filter_type, bpp):
+    image = make_noise_image(5, 6, seed=bpp)
+    stride = 5 * bpp
+    rows = [bytes(image.pixels[y * stride:(y + 1) * stride]) for y in range(6)]
+    header = {'width': 5, 'height': 6, 'bitDepth': 8, 'colorType': {1: 0, 3: 2, 4: 6}[bpp], 'interlace': 0}
+
+    assert unfilter_scanlines(filter_scanlines(rows, bpp, filter_type), header) == rows
+
+def test_blit_image_copies_into_offset():
+    dest = create_blank_image(4, 4)
+    src = RgbaImage(2, 1, bytearray(b'\x01\x02\x03\x04\x05\x06\x07\x08'))
+    blit_image(dest, src, 1, 2)
+
+    assert dest.pixels[(2 * 4 + 1) * 4:(2 * 4 + 3) * 4] == src.pixels
+    assert dest.pixels.count(0) == len(dest.pixels) - len(src.pixels)
+
+@pytest.mark.parametrize('data', [
+    b'not a png',
+    PNG_SIGNATURE,
+    encode_png(create_blank_image(2, 2))[:20], # IHDRの途中で切れている
+    make_png(b'\x00\x00\x00\x01'), # IHDRが短い
+    make_png(struct.pack('>IIBBBBB', 1, 1, 0, 0, 0, 0, 0)), # ビット深度0
+    make_png(struct.pack('>IIBBBBB', 1, 1, 8, 5, 0, 0, 0)), # 未定義のカラータイプ
+    PNG_SIGNATURE + build_png_chunk(b'IDAT', b''), # IHDRが無い
+])
+def test_malformed_header_raises_value_error(data):
+    with pytest.raises(ValueError):
+        get_png_size(data)
+    with pytest.raises(ValueError):
+        decode_png(data)
+
+@pytest.mark.parametrize('data', [
+    # tRNSが短い (RGBは6バイト必要)
+    make_png(
+        build_png_header({'width': 1, 'height': 1, 'bitDepth': 8, 'colorType': 2}),
+        build_png_chunk(b'tRNS', b'\x00'),
+        build_png_chunk(b'IDAT', zlib.compress(b'\x00\x01\x02\x03')),
+    ),
+    # IDATが展開できない
+    make_png(
+        build_png_header({'width': 1, 'height': 1, 'bitDepth': 8, 'colorType': 6}),
+        build_png_chunk(b'IDAT', b'\x00garbage'),
+    ),
+    # IDATが短い
+    make_png(
+        build_png_header({'width': 4, 'height': 4, 'bitDepth': 8, 'colorType': 6}),
+        build_png_chunk(b'IDAT', zlib.compress(b'\x00' * 5)),
+    ),
+])
+def test_malformed_image_data_raises_value_error(data):
+    with pytest.raises(ValueError):
+        decode_png(data)
@@ -0,0 +1,43 @@
+import random
+from typing import Dict, Tuple
+
+import pytest
+
+from utils.sprite_atlas_utils import Rect, pack_rectangles
+
+
+def make_sizes(count: int, seed: int) -> Dict[str, Tuple[int, int]]:
+    rng = random.Random(seed)
+    return {f"module_{i}": (rng.randint(1, 120), rng.randint(1, 120)) for i in range(count)}
+
+def overlaps(a: Rect, b: Rect, padding: int) -> bool:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw + padding and bx < ax + aw + padding and ay < by + bh + padding and by < ay + ah + padding
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('padding', [0, 2])
+def test_pack_rectangles_has_no_overlap(seed, padding):
+    sizes = make_sizes(40, seed)
+    width, height, frames = pack_rectangles(sizes, max_width=512, padding=padding)
+
+    assert set(frames) == set(sizes)
+    for key, (x, y, w, h) in frames.items():
+        assert (w, h) == sizes[key]
+        assert x >= 0 and y >= 0 and x + w <= width and y + h <= height
+    rects = list(frames.values())
+    for i, a in enumerate(rects):
+        for b in rects[i + 1:]:
+            assert not overlaps(a, b, padding)
+
+def test_pack_rectangles_respects_max_width():
+    width, _, _ = pack_rectangles(make_sizes(60, 42), max_width=256, padding=2)
+
+    assert width <= 256
+
+def test_pack_rectangles_rejects_too_wide_image():
+    with pytest.raises(ValueError):
+        pack_rectangles({'wide': (300, 10)}, max_width=256)
+
+def test_pack_rectangles_empty():
+    assert pack_rectangles({}) == (0, 0, {})
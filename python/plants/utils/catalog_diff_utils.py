@@ -0,0 +1,281 @@
+import os
+import copy
+import json
+import hashlib
+from typing import Dict, Any, List, Optional
+
+from config import SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH
+from utils.config_io_utils import save_config
+
+
+# -------------------------
+
+# パッチ形式のバージョン (形式を変更した場合に上げる)
+PATCH_FORMAT = 'growth-cycle-catalog-patch'
+PATCH_VERSION = 2 # v2: ハッシュがキー順序を含み、キー順序の変更を 'orders' で表す
+
+# カタログを構成する設定ファイル { カタログ名: ファイル名 }
+CATALOG_FILES: Dict[str, str] = {
+    'seeds': os.path.basename(SEEDS_CONFIG_JSON_PATH),
+    'plants': os.path.basename(PLANTS_CONFIG_JSON_PATH),
+    'modules': os.path.basename(MODULES_CONFIG_JSON_PATH),
+}
+
+# 差分を取るキーの深さ
+# seeds:   seed -> 'plants' -> plantType
+# plants:  PLANT_KEY -> 'modules' -> partType -> moduleType
+# modules: MODULE_KEY
+DIFF_DEPTHS: Dict[str, int] = {
+    'seeds': 3,
+    'plants': 4,
+    'modules': 1,
+}
+
+# --- データ構造の定義 (型ヒント用) ---
+# { 'seeds': seeds_config, 'plants': plants_config, 'modules': modules_config }
+Catalog = Dict[str, Dict[str, Any]]
+
+# { 'path': [key, ...], 'value': Any } (deletesはpathのみ、ordersは 'path' と並び順の 'keys')
+PatchOperation = Dict[str, Any]
+
+# { 'adds': [...], 'updates': [...], 'deletes': [...], 'orders': [...] }
+FilePatch = Dict[str, List[PatchOperation]]
+
+CatalogPatch = Dict[str, Any]
+
+# --- ヘルパー関数定義 ---
+
+def load_catalog(directory: str) -> Catalog:
+    """
+    ディレクトリから3つの設定ファイルを読み込む。
+    パスの打ち間違いで空のカタログと比較しないよう、load_config とは異なり欠けたファイルを空の辞書として扱わない
+    (ディレクトリも作成しない)。
+
+    Raises:
+        FileNotFoundError: ディレクトリまたは設定ファイルが存在しない場合
+        ValueError: 設定ファイルがJSONとして読み込めない場合
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Catalog directory not found: {directory}")
+    missing = [
+        file_name for file_name in CATALOG_FILES.values()
+        if not os.path.isfile(os.path.join(directory, file_name))
+    ]
+    if missing:
+        raise FileNotFoundError(f"Catalog files missing in {directory}: {', '.join(missing)}")
+
+    catalog: Catalog = {}
+    for name, file_name in CATALOG_FILES.items():
+        path = os.path.join(directory, file_name)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                catalog[name] = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in catalog file {path}: {e}")
+    return catalog
+
+def save_catalog(directory: str, catalog: Catalog) -> None:
+    """3つの設定ファイルをディレクトリに保存する。"""
+    for name, file_name in CATALOG_FILES.items():
+        save_config(os.path.join(directory, file_name), catalog.get(name, {}))
+
+def compute_catalog_hash(catalog: Catalog) -> str:
+    """
+    カタログ内容のハッシュを計算する。
+    空白に依存しないよう正規化したJSONから計算する。保存されるファイルと同じになるよう、キー順序はファイルの順序のまま含める。
+    """
+    canonical = json.dumps(
+        {name: catalog.get(name, {}) for name in CATALOG_FILES},
+        separators=(',', ':'),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+# --- 差分計算 ---
+
+def _equal_in_order(a: Any, b: Any) -> bool:
+    """辞書のキー順序まで含めて2つの値が等しいかどうか (== は辞書のキー順序を無視する)。"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        return list(a) == list(b) and all(_equal_in_order(a[key], b[key]) for key in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_equal_in_order(x, y) for x, y in zip(a, b))
+    return a == b
+
+def diff_by_key(
+    base: Dict[str, Any],
+    target: Dict[str, Any],
+    depth: int,
+    prefix: Optional[List[str]] = None,
+) -> FilePatch:
+    """
+    2つの辞書をキー単位で比較し、追加・更新・削除・並び替えの操作を返す。
+    depthの深さまでは、両方に存在する辞書同士を再帰的に比較する。
+    追加したキーは末尾に入るため、それで target のキー順序にならない場合は orders に並び順を記録する。
+
+    Args:
+        base: 変更前の辞書
+        target: 変更後の辞書
+        depth: 再帰的に比較するキーの深さ (1なら最上位キーのみ)
+        prefix: 再帰呼び出し用のキーパス
+
+    Returns:
+        {'adds': [...], 'updates': [...], 'deletes': [...], 'orders': [...]}
+    """
+    prefix = prefix or []
+    result: FilePatch = {'adds': [], 'updates': [], 'deletes': [], 'orders': []}
+
+    for key, target_value in target.items():
+        path = prefix + [key]
+        if key not in base:
+            result['adds'].append({'path': path, 'value': target_value})
+            continue
+        base_value = base[key]
+        if _equal_in_order(base_value, target_value):
+            continue
+        if depth > 1 and isinstance(base_value, dict) and isinstance(target_value, dict):
+            nested = diff_by_key(base_value, target_value, depth - 1, path)
+            for section in result:
+                result[section].extend(nested[section])
+        else:
+            result['updates'].append({'path': path, 'value': target_value})
+
+    for key in base:
+        if key not in target:
+            result['deletes'].append({'path': prefix + [key]})
+
+    # パッチ適用後の並び (削除後の既存キー + 追加キー) が target と異なる場合のみ並び順を記録する
+    applied_order = [key for key in base if key in target] + [key for key in target if key not in base]
+    if applied_order != list(target):
+        result['orders'].append({'path': prefix, 'keys': list(target)})
+
+    return result
+
+def diff_catalogs(base: Catalog, target: Catalog) -> CatalogPatch:
+    """
+    2つのカタログから、バージョン付きのパッチを生成する。
+
+    Returns:
+        {
+            'format': 'growth-cycle-catalog-patch', 'version': 2,
+            'baseHash': str, 'targetHash': str,
+            'files': { 'seeds': FilePatch, 'plants': FilePatch, 'modules': FilePatch }
+        }
+    """
+    files: Dict[str, FilePatch] = {}
+    for name in CATALOG_FILES:
+        file_patch = diff_by_key(base.get(name, {}), target.get(name, {}), DIFF_DEPTHS[name])
+        # 変更の無いセクションは出力しない (パッチを小さく保つ)
+        compact = {section: ops for section, ops in file_patch.items() if ops}
+        if compact:
+            files[name] = compact
+
+    return {
+        'format': PATCH_FORMAT,
+        'version': PATCH_VERSION,
+        'baseHash': compute_catalog_hash(base),
+        'targetHash': compute_catalog_hash(target),
+        'files': files,
+    }
+
+# --- パッチ適用 ---
+
+def _resolve_parent(data: Dict[str, Any], path: List[str], create: bool) -> Dict[str, Any]:
+    """pathの親にあたる辞書を返す。createがTrueなら途中の辞書を作成する。"""
+    node = data
+    for key in path[:-1]:
+        if key not in node:
+            if not create:
+                raise ValueError(f"Patch path not found: {'/'.join(path)}")
+            node[key] = {}
+        node = node[key]
+        if not isinstance(node, dict):
+            raise ValueError(f"Patch path is not a mapping: {'/'.join(path)}")
+    return node
+
+def _resolve_node(data: Dict[str, Any], path: List[str]) -> Dict[str, Any]:
+    """pathが指す辞書を返す (空のpathはdata自身)。"""
+    node = data
+    for key in path:
+        node = node.get(key) if isinstance(node, dict) else None
+        if not isinstance(node, dict):
+            raise ValueError(f"Patch path is not a mapping: {'/'.join(path)}")
+    return node
+
+def apply_file_patch(data: Dict[str, Any], file_patch: FilePatch) -> None:
+    """1ファイル分のパッチを辞書に適用する (dataを直接変更する)。"""
+    for op in file_patch.get('deletes', []):
+        parent = _resolve_parent(data, op['path'], create=False)
+        if op['path'][-1] not in parent:
+            raise ValueError(f"Cannot delete missing key: {'/'.join(op['path'])}")
+        del parent[op['path'][-1]]
+    for op in file_patch.get('updates', []):
+        parent = _resolve_parent(data, op['path'], create=False)
+        if op['path'][-1] not in parent:
+            raise ValueError(f"Cannot update missing key: {'/'.join(op['path'])}")
+        parent[op['path'][-1]] = copy.deepcopy(op['value'])
+    for op in file_patch.get('adds', []):
+        parent = _resolve_parent(data, op['path'], create=True)
+        if op['path'][-1] in parent:
+            raise ValueError(f"Cannot add existing key: {'/'.join(op['path'])}")
+        parent[op['path'][-1]] = copy.deepcopy(op['value'])
+    for op in file_patch.get('orders', []):
+        node = _resolve_node(data, op['path'])
+        if sorted(op['keys']) != sorted(node):
+            raise ValueError(f"Cannot reorder keys that do not match: {'/'.join(op['path']) or '(root)'}")
+        reordered = {key: node[key] for key in op['keys']}
+        node.clear()
+        node.update(reordered)
+
+def apply_catalog_patch(catalog: Catalog, patch: CatalogPatch) -> Catalog:
+    """
+    パッチをカタログに適用し、新しいカタログを返す (元のカタログは変更しない)。
+
+    Raises:
+        ValueError: パッチ形式が不正な場合、またはベース/適用後のハッシュが一致しない場合
+    """
+    if patch.get('format') != PATCH_FORMAT or patch.get('version') != PATCH_VERSION:
+        raise ValueError(
+            f"Unsupported patch format: {patch.get('format')} v{patch.get('version')}. "
+            f"Expected {PATCH_FORMAT} v{PATCH_VERSION}."
+        )
+
+    current_hash = compute_catalog_hash(catalog)
+    if current_hash != patch['baseHash']:
+        raise ValueError(
+            f"Base hash mismatch (Integrity Check Failed): catalog is {current_hash[:12]}, "
+            f"patch expects {patch['baseHash'][:12]}."
+        )
+
+    result = copy.deepcopy(catalog)
+    for name in CATALOG_FILES:
+        result.setdefault(name, {})
+        apply_file_patch(result[name], patch['files'].get(name, {}))
+
+    result_hash = compute_catalog_hash(result)
+    if result_hash != patch['targetHash']:
+        raise ValueError(
+            f"Target hash mismatch after applying patch: got {result_hash[:12]}, "
+            f"expected {patch['targetHash'][:12]}."
+        )
+    return result
+
+def apply_patch_chain(catalog: Catalog, patches: List[CatalogPatch]) -> Catalog:
+    """
+    複数のパッチを順に適用する。各パッチのbaseHashは直前のtargetHashと一致している必要がある。
+
+    Raises:
+        ValueError: チェーンが途切れている場合、または各パッチの検証に失敗した場合
+    """
+    for index, patch in enumerate(patches):
+        if index > 0 and patch.get('baseHash') != patches[index - 1].get('targetHash'):
+            raise ValueError(f"Patch chain is broken at index {index}: baseHash does not follow previous targetHash.")
+        catalog = apply_catalog_patch(catalog, patch)
+    return catalog
+
+def count_patch_operations(patch: CatalogPatch) -> Dict[str, int]:
+    """ログ出力用に、パッチ内の操作数を集計する。"""
+    counts = {'adds': 0, 'updates': 0, 'deletes': 0, 'orders': 0}
+    for file_patch in patch.get('files', {}).values():
+        for section, ops in file_patch.items():
+            counts[section] += len(ops)
+    return counts
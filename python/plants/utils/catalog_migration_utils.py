@@ -0,0 +1,502 @@
+import os
+import copy
+import json
+import errno
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH, CACHE_DIR
+from utils.module_config_utils import (
+    DirectoryKeys, get_plant_key, get_module_key, get_module_image_directory_path, get_local_file_path,
+)
+from utils.config_io_utils import load_config
+from utils.reverse_generation_cache import clear_reverse_cache
+from utils.preload_manifest_utils import rebuild_preload_manifest
+from utils.sprite_atlas_utils import get_atlas_path, discard_atlases, build_sprite_atlases
+
+
+# -------------------------
+
+# アセット移動の並列数 (os.rename はI/O待ちが主なのでスレッドで並列化する)
+DEFAULT_MOVE_WORKERS = 16
+
+# 一時ファイルの拡張子 (設定ファイルの書き込み途中で中断しても元のファイルは壊れない)
+TEMP_SUFFIX = '.migration.tmp'
+
+# 設定ファイルの入れ替え途中で中断した場合に、入れ替えを完了させるためのジャーナル
+# (このファイルが存在する = 3つの一時ファイルは書き込み済みで、入れ替えを確定した状態)
+MIGRATION_JOURNAL_PATH = os.path.join(CACHE_DIR, 'migration_journal.json')
+
+# --- データ構造の定義 (型ヒント用) ---
+# { 'seeds': seeds_config, 'plants': plants_config, 'modules': modules_config }
+Catalog = Dict[str, Dict[str, Any]]
+
+# (移動元のパス, 移動先のパス)
+AssetMove = Tuple[str, str]
+
+# 移行後に作り直すアトラス { 旧atlasPath: (scope, 新seedType, 新plantType または None) | None (ビルド単位が不明) }
+StaleAtlases = Dict[str, Optional[Tuple[str, str, Optional[str]]]]
+
+# 移行計画
+# {
+#   'catalog': 移行後のカタログ,
+#   'moves': [AssetMove, ...],
+#   'renamed_plants': { 旧PLANT_KEY: 新PLANT_KEY },
+#   'rewritten_modules': 新しいキーまたはimgPathになったモジュール数,
+#   'dropped_atlas_frames': atlasFrame を削除したモジュール数,
+#   'stale_atlases': StaleAtlases,
+#   'changed': 設定ファイルまたはアセットに変更があるかどうか,
+# }
+MigrationPlan = Dict[str, Any]
+
+# --- ヘルパー関数定義 ---
+
+def parse_seed_renames(values: List[str]) -> Dict[str, str]:
+    """'old=new' 形式の指定を { 旧seed: 新seed } に変換する (seedキーは小文字)。"""
+    renames: Dict[str, str] = {}
+    for value in values:
+        old, sep, new = value.partition('=')
+        if not sep or not old or not new:
+            raise ValueError(f"Invalid seed rename '{value}'. Expected OLD=NEW.")
+        renames[old.lower()] = new.lower()
+    return renames
+
+def parse_plant_renames(values: List[str]) -> Dict[Tuple[str, str], str]:
+    """'seed/Old=New' 形式の指定を { (seed, 旧plantType): 新plantType } に変換する。"""
+    renames: Dict[Tuple[str, str], str] = {}
+    for value in values:
+        source, sep, new = value.partition('=')
+        seed_type, slash, old = source.partition('/')
+        if not sep or not slash or not seed_type or not old or not new:
+            raise ValueError(f"Invalid plant rename '{value}'. Expected SEED/OLD=NEW.")
+        renames[(seed_type.lower(), old)] = new
+    return renames
+
+def get_migrated_path(img_path: str, directory_path: str) -> str:
+    """imgPath のファイル名を保ったまま、新しいディレクトリ配下のパスにする。"""
+    return os.path.join(directory_path, os.path.basename(get_local_file_path(img_path)))
+
+def list_variant_siblings(image_path: str) -> List[str]:
+    """画像と同じディレクトリにある縮小画像 ('<stem>@*') のパスを返す (variants に載っていないものも含む)。"""
+    directory, file_name = os.path.split(image_path)
+    if not os.path.isdir(directory or '.'):
+        return []
+    stem = os.path.splitext(file_name)[0]
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory or '.'))
+        if name.startswith(f"{stem}@")
+    ]
+
+def migrate_module_setting(
+    module_setting: Dict[str, Any],
+    directory_path: str,
+    moves: List[AssetMove],
+) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    ModuleSettingの imgPath (と variants の imgPath) を新しいディレクトリに書き換え、必要な移動を moves に追加する。
+    variants に載っていない '<stem>@*' の縮小画像も一緒に移動する。
+
+    Returns:
+        (書き換え後のModuleSetting, 削除した atlasFrame の atlasPath または None)
+    """
+    new_setting = copy.deepcopy(module_setting)
+    targets = [new_setting] + [variant for variant in new_setting.get('variants', []) if isinstance(variant, dict)]
+    # variants の 1.0x は imgPath と同じファイルを指すため、同じ移動は1度だけ登録する
+    queued: Dict[str, str] = {}
+    for target in targets:
+        img_path = target.get('imgPath')
+        if not img_path:
+            continue
+        source = get_local_file_path(img_path)
+        new_path = get_migrated_path(img_path, directory_path)
+        if source == new_path:
+            continue
+        if source not in queued:
+            queued[source] = new_path
+            moves.append((source, new_path))
+        target['imgPath'] = new_path
+    changed = bool(queued)
+
+    img_path = module_setting.get('imgPath')
+    if changed and img_path:
+        for sibling in list_variant_siblings(get_local_file_path(img_path)):
+            if sibling not in queued:
+                queued[sibling] = get_migrated_path(sibling, directory_path)
+                moves.append((sibling, queued[sibling]))
+
+    # アトラスは Seed/Plant 単位のパスに焼き込まれているため、移動したモジュールの座標は無効になる
+    atlas_frame = new_setting.pop('atlasFrame', None) if changed else None
+    dropped_atlas_path = atlas_frame.get('atlasPath') if isinstance(atlas_frame, dict) else None
+    return new_setting, dropped_atlas_path
+
+def get_atlas_rebuild_target(
+    atlas_path: str,
+    seed_type: str,
+    plant_type: str,
+    new_seed_type: str,
+    new_plant_type: str,
+) -> Optional[Tuple[str, str, Optional[str]]]:
+    """
+    移動したモジュールが載っていたアトラスを、移行後にどの単位で作り直すかを返す。
+
+    Returns:
+        (scope, 新seedType, 新plantType または None) / sprite_atlas_builder の出力でない場合は None
+    """
+    local_path = get_local_file_path(atlas_path)
+    if local_path == get_atlas_path(seed_type, plant_type):
+        return ('plant', new_seed_type, new_plant_type)
+    if local_path == get_atlas_path(seed_type):
+        return ('seed', new_seed_type, None)
+    return None
+
+def validate_moves(moves: List[AssetMove]) -> List[AssetMove]:
+    """
+    移動計画の衝突を検出し、同一の移動 (移動元・移動先が同じ組) を1つにまとめる。
+
+    Returns:
+        重複を除いた移動計画 (元の順序を保つ)
+
+    Raises:
+        ValueError: 同じ移動元が別々の移動先を持つ場合、同じ移動先が複数ある場合、
+                    移動先が別の移動元になっている場合、または移動先に無関係なファイルが既に存在する場合
+    """
+    unique_moves: List[AssetMove] = list(dict.fromkeys(moves))
+    sources: Dict[str, str] = {}
+    destinations: Dict[str, str] = {}
+    for source, destination in unique_moves:
+        if source in sources:
+            raise ValueError(f"One asset would be moved to two paths: {source} -> {sources[source]}, {destination}")
+        sources[source] = destination
+        if destination in destinations:
+            raise ValueError(f"Two assets would be moved to the same path: {destination}")
+        destinations[destination] = source
+    for source, destination in unique_moves:
+        if destination in sources:
+            raise ValueError(f"Destination is also a migration source (chained rename): {destination}. Split the migration into two runs.")
+        if os.path.exists(destination) and os.path.exists(source):
+            raise ValueError(f"Destination already exists: {destination}")
+    return unique_moves
+
+# --- 計画 ---
+
+def plan_migration(
+    catalog: Catalog,
+    seed_renames: Optional[Dict[str, str]] = None,
+    plant_renames: Optional[Dict[Tuple[str, str], str]] = None,
+    directory_keys: Optional[DirectoryKeys] = None,
+) -> MigrationPlan:
+    """
+    Seed/Plantの名前変更とディレクトリ構成の変更から、移行後のカタログとアセットの移動計画を作る。
+    ファイルには一切触れない (--dry-run でそのまま表示できる)。
+
+    Args:
+        catalog: 移行前のカタログ
+        seed_renames: { 旧seed: 新seed }
+        plant_renames: { (旧seed, 旧plantType): 新plantType }
+        directory_keys: 移行後のディレクトリ構成 (省略時は config.py の現在の値)
+
+    Raises:
+        ValueError: 名前変更の結果、PLANT_KEY/MODULE_KEY やアセットのパスが衝突する場合
+    """
+    seed_renames = seed_renames or {}
+    plant_renames = plant_renames or {}
+    seeds_config = catalog.get('seeds', {})
+    plants_config = catalog.get('plants', {})
+    modules_config = catalog.get('modules', {})
+
+    for old_seed in seed_renames:
+        if old_seed not in seeds_config:
+            raise ValueError(f"Seed to rename not found: {old_seed}")
+    for old_seed, old_plant in plant_renames:
+        if old_plant not in seeds_config.get(old_seed, {}).get('plants', {}):
+            raise ValueError(f"Plant to rename not found: {old_seed}/{old_plant}")
+
+    new_seeds: Dict[str, Any] = {}
+    new_plants: Dict[str, Any] = {}
+    new_modules: Dict[str, Any] = {}
+    moves: List[AssetMove] = []
+    renamed_plants: Dict[str, str] = {}
+    migrated_plant_keys = set()
+    migrated_module_keys = set()
+    rewritten_modules = 0
+    dropped_atlas_frames = 0
+    stale_atlases: StaleAtlases = {}
+
+    for seed_type, seed_setting in seeds_config.items():
+        new_seed_type = seed_renames.get(seed_type, seed_type)
+        new_seed_setting = new_seeds.setdefault(
+            new_seed_type,
+            {key: copy.deepcopy(value) for key, value in seed_setting.items() if key != 'plants'},
+        )
+        if 'plants' not in seed_setting:
+            continue
+        new_seed_plants = new_seed_setting.setdefault('plants', {})
+
+        for plant_type, plant_option in seed_setting.get('plants', {}).items():
+            new_plant_type = plant_renames.get((seed_type, plant_type), plant_type)
+            if new_plant_type in new_seed_plants:
+                raise ValueError(f"Plant {new_seed_type}/{new_plant_type} would exist twice after migration.")
+            new_seed_plants[new_plant_type] = copy.deepcopy(plant_option)
+
+            plant_key = get_plant_key(seed_type, plant_type)
+            new_plant_key = get_plant_key(new_seed_type, new_plant_type)
+            if new_plant_key in new_plants:
+                raise ValueError(f"Plant key collision after migration: {new_plant_key}")
+            if plant_key != new_plant_key:
+                renamed_plants[plant_key] = new_plant_key
+
+            plant_setting = plants_config.get(plant_key)
+            if plant_setting is None:
+                continue
+            migrated_plant_keys.add(plant_key)
+            new_plants[new_plant_key] = copy.deepcopy(plant_setting)
+
+            for part_type, module_options in plant_setting.get('modules', {}).items():
+                for module_type in module_options:
+                    module_key = get_module_key(seed_type, plant_type, part_type, module_type)
+                    module_setting = modules_config.get(module_key)
+                    if module_setting is None:
+                        continue
+                    new_module_key = get_module_key(new_seed_type, new_plant_type, part_type, module_type)
+                    if new_module_key in new_modules:
+                        raise ValueError(f"Module key collision after migration: {new_module_key}")
+                    migrated_module_keys.add(module_key)
+
+                    directory_path = get_module_image_directory_path(
+                        new_seed_type, new_plant_type, part_type, module_type, directory_keys
+                    )
+                    new_setting, dropped_atlas_path = migrate_module_setting(module_setting, directory_path, moves)
+                    new_modules[new_module_key] = new_setting
+                    if new_module_key != module_key or new_setting != module_setting:
+                        rewritten_modules += 1
+                    if dropped_atlas_path is not None:
+                        dropped_atlas_frames += 1
+                        stale_atlases.setdefault(dropped_atlas_path, get_atlas_rebuild_target(
+                            dropped_atlas_path, seed_type, plant_type, new_seed_type, new_plant_type,
+                        ))
+
+    # SeedからたどれないPlant/Moduleはそのまま残す (キーが衝突する場合は中断する)
+    for plant_key, plant_setting in plants_config.items():
+        if plant_key not in migrated_plant_keys:
+            if plant_key in new_plants:
+                raise ValueError(f"Plant key collision with an unlinked plant: {plant_key}")
+            new_plants[plant_key] = copy.deepcopy(plant_setting)
+    for module_key, module_setting in modules_config.items():
+        if module_key not in migrated_module_keys:
+            if module_key in new_modules:
+                raise ValueError(f"Module key collision with an unlinked module: {module_key}")
+            new_modules[module_key] = copy.deepcopy(module_setting)
+
+    moves = validate_moves(moves)
+    new_catalog = {'seeds': new_seeds, 'plants': new_plants, 'modules': new_modules}
+    return {
+        'catalog': new_catalog,
+        'moves': moves,
+        'renamed_plants': renamed_plants,
+        'rewritten_modules': rewritten_modules,
+        'dropped_atlas_frames': dropped_atlas_frames,
+        'stale_atlases': stale_atlases,
+        'changed': bool(moves) or new_catalog != {name: catalog.get(name, {}) for name in new_catalog},
+    }
+
+# --- 実行 ---
+
+def move_asset(move: AssetMove) -> str:
+    """
+    アセットを1つ移動する。同じファイルシステム内は os.rename、別デバイスの場合のみコピーして削除する。
+
+    Returns:
+        'renamed' / 'copied' / 'skipped' (移動元が無く、移動先が既にある = 前回の実行で移動済み)
+    """
+    source, destination = move
+    if not os.path.exists(source) and os.path.exists(destination):
+        return 'skipped'
+    os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+    try:
+        os.rename(source, destination)
+        return 'renamed'
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    shutil.copy2(source, destination)
+    os.remove(source)
+    return 'copied'
+
+def move_assets(moves: List[AssetMove], workers: int = DEFAULT_MOVE_WORKERS) -> Dict[str, int]:
+    """
+    アセットを並列に移動する。1つでも失敗した場合は、移動済みのアセットを元に戻してから例外を送出する。
+
+    Returns:
+        {'renamed': int, 'copied': int, 'skipped': int}
+    """
+    moves = list(dict.fromkeys(moves)) # 同じ移動を並列に2回実行しない
+    counts = {'renamed': 0, 'copied': 0, 'skipped': 0}
+    completed: List[AssetMove] = []
+    errors: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [(move, executor.submit(move_asset, move)) for move in moves]
+        for move, future in futures:
+            try:
+                result = future.result()
+            except OSError as e:
+                errors.append(f"{move[0]} -> {move[1]}: {e}")
+                continue
+            counts[result] += 1
+            if result != 'skipped':
+                completed.append(move)
+
+    if errors:
+        rollback_moves(completed)
+        raise IOError(f"{len(errors)} asset move(s) failed (rolled back): " + '; '.join(errors[:5]))
+    return counts
+
+def rollback_moves(moves: List[AssetMove]) -> None:
+    """移動済みのアセットを元の場所に戻す。"""
+    for source, destination in reversed(moves):
+        if not os.path.exists(destination):
+            continue
+        try:
+            move_asset((destination, source))
+        except OSError as e:
+            print(f"[WARNING] Failed to roll back {destination} -> {source}: {e}")
+
+def remove_empty_directories(paths: List[str]) -> int:
+    """移動元のディレクトリが空になっていれば、上位に向かって削除する。"""
+    removed = 0
+    for directory in sorted({os.path.dirname(path) for path in paths}, key=len, reverse=True):
+        while directory and os.path.isdir(directory) and not os.listdir(directory):
+            os.rmdir(directory)
+            removed += 1
+            directory = os.path.dirname(directory)
+    return removed
+
+def _write_json_durably(path: str, data: Any, indent: Optional[int] = 4) -> None:
+    """JSONを書き込み、fsyncでディスクへの反映を待つ。"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+def recover_interrupted_commit() -> bool:
+    """
+    前回の commit_catalog_files が中断していた場合に、設定ファイルを一貫した状態に戻す。
+    - ジャーナルがある (確定済み): 残っている一時ファイルの入れ替えを完了させる
+    - ジャーナルが無い (確定前): 書きかけの一時ファイルを削除する (元の設定ファイルは未変更)
+
+    Returns:
+        入れ替えを完了させた場合はTrue
+    """
+    targets = (SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH)
+    if os.path.exists(MIGRATION_JOURNAL_PATH):
+        with open(MIGRATION_JOURNAL_PATH, 'r', encoding='utf-8') as f:
+            journal = json.load(f)
+        for temp_path, path in journal['replaces']:
+            if os.path.exists(temp_path):
+                os.replace(temp_path, path)
+        os.remove(MIGRATION_JOURNAL_PATH)
+        print("[INFO] Completed an interrupted config commit from the migration journal.")
+        return True
+
+    for path in targets:
+        if os.path.exists(path + TEMP_SUFFIX):
+            os.remove(path + TEMP_SUFFIX)
+            print(f"[INFO] Removed an uncommitted temp file: {path + TEMP_SUFFIX}")
+    return False
+
+def commit_catalog_files(catalog: Catalog) -> None:
+    """
+    3つの設定ファイルを1つの単位として入れ替える。
+    1. 3つの一時ファイルを書き込んで fsync (失敗した場合は元のファイルは未変更)
+    2. ジャーナルを os.replace で書き込む (ここが確定点)
+    3. 各ファイルを os.replace で入れ替え、ジャーナルを削除する
+    2と3の間で中断した場合は、次回の recover_interrupted_commit が入れ替えを完了させるため、
+    新旧の設定ファイルが混ざった状態のまま残ることはない。
+    """
+    targets = [
+        (SEEDS_CONFIG_JSON_PATH, catalog['seeds']),
+        (PLANTS_CONFIG_JSON_PATH, catalog['plants']),
+        (MODULES_CONFIG_JSON_PATH, catalog['modules']),
+    ]
+    temp_paths: List[str] = []
+    try:
+        for path, data in targets:
+            temp_path = path + TEMP_SUFFIX
+            _write_json_durably(temp_path, data)
+            temp_paths.append(temp_path)
+        journal_temp_path = MIGRATION_JOURNAL_PATH + TEMP_SUFFIX
+        _write_json_durably(
+            journal_temp_path,
+            {'replaces': [[temp_path, path] for (path, _), temp_path in zip(targets, temp_paths)]},
+        )
+        os.replace(journal_temp_path, MIGRATION_JOURNAL_PATH)
+    except Exception as e:
+        for temp_path in temp_paths:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise IOError(f"Failed to write migrated config files: {e}") from e
+
+    for (path, _), temp_path in zip(targets, temp_paths):
+        os.replace(temp_path, path)
+    os.remove(MIGRATION_JOURNAL_PATH)
+
+def load_current_catalog() -> Catalog:
+    return {
+        'seeds': load_config(SEEDS_CONFIG_JSON_PATH),
+        'plants': load_config(PLANTS_CONFIG_JSON_PATH),
+        'modules': load_config(MODULES_CONFIG_JSON_PATH),
+    }
+
+# --- メインロジック関数 ---
+
+def run_migration(plan: MigrationPlan, workers: int = DEFAULT_MOVE_WORKERS) -> None:
+    """
+    移行計画を実行する。
+    1. アセットを並列に移動 (失敗した場合は元に戻して中断)
+    2. 3つの設定ファイルをまとめて入れ替え (失敗した場合はアセットを元に戻す)
+    3. 空になったディレクトリの削除、逆生成キャッシュの破棄、プリロードマニフェストの再生成
+
+    Raises:
+        IOError: アセットの移動、または設定ファイルの書き込みに失敗した場合
+    """
+    moves = plan['moves']
+    counts = move_assets(moves, workers)
+    print(
+        f"[ACTION] Assets moved: {counts['renamed']} renamed, {counts['copied']} copied across devices, "
+        f"{counts['skipped']} already in place."
+    )
+
+    try:
+        commit_catalog_files(plan['catalog'])
+    except Exception:
+        print("[FATAL ERROR] Config commit failed. Rolling back asset moves.")
+        rollback_moves(moves)
+        raise
+    print(f"[ACTION] Config files committed: {SEEDS_CONFIG_JSON_PATH}, {PLANTS_CONFIG_JSON_PATH}, {MODULES_CONFIG_JSON_PATH}")
+
+    removed = remove_empty_directories([source for source, _ in moves])
+    if removed:
+        print(f"[ACTION] Removed {removed} empty director(ies).")
+
+    clear_reverse_cache()
+    rebuild_preload_manifest()
+    rebuild_stale_atlases(plan['stale_atlases'])
+
+def rebuild_stale_atlases(stale_atlases: StaleAtlases) -> None:
+    """
+    移動したモジュールが載っていたアトラスPNGとアトラスマニフェストのエントリを削除し、
+    移行後の Seed/Plant で作り直す (ビルド単位が不明なアトラスは削除のみ)。
+    """
+    if not stale_atlases:
+        return
+    removed_paths = discard_atlases([get_local_file_path(path) for path in stale_atlases])
+    print(f"[ACTION] Removed {len(removed_paths)} stale atlas(es) of moved modules.")
+    remove_empty_directories(removed_paths)
+
+    for target in dict.fromkeys(target for target in stale_atlases.values() if target is not None):
+        scope, seed_type, plant_type = target
+        build_sprite_atlases(scope=scope, seed_type=seed_type, plant_type=plant_type)
+    if any(target is None for target in stale_atlases.values()):
+        print("[WARNING] Some moved modules were in atlases of unknown layout. Run sprite_atlas_builder.py to rebuild them.")
@@ -0,0 +1,325 @@
+import sys
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+
+from config import SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH
+from utils.module_config_utils import (
+    get_plant_key, get_module_key, get_plant_image_directory_path, join_module_image_directory_path,
+)
+from utils.config_io_utils import load_config
+
+
+# -------------------------
+# 設定カタログ (seeds/plants/modules_config.json) のメモリ上の型付きモデル。
+# 長時間動くツールで大きなカタログを保持する場合に、入れ子の辞書の代わりに使う。
+# - 各レコードは __slots__ クラス (インスタンスごとの __dict__ を持たない)
+# - Seed/Plant/Part/Module名や rarity など繰り返し現れる文字列は sys.intern で共有する
+#   (MODULE_KEY のように1度しか現れない文字列は intern せず、modules のキーと同じオブジェクトを共有する)
+# - PLANT_KEY / MODULE_KEY は読み込み時に1度だけ計算する
+# - モジュールの保存先ディレクトリはモジュールごとには保持せず、
+#   Plant単位のディレクトリ (初回参照時に1度だけ計算) に参照時にPart/Module名を連結する
+# - 既知のフィールド以外のキー ('variants', 'atlasFrame' など) は extra にそのまま保持し、
+#   to_catalog() で元のJSONと等しい辞書に戻せる
+# - キーの並びが既知フィールドが先の並びと異なるレコードだけ、元の並び (同じ並びのタプルは共有) を key_order に保持する
+#   (カタログのハッシュはキー順序を含むため、to_catalog() は元のファイルと同じ並びで返す)
+
+# --- データ構造の定義 (型ヒント用) ---
+# { 'seeds': seeds_config, 'plants': plants_config, 'modules': modules_config }
+Catalog = Dict[str, Dict[str, Any]]
+
+# --- ヘルパー関数定義 ---
+
+class _Missing:
+    """元のJSONにフィールドが存在しなかったことを表す番兵 (None と区別するため)。"""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return '<missing>'
+
+MISSING: Any = _Missing()
+
+# 同じキーの並びを持つレコード間で key_order のタプルを共有するための表
+_KEY_ORDERS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+def _intern(value: Any) -> Any:
+    """文字列であれば sys.intern した値を返す (それ以外はそのまま)。"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _split_fields(data: Dict[str, Any], field_names: Tuple[str, ...]) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+    """
+    辞書を既知フィールドの値 (無い場合は MISSING) と、それ以外のキーの辞書に分ける。
+    その他のキーが無い場合、2つ目の戻り値は None (空の辞書を持たない)。
+    """
+    values = [_intern(data[name]) if name in data else MISSING for name in field_names]
+    extra = {_intern(key): value for key, value in data.items() if key not in field_names}
+    return values, (extra or None)
+
+def _get_key_order(data: Dict[str, Any], field_names: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+    """
+    辞書のキーの並びが「既知フィールド (field_names の順) → その他のキー」と異なる場合のみ、元の並びを返す。
+    同じ並びでは None を返し、レコードに並びを持たせない。
+    """
+    keys = tuple(_intern(key) for key in data)
+    default = tuple(name for name in field_names if name in data) + tuple(key for key in keys if key not in field_names)
+    if keys == default:
+        return None
+    return _KEY_ORDERS.setdefault(keys, keys)
+
+def _restore_key_order(data: Dict[str, Any], key_order: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+    """_get_key_order で保持した並びに辞書のキーを並べ直す。"""
+    if key_order is None:
+        return data
+    return {key: data[key] for key in key_order}
+
+def _join_fields(record: Any, field_names: Tuple[str, ...], attr_names: Tuple[str, ...]) -> Dict[str, Any]:
+    """_split_fields の逆変換。元の辞書に無かったフィールドは出力しない。"""
+    data: Dict[str, Any] = {}
+    for field_name, attr_name in zip(field_names, attr_names):
+        value = getattr(record, attr_name)
+        if value is not MISSING:
+            data[field_name] = value
+    if record.extra:
+        data.update(record.extra)
+    return _restore_key_order(data, record.key_order)
+
+# --- レコード定義 ---
+
+class PlantOptionRecord:
+    """seeds_config の PlantOption (seed -> 'plants' -> plantType)。"""
+    __slots__ = ('seed_type', 'plant_type', 'plant_key', 'min_size', 'max_size', 'rarity', 'weight', 'extra', 'key_order')
+
+    FIELDS = ('minSize', 'maxSize', 'rarity', 'weight')
+    ATTRS = ('min_size', 'max_size', 'rarity', 'weight')
+
+    def __init__(self, seed_type: str, plant_type: str, data: Dict[str, Any]):
+        self.seed_type = _intern(seed_type)
+        self.plant_type = _intern(plant_type)
+        self.plant_key = sys.intern(get_plant_key(seed_type, plant_type))
+        values, self.extra = _split_fields(data, self.FIELDS)
+        self.key_order = _get_key_order(data, self.FIELDS)
+        self.min_size, self.max_size, self.rarity, self.weight = values
+
+    def to_json(self) -> Dict[str, Any]:
+        return _join_fields(self, self.FIELDS, self.ATTRS)
+
+class SeedRecord:
+    """seeds_config の1つのSeed。"""
+    __slots__ = ('seed_type', 'plants', 'has_plants', 'extra', 'key_order')
+
+    def __init__(self, seed_type: str, data: Dict[str, Any]):
+        self.seed_type = _intern(seed_type)
+        self.has_plants = 'plants' in data
+        self.plants: Dict[str, PlantOptionRecord] = {
+            _intern(plant_type): PlantOptionRecord(seed_type, plant_type, option)
+            for plant_type, option in data.get('plants', {}).items()
+        }
+        self.extra = {_intern(key): value for key, value in data.items() if key != 'plants'} or None
+        self.key_order = _get_key_order(data, ('plants',))
+
+    def to_json(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        if self.has_plants or self.plants:
+            data['plants'] = {plant_type: option.to_json() for plant_type, option in self.plants.items()}
+        if self.extra:
+            data.update(self.extra)
+        return _restore_key_order(data, self.key_order)
+
+class ModuleSettingRecord:
+    """modules_config の ModuleSetting (MODULE_KEY -> imgPath, zIndex, ...)。"""
+    __slots__ = ('module_key', 'img_path', 'z_index', 'extra', 'key_order')
+
+    FIELDS = ('imgPath', 'zIndex')
+    ATTRS = ('img_path', 'z_index')
+
+    def __init__(self, module_key: str, data: Dict[str, Any]):
+        self.module_key = module_key
+        values, self.extra = _split_fields(data, self.FIELDS)
+        self.key_order = _get_key_order(data, self.FIELDS)
+        self.img_path, self.z_index = values
+
+    def to_json(self) -> Dict[str, Any]:
+        return _join_fields(self, self.FIELDS, self.ATTRS)
+
+class ModuleOptionRecord:
+    """
+    plants_config の ModuleOption (PLANT_KEY -> 'modules' -> partType -> moduleType)。
+    SeedからPlantを辿れる場合は、MODULE_KEY と ModuleSetting を読み込み時に結び付ける。
+    """
+    __slots__ = (
+        'part_type', 'module_type', 'module_rarity', 'weight', 'extra', 'key_order',
+        'plant', 'module_key', 'setting',
+    )
+
+    FIELDS = ('moduleRarity', 'weight')
+    ATTRS = ('module_rarity', 'weight')
+
+    def __init__(self, plant: 'PlantSettingRecord', part_type: str, module_type: str, data: Dict[str, Any]):
+        self.plant = plant
+        self.part_type = _intern(part_type)
+        self.module_type = _intern(module_type)
+        values, self.extra = _split_fields(data, self.FIELDS)
+        self.key_order = _get_key_order(data, self.FIELDS)
+        self.module_rarity, self.weight = values
+        self.module_key: Optional[str] = None
+        self.setting: Optional[ModuleSettingRecord] = None
+
+    @property
+    def directory_path(self) -> Optional[str]:
+        """モジュール画像の保存先ディレクトリ (SeedからPlantを辿れない場合は None)。"""
+        plant_directory_path = self.plant.directory_path
+        if plant_directory_path is None:
+            return None
+        return join_module_image_directory_path(plant_directory_path, self.part_type, self.module_type)
+
+    def to_json(self) -> Dict[str, Any]:
+        return _join_fields(self, self.FIELDS, self.ATTRS)
+
+class PlantSettingRecord:
+    """plants_config の PlantSetting (PLANT_KEY -> 'modules')。"""
+    __slots__ = ('plant_key', 'seed_type', 'plant_type', 'parts', 'has_modules', 'extra', 'key_order', '_directory_path')
+
+    def __init__(self, plant_key: str, data: Dict[str, Any]):
+        self.plant_key = _intern(plant_key)
+        self.has_modules = 'modules' in data
+        # seeds_config から辿れた場合のみ設定される (PLANT_KEY は大文字化されているため逆算できない)
+        self.seed_type: Optional[str] = None
+        self.plant_type: Optional[str] = None
+        self._directory_path: Optional[str] = None
+        self.parts: Dict[str, Dict[str, ModuleOptionRecord]] = {
+            _intern(part_type): {
+                _intern(module_type): ModuleOptionRecord(self, part_type, module_type, option)
+                for module_type, option in module_options.items()
+            }
+            for part_type, module_options in data.get('modules', {}).items()
+        }
+        self.extra = {_intern(key): value for key, value in data.items() if key != 'modules'} or None
+        self.key_order = _get_key_order(data, ('modules',))
+
+    @property
+    def directory_path(self) -> Optional[str]:
+        """Plantのモジュール画像ディレクトリ (SeedからPlantを辿れない場合は None)。初回参照時に計算して保持する。"""
+        if self._directory_path is None and self.seed_type is not None:
+            self._directory_path = get_plant_image_directory_path(self.seed_type, self.plant_type)
+        return self._directory_path
+
+    def iter_modules(self) -> Iterator[ModuleOptionRecord]:
+        for module_options in self.parts.values():
+            yield from module_options.values()
+
+    def to_json(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        if self.has_modules or self.parts:
+            data['modules'] = {
+                part_type: {module_type: option.to_json() for module_type, option in module_options.items()}
+                for part_type, module_options in self.parts.items()
+            }
+        if self.extra:
+            data.update(self.extra)
+        return _restore_key_order(data, self.key_order)
+
+# --- カタログモデル ---
+
+class CatalogModel:
+    """
+    3つの設定ファイルをまとめた型付きモデル。
+    seeds / plants / modules はそれぞれ元のJSONと同じキーで引ける。
+    """
+    __slots__ = ('seeds', 'plants', 'modules')
+
+    def __init__(self, catalog: Catalog):
+        self.seeds: Dict[str, SeedRecord] = {
+            _intern(seed_type): SeedRecord(seed_type, data)
+            for seed_type, data in catalog.get('seeds', {}).items()
+        }
+        self.plants: Dict[str, PlantSettingRecord] = {
+            _intern(plant_key): PlantSettingRecord(plant_key, data)
+            for plant_key, data in catalog.get('plants', {}).items()
+        }
+        self.modules: Dict[str, ModuleSettingRecord] = {
+            module_key: ModuleSettingRecord(module_key, data)
+            for module_key, data in catalog.get('modules', {}).items()
+        }
+        self._link_records()
+
+    def _link_records(self) -> None:
+        """Seed -> Plant -> Module を辿り、MODULE_KEY を1度だけ計算して ModuleSetting と結び付ける。"""
+        for seed in self.seeds.values():
+            for option in seed.plants.values():
+                plant_setting = self.plants.get(option.plant_key)
+                if plant_setting is None:
+                    continue
+                plant_setting.seed_type = option.seed_type
+                plant_setting.plant_type = option.plant_type
+                for module in plant_setting.iter_modules():
+                    module_key = get_module_key(option.seed_type, option.plant_type, module.part_type, module.module_type)
+                    module.setting = self.modules.get(module_key)
+                    # 設定がある場合は modules のキーと同じ文字列オブジェクトを共有する
+                    module.module_key = module.setting.module_key if module.setting is not None else module_key
+
+    # --- 参照 ---
+
+    def get_plant_option(self, seed_type: str, plant_type: str) -> Optional[PlantOptionRecord]:
+        seed = self.seeds.get(seed_type) or self.seeds.get(seed_type.lower())
+        return seed.plants.get(plant_type) if seed is not None else None
+
+    def get_plant_setting(self, seed_type: str, plant_type: str) -> Optional[PlantSettingRecord]:
+        option = self.get_plant_option(seed_type, plant_type)
+        plant_key = option.plant_key if option is not None else get_plant_key(seed_type, plant_type)
+        return self.plants.get(plant_key)
+
+    def get_module_option(
+        self, seed_type: str, plant_type: str, part_type: str, module_type: str
+    ) -> Optional[ModuleOptionRecord]:
+        """Seed -> Plant -> Part の順に辿ってModuleOptionを返す (キー文字列は組み立てない)。"""
+        option = self.get_plant_option(seed_type, plant_type)
+        plant_setting = self.plants.get(option.plant_key) if option is not None else None
+        if plant_setting is None:
+            return None
+        return plant_setting.parts.get(part_type, {}).get(module_type)
+
+    def get_module_setting(
+        self, seed_type: str, plant_type: str, part_type: str, module_type: str
+    ) -> Optional[ModuleSettingRecord]:
+        """
+        名前からModuleSettingを返す。
+        カタログ上と同じ表記であればキー文字列を組み立てずに引き、それ以外は MODULE_KEY で引く。
+        """
+        module = self.get_module_option(seed_type, plant_type, part_type, module_type)
+        if module is not None and module.setting is not None:
+            return module.setting
+        return self.modules.get(get_module_key(seed_type, plant_type, part_type, module_type))
+
+    def iter_plant_options(self) -> Iterator[PlantOptionRecord]:
+        for seed in self.seeds.values():
+            yield from seed.plants.values()
+
+    def iter_linked_modules(self) -> Iterator[Tuple[PlantOptionRecord, ModuleOptionRecord]]:
+        """SeedからPlantを辿れる全モジュールを (PlantOption, ModuleOption) の組で返す。"""
+        for option in self.iter_plant_options():
+            plant_setting = self.plants.get(option.plant_key)
+            if plant_setting is not None:
+                for module in plant_setting.iter_modules():
+                    yield option, module
+
+    # --- JSON形式への変換 ---
+
+    def to_catalog(self) -> Catalog:
+        """元の3つの設定ファイルと同じ形の辞書に戻す。"""
+        return {
+            'seeds': {seed_type: seed.to_json() for seed_type, seed in self.seeds.items()},
+            'plants': {plant_key: plant.to_json() for plant_key, plant in self.plants.items()},
+            'modules': {module_key: module.to_json() for module_key, module in self.modules.items()},
+        }
+
+# --- メインロジック関数 ---
+
+def load_catalog_model(
+    seeds_path: str = SEEDS_CONFIG_JSON_PATH,
+    plants_path: str = PLANTS_CONFIG_JSON_PATH,
+    modules_path: str = MODULES_CONFIG_JSON_PATH,
+) -> CatalogModel:
+    """3つの設定ファイルを読み込み、カタログモデルを構築する (元の辞書は保持しない)。"""
+    return CatalogModel({
+        'seeds': load_config(seeds_path),
+        'plants': load_config(plants_path),
+        'modules': load_config(modules_path),
+    })
@@ -0,0 +1,253 @@
+import csv
+import json
+from bisect import bisect_left, bisect_right
+from typing import Dict, Any, List, Optional, Set, IO, Iterable, Tuple
+
+from utils.catalog_model import CatalogModel, PlantOptionRecord, ModuleOptionRecord, MISSING
+
+
+# -------------------------
+
+# CSV出力でリストの値を連結する区切り文字
+CSV_LIST_SEPARATOR = ';'
+
+# --- データ構造の定義 (型ヒント用) ---
+# 出力用のフラットな行 (Plant行: seedType, plantType, plantKey, rarity, weight, ... / Module行: ... partType, moduleType, moduleRarity, ...)
+ResultRow = Dict[str, Any]
+
+# --- ヘルパー関数定義 ---
+
+def _value(value: Any) -> Any:
+    """元のJSONに無かったフィールドは None として出力する。"""
+    return None if value is MISSING else value
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _sorted_weights(entries: Iterable[Tuple[Any, str]]) -> Tuple[List[float], List[str]]:
+    """(weight, key) の組を weight 順に並べ、二分探索用の2つのリストにする (数値以外のweightは除外)。"""
+    pairs = sorted((weight, key) for weight, key in entries if _is_number(weight))
+    return [weight for weight, _ in pairs], [key for _, key in pairs]
+
+def _keys_in_range(
+    weights: List[float],
+    keys: List[str],
+    min_weight: Optional[float],
+    max_weight: Optional[float],
+) -> Set[str]:
+    start = bisect_left(weights, min_weight) if min_weight is not None else 0
+    end = bisect_right(weights, max_weight) if max_weight is not None else len(weights)
+    return set(keys[start:end])
+
+def _lookup_seed(index: Dict[str, Set[str]], seed_type: str) -> Set[str]:
+    """Seedキーは通常小文字で保存されているため、一致しなければ小文字でも引く。"""
+    return index.get(seed_type) or index.get(seed_type.lower(), set())
+
+def _intersect(candidates: Optional[Set[str]], keys: Set[str]) -> Set[str]:
+    return set(keys) if candidates is None else candidates & keys
+
+# --- インデックス ---
+
+class CatalogIndex:
+    """
+    カタログモデルに対する二次インデックス。
+    構築時に1度だけ全Plant/Moduleを走査し、以降の絞り込みはインデックスの積集合で行う。
+    Plantは PLANT_KEY、Moduleは MODULE_KEY で識別する (SeedからたどれないPlant/Moduleは対象外)。
+    """
+    __slots__ = (
+        'model', 'plants', 'modules', 'module_plants',
+        'plants_by_seed', 'plants_by_rarity', 'plants_by_module_rarity', 'plants_by_part_type',
+        'modules_by_seed', 'modules_by_module_rarity', 'modules_by_part_type',
+        'plant_weights', 'plant_weight_keys', 'module_weights', 'module_weight_keys',
+    )
+
+    def __init__(self, model: CatalogModel):
+        self.model = model
+        self.plants: Dict[str, PlantOptionRecord] = {}
+        self.modules: Dict[str, ModuleOptionRecord] = {}
+        self.module_plants: Dict[str, PlantOptionRecord] = {}
+
+        self.plants_by_seed: Dict[str, Set[str]] = {}
+        self.plants_by_rarity: Dict[Any, Set[str]] = {}
+        self.plants_by_module_rarity: Dict[Any, Set[str]] = {}
+        self.plants_by_part_type: Dict[str, Set[str]] = {}
+        self.modules_by_seed: Dict[str, Set[str]] = {}
+        self.modules_by_module_rarity: Dict[Any, Set[str]] = {}
+        self.modules_by_part_type: Dict[str, Set[str]] = {}
+
+        for option in model.iter_plant_options():
+            plant_key = option.plant_key
+            self.plants[plant_key] = option
+            self.plants_by_seed.setdefault(option.seed_type, set()).add(plant_key)
+            self.plants_by_rarity.setdefault(_value(option.rarity), set()).add(plant_key)
+
+            plant_setting = model.plants.get(plant_key)
+            if plant_setting is None:
+                continue
+            for part_type, module_options in plant_setting.parts.items():
+                self.plants_by_part_type.setdefault(part_type, set()).add(plant_key)
+                for module in module_options.values():
+                    module_rarity = _value(module.module_rarity)
+                    self.plants_by_module_rarity.setdefault(module_rarity, set()).add(plant_key)
+                    if module.module_key is None:
+                        continue
+                    self.modules[module.module_key] = module
+                    self.module_plants[module.module_key] = option
+                    self.modules_by_seed.setdefault(option.seed_type, set()).add(module.module_key)
+                    self.modules_by_module_rarity.setdefault(module_rarity, set()).add(module.module_key)
+                    self.modules_by_part_type.setdefault(part_type, set()).add(module.module_key)
+
+        self.plant_weights, self.plant_weight_keys = _sorted_weights(
+            (option.weight, plant_key) for plant_key, option in self.plants.items()
+        )
+        self.module_weights, self.module_weight_keys = _sorted_weights(
+            (module.weight, module_key) for module_key, module in self.modules.items()
+        )
+
+    # --- 絞り込み ---
+
+    def filter_plants(
+        self,
+        seed_type: Optional[str] = None,
+        rarity: Optional[str] = None,
+        module_rarity: Optional[str] = None,
+        part_type: Optional[str] = None,
+        missing_part_type: Optional[str] = None,
+        min_weight: Optional[float] = None,
+        max_weight: Optional[float] = None,
+    ) -> List[PlantOptionRecord]:
+        """
+        条件をすべて満たすPlantを返す (カタログ上の順序)。
+
+        Args:
+            seed_type: このSeedのPlantのみ
+            rarity: PlantOptionの rarity が一致するPlantのみ
+            module_rarity: この moduleRarity のモジュールを1つ以上持つPlantのみ
+            part_type: このPartを持つPlantのみ
+            missing_part_type: このPartを持たないPlantのみ
+            min_weight / max_weight: PlantOptionの weight の範囲 (両端を含む)
+        """
+        candidates: Optional[Set[str]] = None
+        if seed_type is not None:
+            candidates = _intersect(candidates, _lookup_seed(self.plants_by_seed, seed_type))
+        if rarity is not None:
+            candidates = _intersect(candidates, self.plants_by_rarity.get(rarity, set()))
+        if module_rarity is not None:
+            candidates = _intersect(candidates, self.plants_by_module_rarity.get(module_rarity, set()))
+        if part_type is not None:
+            candidates = _intersect(candidates, self.plants_by_part_type.get(part_type, set()))
+        if min_weight is not None or max_weight is not None:
+            candidates = _intersect(
+                candidates, _keys_in_range(self.plant_weights, self.plant_weight_keys, min_weight, max_weight)
+            )
+        if candidates is None:
+            candidates = set(self.plants)
+        if missing_part_type is not None:
+            candidates -= self.plants_by_part_type.get(missing_part_type, set())
+        return [option for plant_key, option in self.plants.items() if plant_key in candidates]
+
+    def filter_modules(
+        self,
+        seed_type: Optional[str] = None,
+        module_rarity: Optional[str] = None,
+        part_type: Optional[str] = None,
+        min_weight: Optional[float] = None,
+        max_weight: Optional[float] = None,
+    ) -> List[ModuleOptionRecord]:
+        """条件をすべて満たすModuleを返す (カタログ上の順序)。"""
+        candidates: Optional[Set[str]] = None
+        if seed_type is not None:
+            candidates = _intersect(candidates, _lookup_seed(self.modules_by_seed, seed_type))
+        if module_rarity is not None:
+            candidates = _intersect(candidates, self.modules_by_module_rarity.get(module_rarity, set()))
+        if part_type is not None:
+            candidates = _intersect(candidates, self.modules_by_part_type.get(part_type, set()))
+        if min_weight is not None or max_weight is not None:
+            candidates = _intersect(
+                candidates, _keys_in_range(self.module_weights, self.module_weight_keys, min_weight, max_weight)
+            )
+        if candidates is None:
+            return list(self.modules.values())
+        return [module for module_key, module in self.modules.items() if module_key in candidates]
+
+    # --- 出力用の行 ---
+
+    def plant_row(self, option: PlantOptionRecord) -> ResultRow:
+        plant_setting = self.model.plants.get(option.plant_key)
+        modules = list(plant_setting.iter_modules()) if plant_setting is not None else []
+        return {
+            'seedType': option.seed_type,
+            'plantType': option.plant_type,
+            'plantKey': option.plant_key,
+            'rarity': _value(option.rarity),
+            'weight': _value(option.weight),
+            'minSize': _value(option.min_size),
+            'maxSize': _value(option.max_size),
+            'partTypes': list(plant_setting.parts) if plant_setting is not None else [],
+            'moduleRarities': sorted({str(_value(module.module_rarity)) for module in modules}),
+            'moduleCount': len(modules),
+        }
+
+    def module_row(self, module: ModuleOptionRecord) -> ResultRow:
+        option = self.module_plants[module.module_key]
+        setting = module.setting
+        return {
+            'seedType': option.seed_type,
+            'plantType': option.plant_type,
+            'plantKey': option.plant_key,
+            'partType': module.part_type,
+            'moduleType': module.module_type,
+            'moduleKey': module.module_key,
+            'moduleRarity': _value(module.module_rarity),
+            'weight': _value(module.weight),
+            'zIndex': _value(setting.z_index) if setting is not None else None,
+            'imgPath': _value(setting.img_path) if setting is not None else None,
+        }
+
+# --- 集計 ---
+
+def aggregate_rows(rows: List[ResultRow], group_by: str) -> List[ResultRow]:
+    """
+    行を group_by の値ごとに集計する (weight が数値でない行は件数のみ数える)。
+
+    Returns:
+        [{group_by: 値, 'count', 'totalWeight', 'minWeight', 'maxWeight', 'avgWeight'}, ...] (グループ名順)
+    """
+    groups: Dict[Any, List[ResultRow]] = {}
+    for row in rows:
+        groups.setdefault(row.get(group_by), []).append(row)
+
+    result: List[ResultRow] = []
+    for group in sorted(groups, key=lambda value: (value is None, str(value))):
+        weights = [row['weight'] for row in groups[group] if _is_number(row.get('weight'))]
+        result.append({
+            group_by: group,
+            'count': len(groups[group]),
+            'totalWeight': sum(weights),
+            'minWeight': min(weights) if weights else None,
+            'maxWeight': max(weights) if weights else None,
+            'avgWeight': round(sum(weights) / len(weights), 4) if weights else None,
+        })
+    return result
+
+# --- 出力 ---
+
+def write_rows(rows: List[ResultRow], output_format: str, stream: IO[str]) -> None:
+    """行をJSON (配列) またはCSVとして書き出す。"""
+    if output_format == 'json':
+        json.dump(rows, stream, indent=4, ensure_ascii=False)
+        stream.write('\n')
+        return
+    if output_format != 'csv':
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    fieldnames: List[str] = []
+    for row in rows:
+        fieldnames.extend(key for key in row if key not in fieldnames)
+    writer = csv.DictWriter(stream, fieldnames=fieldnames, lineterminator='\n')
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({
+            key: CSV_LIST_SEPARATOR.join(str(item) for item in value) if isinstance(value, list) else value
+            for key, value in row.items()
+        })
@@ -0,0 +1,89 @@
+import os
+import json
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+
+# 書き込みをまとめている設定ファイル { path: {'data': dict, 'dirty': bool, 'stamp': (mtime_ns, size) | None} }
+# (Noneの場合はバッチ無効。load_config/save_config は常にファイルを直接読み書きする)
+_config_batch: Optional[Dict[str, Dict[str, Any]]] = None
+
+def _get_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _read_config_file(path: str) -> Dict[str, Any]:
+    try:
+        # パスが存在しない場合も考慮し、ディレクトリを作成（必須ではないが安全のため）
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _write_config_file(path: str, data: Dict[str, Any]):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+    except Exception as e:
+        raise IOError(f"Failed to save config file {path}: {e}")
+
+def load_config(path: str) -> Dict[str, Any]:
+    """
+    JSON設定ファイルを読み込むヘルパー関数 (ファイルが存在しない場合は空の辞書を返す)
+    バッチ中のファイルはメモリ上の辞書を返す (ファイルが外部で変更されていて未保存の変更が無ければ読み直す)。
+    """
+    entry = _config_batch.get(path) if _config_batch is not None else None
+    if entry is None:
+        return _read_config_file(path)
+    if not entry['dirty'] and entry['stamp'] != _get_stamp(path):
+        entry['data'] = _read_config_file(path)
+        entry['stamp'] = _get_stamp(path)
+    return entry['data']
+
+def save_config(path: str, data: Dict[str, Any]):
+    """JSON設定ファイルを保存するヘルパー関数 (バッチ中のファイルはメモリ上で更新し、flush時に書き込む)"""
+    entry = _config_batch.get(path) if _config_batch is not None else None
+    if entry is None:
+        _write_config_file(path, data)
+        return
+    entry['data'] = data
+    entry['dirty'] = True
+
+def begin_config_batch(paths: Sequence[str]) -> None:
+    """
+    指定した設定ファイルの読み書きをメモリ上で行うようにする。
+    同じファイルを何度も読み書きする処理 (監視モードでの再登録など) で、
+    パースと書き込みを flush_config_batch ごとに1回にまとめる。
+    """
+    global _config_batch
+    _config_batch = {path: {'data': _read_config_file(path), 'dirty': False, 'stamp': _get_stamp(path)} for path in paths}
+
+def flush_config_batch() -> List[str]:
+    """
+    バッチ中に変更された設定ファイルだけを書き込む。
+
+    Returns:
+        書き込んだファイルのパス
+    """
+    if _config_batch is None:
+        return []
+    written: List[str] = []
+    for path, entry in _config_batch.items():
+        if entry['dirty']:
+            _write_config_file(path, entry['data'])
+            entry['dirty'] = False
+            entry['stamp'] = _get_stamp(path)
+            written.append(path)
+    return written
+
+def end_config_batch() -> List[str]:
+    """未保存の変更を書き込み、バッチを終了する。"""
+    global _config_batch
+    try:
+        return flush_config_batch()
+    finally:
+        _config_batch = None
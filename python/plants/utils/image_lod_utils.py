@@ -0,0 +1,292 @@
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Tuple, Optional, Sequence
+
+from config import CACHE_DIR
+from utils.png_utils import Image, RgbaImage, decode_png, encode_png, get_png_size
+
+
+# -------------------------
+
+# 縮小ロジックを変更した場合はバージョンを上げ、古いキャッシュを無効にする
+LOD_VERSION = 1
+
+# 縮小画像のキャッシュディレクトリ (入力ハッシュ_倍率.png で保存)
+LOD_CACHE_DIR = os.path.join(CACHE_DIR, 'image_lod')
+
+# --- データ構造の定義 (型ヒント用) ---
+# modules_config の variants に記録する辞書の型エイリアス
+LodVariant = Dict[str, Any] # 'scale', 'imgPath', 'width', 'height'を含む
+
+# { 倍率ラベル (例: '0.5x'): 縮小後のPNGバイト列 }
+LodImageMap = Dict[str, bytes]
+
+# --- ヘルパー関数定義 ---
+
+def get_scale_label(scale: float) -> str:
+    """倍率をファイル名・辞書キー用のラベルに変換する (例: 0.5 -> '0.5x', 1.0 -> '1x')。"""
+    return f"{scale:g}x"
+
+def get_scaled_size(width: int, height: int, scale: float) -> Tuple[int, int]:
+    """縮小後のサイズを返す (最小1px)。"""
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def get_variant_file_path(image_file_path: str, scale: float) -> str:
+    """
+    元画像のパスから縮小画像の保存パスを生成する。
+
+    Returns:
+        例: '.../modules/stem_v0/stem_v0@0.5x.png'
+    """
+    root, ext = os.path.splitext(image_file_path)
+    return f"{root}@{get_scale_label(scale)}{ext}"
+
+# --- リサンプリング (面積平均, プリマルチプライドアルファ) ---
+
+def _box_weights(src_size: int, dst_size: int) -> List[List[Tuple[int, float]]]:
+    """出力座標ごとに、重なる入力ピクセルとその重みのリストを計算する。"""
+    ratio = src_size / dst_size
+    weights: List[List[Tuple[int, float]]] = []
+    for d in range(dst_size):
+        start = d * ratio
+        end = start + ratio
+        row: List[Tuple[int, float]] = []
+        i = int(start)
+        while i < end and i < src_size:
+            overlap = min(end, i + 1) - max(start, i)
+            if overlap > 0:
+                row.append((i, overlap / ratio))
+            i += 1
+        weights.append(row)
+    return weights
+
+def resample_image(image: RgbaImage, width: int, height: int) -> RgbaImage:
+    """
+    RGBA画像を指定サイズに縮小する。
+    Pillowが利用可能な場合はLANCZOS、そうでなければ純Pythonの面積平均法を使用する。
+    透明部分の色が縁ににじまないよう、アルファを乗算した状態で平均する。
+    """
+    if Image is not None:
+        img = Image.frombytes('RGBA', (image.width, image.height), bytes(image.pixels))
+        resized = img.resize((width, height), Image.LANCZOS)
+        return RgbaImage(width, height, bytearray(resized.tobytes()))
+
+    src = image.pixels
+    src_w, src_h = image.width, image.height
+
+    # プリマルチプライドアルファの浮動小数点値に変換
+    premultiplied: List[float] = []
+    for i in range(0, len(src), 4):
+        alpha = src[i + 3] / 255
+        premultiplied.extend((src[i] * alpha, src[i + 1] * alpha, src[i + 2] * alpha, src[i + 3]))
+
+    # 1. 水平方向の縮小
+    x_weights = _box_weights(src_w, width)
+    horizontal: List[float] = []
+    for y in range(src_h):
+        row_offset = y * src_w * 4
+        for taps in x_weights:
+            acc = [0.0, 0.0, 0.0, 0.0]
+            for sx, weight in taps:
+                base = row_offset + sx * 4
+                for c in range(4):
+                    acc[c] += premultiplied[base + c] * weight
+            horizontal.extend(acc)
+
+    # 2. 垂直方向の縮小とアルファの除算
+    y_weights = _box_weights(src_h, height)
+    pixels = bytearray(width * height * 4)
+    out = 0
+    for taps in y_weights:
+        for x in range(width):
+            acc = [0.0, 0.0, 0.0, 0.0]
+            for sy, weight in taps:
+                base = (sy * width + x) * 4
+                for c in range(4):
+                    acc[c] += horizontal[base + c] * weight
+            alpha = acc[3]
+            if alpha > 0:
+                factor = 255 / alpha
+                rgb = [min(255, round(acc[c] * factor)) for c in range(3)]
+            else:
+                rgb = [0, 0, 0]
+            pixels[out:out + 4] = bytes(rgb + [min(255, round(alpha))])
+            out += 4
+    return RgbaImage(width, height, pixels)
+
+def render_lod_variants(image_data: bytes, scales: Sequence[float]) -> LodImageMap:
+    """
+    1枚の画像から、1未満の各倍率の縮小PNGを生成する (1x は元画像を使うため生成しない)。
+
+    Raises:
+        ValueError: PNGとしてデコードできない場合
+    """
+    image = decode_png(image_data)
+    variants: LodImageMap = {}
+    for scale in scales:
+        if scale >= 1:
+            continue
+        width, height = get_scaled_size(image.width, image.height, scale)
+        variants[get_scale_label(scale)] = encode_png(resample_image(image, width, height))
+    return variants
+
+# --- キャッシュ ---
+
+def get_lod_cache_path(image_data: bytes, scale: float) -> str:
+    """入力バイト列のハッシュと倍率から、縮小画像のキャッシュファイルパスを生成する。"""
+    digest = hashlib.sha256(image_data).hexdigest()
+    return os.path.join(LOD_CACHE_DIR, f"v{LOD_VERSION}_{digest}_{get_scale_label(scale)}.png")
+
+def read_lod_cache(image_data: bytes, scales: Sequence[float]) -> Optional[LodImageMap]:
+    """すべての倍率がキャッシュ済みならその結果を返す (1つでも欠けていればNone)。"""
+    variants: LodImageMap = {}
+    for scale in scales:
+        if scale >= 1:
+            continue
+        try:
+            with open(get_lod_cache_path(image_data, scale), 'rb') as f:
+                variants[get_scale_label(scale)] = f.read()
+        except OSError:
+            return None
+    return variants
+
+def write_lod_cache(image_data: bytes, scales: Sequence[float], variants: LodImageMap) -> None:
+    """縮小画像をキャッシュに保存する (失敗しても処理は継続する)。"""
+    try:
+        os.makedirs(LOD_CACHE_DIR, exist_ok=True)
+        for scale in scales:
+            label = get_scale_label(scale)
+            if label in variants:
+                with open(get_lod_cache_path(image_data, scale), 'wb') as f:
+                    f.write(variants[label])
+    except OSError as e:
+        print(f"[WARNING] Failed to write LOD cache: {e}")
+
+def _render_lod_variants_safe(args: Tuple[bytes, Sequence[float]]) -> Optional[LodImageMap]:
+    """プロセスプール用: デコードできない画像はNoneを返す。"""
+    image_data, scales = args
+    try:
+        return render_lod_variants(image_data, scales)
+    except ValueError:
+        return None
+
+# --- メインロジック関数 ---
+
+def generate_lod_variants_cached(image_data: bytes, scales: Sequence[float]) -> Optional[LodImageMap]:
+    """
+    キャッシュを参照しつつ、1枚の画像の縮小版を生成する。
+
+    Returns:
+        {倍率ラベル: PNGバイト列} / デコードできない画像の場合はNone
+    """
+    cached = read_lod_cache(image_data, scales)
+    if cached is not None:
+        return cached
+    variants = _render_lod_variants_safe((image_data, scales))
+    if variants is not None:
+        write_lod_cache(image_data, scales, variants)
+    return variants
+
+def generate_lod_variants_batch(
+    images: Dict[str, bytes],
+    scales: Sequence[float],
+    max_workers: Optional[int] = None,
+) -> Dict[str, Optional[LodImageMap]]:
+    """
+    複数画像の縮小版をプロセスプールで並列に生成する。キャッシュ済みのものは再計算しない。
+
+    Args:
+        images: {識別キー: PNGバイト列}
+        scales: 生成する倍率 (例: (1.0, 0.5, 0.25))
+        max_workers: プロセス数 (Noneの場合はCPU数)
+
+    Returns:
+        {識別キー: {倍率ラベル: PNGバイト列} または None (デコード不可)}
+    """
+    results: Dict[str, Optional[LodImageMap]] = {}
+    misses: Dict[str, bytes] = {}
+    for key, image_data in images.items():
+        cached = read_lod_cache(image_data, scales)
+        if cached is not None:
+            results[key] = cached
+        else:
+            misses[key] = image_data
+
+    if len(misses) == 1:
+        key, image_data = next(iter(misses.items()))
+        results[key] = generate_lod_variants_cached(image_data, scales)
+    elif misses:
+        keys = list(misses)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rendered = executor.map(_render_lod_variants_safe, [(misses[k], tuple(scales)) for k in keys])
+            for key, variants in zip(keys, rendered):
+                results[key] = variants
+                if variants is not None:
+                    write_lod_cache(misses[key], scales, variants)
+
+    return results
+
+def remove_lod_variant_files(image_file_path: str, keep: Sequence[float] = ()) -> List[str]:
+    """
+    元画像と同じディレクトリにある縮小画像 ('<stem>@*.png') のうち、keep の倍率以外を削除する。
+
+    Returns:
+        削除したファイルのパス
+    """
+    directory, file_name = os.path.split(image_file_path)
+    if not os.path.isdir(directory or '.'):
+        return []
+    stem = os.path.splitext(file_name)[0]
+    expected = {os.path.basename(get_variant_file_path(image_file_path, s)) for s in keep if s < 1}
+    removed: List[str] = []
+    for existing in os.listdir(directory or '.'):
+        if existing.startswith(f"{stem}@") and existing not in expected:
+            os.remove(os.path.join(directory, existing))
+            removed.append(os.path.join(directory, existing))
+    return removed
+
+def write_lod_variants(
+    image_file_path: str,
+    image_data: bytes,
+    scales: Sequence[float],
+) -> List[LodVariant]:
+    """
+    モジュール画像の縮小版を元画像と同じディレクトリに保存し、
+    modules_config の variants に記録する一覧を返す。
+    以前の実行で作られ、今回の倍率に含まれない縮小画像は削除する。
+
+    Args:
+        image_file_path: 元画像の保存パス (= imgPath)
+        image_data: 元画像のバイト列
+        scales: 生成する倍率
+
+    Returns:
+        [{'scale': 1.0, 'imgPath': ..., 'width': ..., 'height': ...}, ...] (倍率の降順)
+        デコードできない画像の場合は空リスト
+    """
+    try:
+        get_png_size(image_data)
+        variants = generate_lod_variants_cached(image_data, scales)
+    except ValueError:
+        variants = None
+    if variants is None:
+        print(f"[WARNING] Failed to decode PNG for LOD variants: {image_file_path}. Skipped.")
+        return []
+
+    remove_lod_variant_files(image_file_path, keep=scales)
+
+    lod_list: List[LodVariant] = []
+    for scale in sorted(set(scales), reverse=True):
+        if scale >= 1:
+            variant_path, variant_data = image_file_path, image_data
+        else:
+            variant_path = get_variant_file_path(image_file_path, scale)
+            variant_data = variants[get_scale_label(scale)]
+            with open(variant_path, 'wb') as f:
+                f.write(variant_data)
+        width, height = get_png_size(variant_data)
+        lod_list.append({'scale': scale, 'imgPath': variant_path, 'width': width, 'height': height})
+
+    print(f"[ACTION] LOD variants saved: {', '.join(get_scale_label(v['scale']) for v in lod_list)}")
+    return lod_list
@@ -1,15 +1,21 @@
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Sequence
 
 from config import MODULES_CONFIG_JSON_PATH, ROOT_DIR_KEY, SEEDS_DIR_KEY, PLANTS_DIR_KEY, PARTS_DIR_KEY, MODULES_DIR_KEY
+from utils.image_lod_utils import write_lod_variants, remove_lod_variant_files
+from utils.reverse_generation_cache import get_config_fingerprint, invalidate_reverse_result
+from utils.config_io_utils import load_config, save_config
 
 
 # -------------------------
 
 # --- データ構造の定義 (型ヒント用) ---
 # ModuleSettingに対応する辞書の型エイリアス
-ModuleSetting = Dict[str, Any] # 'imgPath', 'zIndex'を含む
+ModuleSetting = Dict[str, Any] # 'imgPath', 'zIndex' (と任意で 'variants', 'atlasFrame') を含む
+
+# 画像の保存先ディレクトリ構成 { 'ROOT_DIR_KEY': ..., 'SEEDS_DIR_KEY': ..., ... }
+DirectoryKeys = Dict[str, str]
 
 # --- ヘルパー関数定義 ---
 
@@ -35,11 +41,73 @@ def get_module_key(
     # TypeScript版と同様にすべて大文字に変換して連結
     return '_'.join(key.upper() for key in keys)
 
+def get_plant_key(seed_type: str, plant_type: str) -> str:
+    """PlantSettingを参照するためのキーを生成する。"""
+    keys = [seed_type, plant_type]
+    return '_'.join(key.upper() for key in keys)
+
+def get_plant_module_keys(seed_type: str, plant_type: str, plants_config: Dict[str, Any]) -> List[str]:
+    """plants_config に登録されているPlantの全モジュールキーを返す。"""
+    plant_setting = plants_config.get(get_plant_key(seed_type, plant_type), {})
+    return [
+        get_module_key(seed_type, plant_type, part_type, module_type)
+        for part_type, module_options in plant_setting.get('modules', {}).items()
+        for module_type in module_options
+    ]
+
+def get_directory_keys() -> DirectoryKeys:
+    """config.py に定義された現在のディレクトリ構成を返す。"""
+    return {
+        'ROOT_DIR_KEY': ROOT_DIR_KEY,
+        'SEEDS_DIR_KEY': SEEDS_DIR_KEY,
+        'PLANTS_DIR_KEY': PLANTS_DIR_KEY,
+        'PARTS_DIR_KEY': PARTS_DIR_KEY,
+        'MODULES_DIR_KEY': MODULES_DIR_KEY,
+    }
+
+def get_plant_image_directory_path(
+    seed_type: str,
+    plant_type: str,
+    directory_keys: Optional[DirectoryKeys] = None
+) -> str:
+    """
+    Plantのモジュール画像をまとめるディレクトリパスを生成する。
+
+    Returns:
+        ディレクトリパス文字列 (例: 'images/seeds/math/plants/rosea')
+    """
+    keys = directory_keys or get_directory_keys()
+    return os.path.join(
+        keys['ROOT_DIR_KEY'],
+        keys['SEEDS_DIR_KEY'],
+        seed_type.lower(),
+        keys['PLANTS_DIR_KEY'],
+        plant_type.lower(),
+    )
+
+def join_module_image_directory_path(
+    plant_directory_path: str,
+    part_type: str,
+    module_type: str,
+    directory_keys: Optional[DirectoryKeys] = None
+) -> str:
+    """get_plant_image_directory_path の結果にPart/Moduleの階層を連結する。"""
+    keys = directory_keys or get_directory_keys()
+    # OSに依存しないパス区切り文字で結合
+    return os.path.join(
+        plant_directory_path,
+        keys['PARTS_DIR_KEY'],
+        part_type.lower(),
+        keys['MODULES_DIR_KEY'],
+        module_type.lower(),
+    )
+
 def get_module_image_directory_path(
     seed_type: str,
     plant_type: str,
     part_type: str,
-    module_type: str
+    module_type: str,
+    directory_keys: Optional[DirectoryKeys] = None
 ) -> str:
     """
     モジュールのアセットを保存するディレクトリパスを生成する。
@@ -49,24 +117,28 @@ def get_module_image_directory_path(
         plant_type: 植物のタイプ
         part_type: 部位のタイプ
         module_type: モジュールのタイプ
+        directory_keys: 指定した場合、config.py の代わりにこのディレクトリ構成を使う (移行ツール用)
         
     Returns:
         ディレクトリパス文字列 (例: 'images/seeds/math/plants/rosea/parts/stem/modules/thick_v1')
     """
     # グローバル定数として定義されたパスキーを使用
-    directory_path_keys = [
-        ROOT_DIR_KEY,
-        SEEDS_DIR_KEY,
-        seed_type.lower(),
-        PLANTS_DIR_KEY,
-        plant_type.lower(),
-        PARTS_DIR_KEY,
-        part_type.lower(),
-        MODULES_DIR_KEY,
-        module_type.lower(),
-    ]
-    # OSに依存しないパス区切り文字で結合
-    return os.path.join(*directory_path_keys)
+    keys = directory_keys or get_directory_keys()
+    plant_directory_path = get_plant_image_directory_path(seed_type, plant_type, keys)
+    return join_module_image_directory_path(plant_directory_path, part_type, module_type, keys)
+
+def get_local_file_path(img_path: str) -> str:
+    """
+    設定ファイルに保存された imgPath を、実行中のOSで開けるパスに変換する。
+    (Windowsで生成された '\\' 区切りのパスもLinux/macOSで扱えるようにする)
+    
+    Args:
+        img_path: modules_config.json の imgPath
+        
+    Returns:
+        OSのパス区切り文字で結合し直したパス文字列
+    """
+    return os.path.join(*img_path.replace('\\', '/').split('/'))
 
 # --- メインロジック関数 ---
 
@@ -77,7 +149,8 @@ def create_new_module(
     module_type: str,
     z_index: int,
     image_data: bytes, # 画像データをバイト列(bytes)として想定
-    allow_overwrite: bool # **追加: 上書きを許可するかどうかのフラグ**
+    allow_overwrite: bool, # **追加: 上書きを許可するかどうかのフラグ**
+    lod_scales: Optional[Sequence[float]] = None # 縮小版 (LOD) を生成する倍率
 ) -> None:
     """
     新しいモジュールの画像アセット保存と設定カタログへの追加を行う（実際のファイル操作）。
@@ -90,6 +163,7 @@ def create_new_module(
         z_index: レンダリング時のZ座標
         image_data: 保存する画像データ (バイト列)
         allow_overwrite: モジュールキーが既存の場合に上書きを許可するかどうか
+        lod_scales: 指定した場合、各倍率の縮小画像を同じディレクトリに保存し variants に記録する
         
     Raises:
         ValueError: モジュールキーが既存の設定に重複しており、上書きが許可されていない場合
@@ -103,15 +177,8 @@ def create_new_module(
     print(f"\n--- [START] Creating New Module: {module_key} ---")
     
     try:
-        # 1. JSON設定の読み込み
-        modules_config: Dict[str, ModuleSetting] = {}
-        try:
-            with open(MODULES_CONFIG_JSON_PATH, 'r', encoding='utf-8') as f:
-                modules_config = json.load(f)
-        except FileNotFoundError:
-            print("[INFO] Config file not found. Starting with empty config.")
-        except json.JSONDecodeError:
-            print("[WARNING] Error decoding existing JSON. Overwriting config with new data.")
+        # 1. JSON設定の読み込み (存在しない/壊れている場合は空の設定から始める)
+        modules_config: Dict[str, ModuleSetting] = load_config(MODULES_CONFIG_JSON_PATH)
 
         # 2. 整合性チェック: モジュールキーの重複を確認と上書き処理
         if module_key in modules_config:
@@ -135,15 +202,24 @@ def create_new_module(
         print(f"[ACTION] Image saved/overwritten to: {image_file_path}")
 
         # 5. JSONに新しい設定を追加/更新
-        new_setting: ModuleSetting = {
-            'imgPath': image_file_path,
-            'zIndex': z_index
-        }
+        # 既存の設定に上書きし、このモジュールが管理しないキー ('atlasFrame' など) は残す
+        new_setting: ModuleSetting = dict(modules_config.get(module_key, {}))
+        new_setting['imgPath'] = image_file_path
+        new_setting['zIndex'] = z_index
+        variants = write_lod_variants(image_file_path, image_data, lod_scales) if lod_scales else []
+        if variants:
+            new_setting['variants'] = variants
+        else:
+            # 縮小画像を作り直さない場合、以前の縮小画像は新しい画像と一致しないため削除する
+            new_setting.pop('variants', None)
+            for removed_path in remove_lod_variant_files(image_file_path):
+                print(f"[ACTION] Stale LOD variant removed: {removed_path}")
         modules_config[module_key] = new_setting
         
-        # 6. JSONを保存
-        with open(MODULES_CONFIG_JSON_PATH, 'w', encoding='utf-8') as f:
-            json.dump(modules_config, f, indent=4, ensure_ascii=False)
+        # 6. JSONを保存し、このPlantの逆生成キャッシュだけを無効化
+        fingerprint_before_write = get_config_fingerprint()
+        save_config(MODULES_CONFIG_JSON_PATH, modules_config)
+        invalidate_reverse_result(get_plant_key(seed_type, plant_type), fingerprint_before_write)
         
         print("[INFO] Updated config data (partial view):")
         print(json.dumps({module_key: new_setting}, indent=4, ensure_ascii=False))
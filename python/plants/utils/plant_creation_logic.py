@@ -1,7 +1,10 @@
-import os
-import json
-from typing import Dict, Any, Union, List
-from utils.module_config_utils import create_new_module
+from typing import Dict, Any, Union, List, Optional, Sequence, Set, Tuple
+from utils.module_config_utils import create_new_module, get_plant_key
+from utils.config_io_utils import load_config, save_config
+from utils.png_optimizer import optimize_png_batch
+from utils.image_lod_utils import generate_lod_variants_batch
+from utils.preload_manifest_utils import update_preload_manifest_for_plant
+from utils.reverse_generation_cache import get_config_fingerprint, invalidate_reverse_result
 from config import PLANTS_CONFIG_JSON_PATH, SEEDS_CONFIG_JSON_PATH
 
 # --- データ構造の定義 ---
@@ -9,29 +12,33 @@ PlantOption = Dict[str, Union[str, int]]
 PlantSetting = Dict[str, Union[str, Dict[str, Any]]]
 
 # --- ヘルパー関数定義 ---
-def get_plant_key(seed_type: str, plant_type: str) -> str:
-    """PlantSettingを参照するためのキーを生成する。"""
-    keys = [seed_type, plant_type]
-    return '_'.join(key.upper() for key in keys)
+def report_image_optimization(
+    plant_key: str,
+    module_data_list: List[Dict[str, Any]],
+    indices: Optional[Sequence[int]] = None
+) -> Dict[int, bytes]:
+    """
+    Plantのモジュール画像 (indices指定時はそのインデックスのみ) を並列に最適化し、削減できたバイト数を出力する。
 
-def load_config(path: str) -> Dict[str, Any]:
-    """JSON設定ファイルを読み込むヘルパー関数 (ファイルが存在しない場合は空の辞書を返す)"""
-    try:
-        # パスが存在しない場合も考慮し、ディレクトリを作成（必須ではないが安全のため）
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-def save_config(path: str, data: Dict[str, Any]):
-    """JSON設定ファイルを保存するヘルパー関数"""
-    try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
-    except Exception as e:
-        raise IOError(f"Failed to save config file {path}: {e}")
+    Returns:
+        {module_data_list内のインデックス: 最適化後の画像バイト列}
+    """
+    if indices is None:
+        indices = range(len(module_data_list))
+    originals = {
+        str(index): module_data_list[index].get('image', b'')
+        for index in indices
+    }
+    optimized = optimize_png_batch(originals)
+
+    before = sum(len(data) for data in originals.values())
+    after = sum(len(data) for data in optimized.values())
+    saved_ratio = (before - after) / before * 100 if before else 0.0
+    print(
+        f"[INFO] PNG optimization for {plant_key}: {before} -> {after} bytes "
+        f"(saved {before - after} bytes, {saved_ratio:.1f}%)"
+    )
+    return {int(key): data for key, data in optimized.items()}
 
 # --- メインロジック関数 ---
 
@@ -43,10 +50,17 @@ def create_new_plant(
     rarity: str,           
     weight: int,           
     module_data_list: List[Dict[str, Any]],
-    allow_overwrite: bool = False # 上書きを許可するかどうかのフラグ
+    allow_overwrite: bool = False, # 上書きを許可するかどうかのフラグ
+    optimize_images: bool = False, # モジュール画像をロスレス最適化してから保存するかどうか
+    lod_scales: Optional[Sequence[float]] = None, # 縮小版 (LOD) を生成する倍率
+    module_filter: Optional[Set[Tuple[str, str]]] = None # 書き直すモジュール (partType, moduleType)。Noneなら全モジュール
 ) -> None:
     """
     新しいPlant Typeのデータと、その構成モジュール群を一括で設定カタログに追加または上書きする。
+    optimize_images=True の場合、全モジュール画像をプロセスプールで並列に最適化してから保存する。
+    lod_scales を指定した場合、縮小画像を並列に生成 (キャッシュ) してから各モジュールに保存する。
+    module_filter を指定した場合、それ以外のモジュールは画像・MODULE_SETTINGSを書き直さない
+    (PLANT_SETTINGS/SEED_SETTINGS は常に module_data_list 全体から再構築する)。
     """
     plant_key = get_plant_key(seed_type, new_plant_type)
     print(f"\n--- [START] Creating/Updating New Plant: {plant_key} (Overwrite: {allow_overwrite}) ---")
@@ -59,10 +73,32 @@ def create_new_plant(
         'weight': weight,
     }
 
+    # 画像・MODULE_SETTINGSを書き直すモジュールのインデックス
+    target_indices = [
+        index for index, module_data in enumerate(module_data_list)
+        if module_filter is None or (module_data['partType'], module_data['moduleType']) in module_filter
+    ]
+
     try:
+        # --- 0. (オプション) モジュール画像のロスレス最適化 ---
+        optimized_images: Dict[int, bytes] = {}
+        if optimize_images:
+            optimized_images = report_image_optimization(plant_key, module_data_list, target_indices)
+
+        # --- 0.5 (オプション) 縮小画像を並列に生成し、キャッシュに載せておく ---
+        if lod_scales:
+            generate_lod_variants_batch(
+                {
+                    str(index): optimized_images.get(index, module_data_list[index].get('image', b''))
+                    for index in target_indices
+                },
+                lod_scales,
+            )
+
         # --- 1. 各モジュールアセットの保存とMODULE_SETTINGSの更新 ---
-        for module_data in module_data_list:
-            image_bytes = module_data.get('image', b'')
+        for index in target_indices:
+            module_data = module_data_list[index]
+            image_bytes = optimized_images.get(index, module_data.get('image', b''))
             
             # create_new_module の呼び出しに allow_overwrite を渡す
             create_new_module(
@@ -72,7 +108,8 @@ def create_new_plant(
                 module_type=module_data['moduleType'],
                 z_index=module_data['zIndex'],
                 image_data=image_bytes,
-                allow_overwrite=allow_overwrite 
+                allow_overwrite=allow_overwrite,
+                lod_scales=lod_scales
             )
         
         # --- 2. PLANT_SETTINGSに追加するデータ構造の構築 (PLANTS_CONFIG用) ---
@@ -95,6 +132,8 @@ def create_new_plant(
         }
 
         # --- 3. PLANTS_CONFIG.JSON の更新 ---
+        # 逆生成キャッシュの無効化のため、書き込み前のフィンガープリントを控えておく
+        fingerprint_before_write = get_config_fingerprint()
         plants_config: Dict[str, PlantSetting] = load_config(PLANTS_CONFIG_JSON_PATH)
 
         # 重複チェックと上書き処理
@@ -128,6 +167,12 @@ def create_new_plant(
         # データを保存
         save_config(SEEDS_CONFIG_JSON_PATH, seeds_config)
         print(f"[ACTION] {SEEDS_CONFIG_JSON_PATH} updated/overwritten for seed: {seed_type_lower}")
+
+        # このPlantの逆生成キャッシュだけを無効化 (他のPlantのキャッシュは有効なまま)
+        invalidate_reverse_result(plant_key, fingerprint_before_write)
+
+        # --- 5. プリロードマニフェストの差分更新 (このPlantとSeedのエントリのみ) ---
+        update_preload_manifest_for_plant(seed_type, new_plant_type)
         
         print(f"--- [SUCCESS] Plant {plant_key} registration completed. ---")
 
@@ -0,0 +1,278 @@
+import os
+import zlib
+import struct
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from config import CACHE_DIR
+from utils.png_utils import (
+    PngHeader, PngChunk, decode_png_scanlines, scanlines_to_rgba, filter_scanlines,
+    build_png_header, write_png_chunks, get_filter_unit, is_png,
+)
+
+
+# -------------------------
+
+# 最適化ロジックを変更した場合はバージョンを上げ、古いキャッシュを無効にする
+OPTIMIZER_VERSION = 2
+
+# 最適化結果のキャッシュディレクトリ (入力ハッシュ.png で保存)
+OPTIMIZER_CACHE_DIR = os.path.join(CACHE_DIR, 'png_optimizer')
+
+# 描画結果に影響するため、削除せずに残す補助チャンク
+KEPT_ANCILLARY_CHUNKS = (b'tRNS',)
+
+# 試行するフィルタ (None は行ごとの適応フィルタ)
+FILTER_CANDIDATES: Tuple[Optional[int], ...] = (0, None, 1, 2, 4)
+
+# 試行するzlibの圧縮戦略
+ZLIB_STRATEGIES: Tuple[int, ...] = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED, zlib.Z_RLE)
+
+# この画素数以下の画像だけ、全候補×全フィルタ×全圧縮戦略を総当たりする
+# (フィルタ・色変換は純Pythonのため、大きな画像では1枚に数分かかる)
+FULL_SEARCH_MAX_PIXELS = 128 * 128
+
+# この画素数を超える画像は最適化せず、そのまま返す
+OPTIMIZE_MAX_PIXELS = 512 * 512
+
+# 総当たりしない画像で使うフィルタと圧縮戦略 (行ごとの適応フィルタ + 既定の戦略)
+FAST_FILTER_CANDIDATES: Tuple[Optional[int], ...] = (None,)
+FAST_ZLIB_STRATEGIES: Tuple[int, ...] = (zlib.Z_DEFAULT_STRATEGY,)
+
+# 壊れたPNGの変換中に発生しうる例外 (元のバイト列を返す)
+DECODE_ERRORS = (ValueError, IndexError, KeyError, struct.error, zlib.error)
+
+# (ヘッダ, フィルタ前のスキャンライン, PLTE/tRNSなどの付随チャンク)
+PngCandidate = Tuple[PngHeader, List[bytes], List[PngChunk]]
+
+# --- 色表現の縮小 (ロスレス) ---
+
+def _pack_samples(samples: List[int], bit_depth: int) -> bytes:
+    """サンプル値のリストを指定ビット深度のスキャンラインに詰める。"""
+    if bit_depth == 8:
+        return bytes(samples)
+    per_byte = 8 // bit_depth
+    out = bytearray()
+    for i in range(0, len(samples), per_byte):
+        byte = 0
+        group = samples[i:i + per_byte]
+        for j, value in enumerate(group):
+            byte |= value << (8 - bit_depth * (j + 1))
+        out.append(byte)
+    return bytes(out)
+
+def _smallest_bit_depth(max_value: int) -> int:
+    """値の最大値を表現できる最小のビット深度 (1/2/4/8) を返す。"""
+    for bit_depth in (1, 2, 4):
+        if max_value < (1 << bit_depth):
+            return bit_depth
+    return 8
+
+def _gray_bit_depth(values: set) -> int:
+    """8bitグレー値をロスレスで表現できる最小のビット深度を返す。"""
+    for bit_depth in (1, 2, 4):
+        scale = 255 // ((1 << bit_depth) - 1)
+        if all(v % scale == 0 for v in values):
+            return bit_depth
+    return 8
+
+def build_reduced_candidates(width: int, height: int, pixels: bytearray) -> List[PngCandidate]:
+    """
+    8bit RGBA画像から、ロスレスに表現できる候補 (パレット/グレー/RGB/RGBA) を生成する。
+    """
+    rgba = [tuple(pixels[i:i + 4]) for i in range(0, len(pixels), 4)]
+    colors = set(rgba)
+    has_alpha = any(px[3] != 255 for px in colors)
+    is_gray = all(px[0] == px[1] == px[2] for px in colors)
+
+    def header(bit_depth: int, color_type: int) -> PngHeader:
+        return {'width': width, 'height': height, 'bitDepth': bit_depth, 'colorType': color_type, 'interlace': 0}
+
+    def rows_from(samples_per_pixel: List[List[int]], bit_depth: int) -> List[bytes]:
+        return [
+            _pack_samples(
+                [v for px in samples_per_pixel[y * width:(y + 1) * width] for v in px],
+                bit_depth,
+            )
+            for y in range(height)
+        ]
+
+    candidates: List[PngCandidate] = []
+
+    # 1. パレット (256色以下)。透過色を先頭に並べてtRNSを短くする
+    if len(colors) <= 256:
+        palette = sorted(colors, key=lambda px: (px[3] == 255, px))
+        index_of = {px: i for i, px in enumerate(palette)}
+        bit_depth = _smallest_bit_depth(len(palette) - 1)
+        extra: List[PngChunk] = [(b'PLTE', b''.join(bytes(px[:3]) for px in palette))]
+        alphas = bytes(px[3] for px in palette if px[3] != 255)
+        if alphas:
+            extra.append((b'tRNS', alphas))
+        candidates.append((header(bit_depth, 3), rows_from([[index_of[px]] for px in rgba], bit_depth), extra))
+
+    # 2. グレースケール / グレースケール+アルファ
+    if is_gray:
+        if has_alpha:
+            candidates.append((header(8, 4), rows_from([[px[0], px[3]] for px in rgba], 8), []))
+        else:
+            bit_depth = _gray_bit_depth({px[0] for px in colors})
+            scale = 255 // ((1 << bit_depth) - 1)
+            candidates.append((header(bit_depth, 0), rows_from([[px[0] // scale] for px in rgba], bit_depth), []))
+
+    # 3. トゥルーカラー (常に表現可能)
+    if has_alpha:
+        candidates.append((header(8, 6), rows_from([list(px) for px in rgba], 8), []))
+    else:
+        candidates.append((header(8, 2), rows_from([list(px[:3]) for px in rgba], 8), []))
+
+    return candidates
+
+# --- 圧縮 ---
+
+def deflate_best(filtered: bytes, strategies: Tuple[int, ...] = ZLIB_STRATEGIES) -> bytes:
+    """複数のzlib圧縮戦略を試し、最も小さい圧縮結果を返す。"""
+    best: Optional[bytes] = None
+    for strategy in strategies:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+        compressed = compressor.compress(filtered) + compressor.flush()
+        if best is None or len(compressed) < len(best):
+            best = compressed
+    return best or b''
+
+def encode_candidate(candidate: PngCandidate, full_search: bool = True) -> bytes:
+    """
+    候補をフィルタ×圧縮戦略の総当たりで圧縮し、最小のPNGバイト列を返す。
+    full_search が False の場合は適応フィルタと既定の圧縮戦略だけを使う。
+    """
+    header, rows, extra_chunks = candidate
+    bpp = get_filter_unit(header)
+    filter_candidates = FILTER_CANDIDATES if full_search else FAST_FILTER_CANDIDATES
+    strategies = ZLIB_STRATEGIES if full_search else FAST_ZLIB_STRATEGIES
+    best_idat: Optional[bytes] = None
+    for filter_type in filter_candidates:
+        idat = deflate_best(filter_scanlines(rows, bpp, filter_type), strategies)
+        if best_idat is None or len(idat) < len(best_idat):
+            best_idat = idat
+    return write_png_chunks(
+        [(b'IHDR', build_png_header(header))] + extra_chunks + [(b'IDAT', best_idat or b''), (b'IEND', b'')]
+    )
+
+# --- メインロジック関数 ---
+
+def optimize_png(data: bytes) -> bytes:
+    """
+    PNGをロスレスで最適化する。
+    補助チャンク (tRNS以外) の削除、色表現/ビット深度の縮小、最適なフィルタと圧縮戦略での再圧縮を行う。
+    FULL_SEARCH_MAX_PIXELS を超える画像は、最も小さくなりやすい候補1つを適応フィルタで圧縮するだけにする。
+    PNGとして解釈できない場合、OPTIMIZE_MAX_PIXELS を超える場合、結果が元より大きくなる場合は元のバイト列をそのまま返す。
+
+    Args:
+        data: 入力PNGのバイト列
+
+    Returns:
+        最適化後のPNGバイト列
+    """
+    if not is_png(data):
+        return data
+    try:
+        return _optimize_decoded_png(data)
+    except DECODE_ERRORS:
+        return data
+
+def _optimize_decoded_png(data: bytes) -> bytes:
+    header, rows, chunks = decode_png_scanlines(data)
+    pixel_count = header['width'] * header['height']
+    if pixel_count > OPTIMIZE_MAX_PIXELS:
+        return data
+    full_search = pixel_count <= FULL_SEARCH_MAX_PIXELS
+
+    kept_chunks = [
+        (chunk_type, body) for chunk_type, body in chunks
+        if chunk_type in (b'PLTE',) + KEPT_ANCILLARY_CHUNKS
+    ]
+
+    candidates: List[PngCandidate]
+    is_16bit_exact = header['bitDepth'] == 16 and all(row[i] == row[i + 1] for row in rows for i in range(0, len(row), 2))
+    if header['bitDepth'] <= 8 or is_16bit_exact:
+        # 8bit RGBAへの変換がロスレスな場合のみ色表現の縮小を試みる
+        image = scanlines_to_rgba(header, rows, kept_chunks)
+        candidates = build_reduced_candidates(image.width, image.height, image.pixels)
+    else:
+        # 16bitの情報を持つ画像は色表現を変えず、再圧縮のみ行う
+        candidates = [(dict(header, interlace=0), [bytes(row) for row in rows], kept_chunks)]
+    if not full_search:
+        # 候補はパレット → グレー → トゥルーカラーの順 (先頭ほど1画素あたりのデータが小さい)
+        candidates = candidates[:1]
+
+    best = data
+    for candidate in candidates:
+        encoded = encode_candidate(candidate, full_search)
+        if len(encoded) < len(best):
+            best = encoded
+    return best
+
+def get_optimizer_cache_path(data: bytes) -> str:
+    """入力バイト列のハッシュから、最適化結果のキャッシュファイルパスを生成する。"""
+    digest = hashlib.sha256(data).hexdigest()
+    return os.path.join(OPTIMIZER_CACHE_DIR, f"v{OPTIMIZER_VERSION}_{digest}.png")
+
+def read_optimizer_cache(data: bytes) -> Optional[bytes]:
+    """キャッシュ済みの最適化結果を返す (存在しない場合はNone)。"""
+    try:
+        with open(get_optimizer_cache_path(data), 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def write_optimizer_cache(data: bytes, optimized: bytes) -> None:
+    """最適化結果をキャッシュに保存する (失敗しても処理は継続する)。"""
+    try:
+        os.makedirs(OPTIMIZER_CACHE_DIR, exist_ok=True)
+        with open(get_optimizer_cache_path(data), 'wb') as f:
+            f.write(optimized)
+    except OSError as e:
+        print(f"[WARNING] Failed to write PNG optimizer cache: {e}")
+
+def optimize_png_cached(data: bytes) -> bytes:
+    """キャッシュを参照しつつ、1枚のPNGを最適化する。"""
+    cached = read_optimizer_cache(data)
+    if cached is not None:
+        return cached
+    optimized = optimize_png(data)
+    write_optimizer_cache(data, optimized)
+    return optimized
+
+def optimize_png_batch(images: Dict[str, bytes], max_workers: Optional[int] = None) -> Dict[str, bytes]:
+    """
+    複数のPNGをプロセスプールで並列に最適化する。キャッシュ済みのものは再計算しない。
+
+    Args:
+        images: {識別キー: PNGバイト列}
+        max_workers: プロセス数 (Noneの場合はCPU数)
+
+    Returns:
+        {識別キー: 最適化後のPNGバイト列}
+    """
+    results: Dict[str, bytes] = {}
+    misses: Dict[str, bytes] = {}
+    for key, data in images.items():
+        cached = read_optimizer_cache(data)
+        if cached is not None:
+            results[key] = cached
+        else:
+            misses[key] = data
+
+    if len(misses) == 1:
+        # 1枚だけならプロセス起動のコストの方が大きい
+        key, data = next(iter(misses.items()))
+        results[key] = optimize_png(data)
+        write_optimizer_cache(data, results[key])
+    elif misses:
+        keys = list(misses)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for key, optimized in zip(keys, executor.map(optimize_png, [misses[k] for k in keys])):
+                results[key] = optimized
+                write_optimizer_cache(misses[key], optimized)
+
+    return results
@@ -0,0 +1,412 @@
+import struct
+import zlib
+from typing import Dict, List, Tuple, NamedTuple, Optional
+
+# Pillowはオプション依存。インストールされていればデコード/エンコードに使用する
+try:
+    from PIL import Image  # type: ignore
+except ImportError:
+    Image = None
+
+
+# -------------------------
+
+# --- データ構造の定義 (型ヒント用) ---
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# カラータイプごとのチャンネル数
+COLOR_TYPE_CHANNELS: Dict[int, int] = {
+    0: 1,  # Grayscale
+    2: 3,  # RGB
+    3: 1,  # Palette
+    4: 2,  # Grayscale + Alpha
+    6: 4,  # RGBA
+}
+
+# カラータイプごとに許されるビット深度 (PNG仕様)
+COLOR_TYPE_BIT_DEPTHS: Dict[int, Tuple[int, ...]] = {
+    0: (1, 2, 4, 8, 16),
+    2: (8, 16),
+    3: (1, 2, 4, 8),
+    4: (8, 16),
+    6: (8, 16),
+}
+
+# IHDRチャンク本体の長さ
+IHDR_LENGTH = 13
+
+# IHDRチャンクの内容に対応する辞書の型エイリアス
+PngHeader = Dict[str, int] # 'width', 'height', 'bitDepth', 'colorType', 'interlace'を含む
+
+# (チャンクタイプ, チャンク本体) のリスト
+PngChunk = Tuple[bytes, bytes]
+
+
+class RgbaImage(NamedTuple):
+    """8bit RGBA の非圧縮画像 (pixelsは行優先で width * height * 4 バイト)"""
+    width: int
+    height: int
+    pixels: bytearray
+
+
+# --- ヘルパー関数定義 ---
+
+def is_png(data: bytes) -> bool:
+    """バイト列がPNGシグネチャで始まるかどうかを判定する。"""
+    return data[:len(PNG_SIGNATURE)] == PNG_SIGNATURE
+
+def read_png_chunks(data: bytes) -> List[PngChunk]:
+    """
+    PNGバイト列をチャンクのリストに分解する。
+
+    Raises:
+        ValueError: PNGシグネチャやチャンク構造が不正な場合
+    """
+    if not is_png(data):
+        raise ValueError("Not a PNG file (signature mismatch).")
+
+    chunks: List[PngChunk] = []
+    offset = len(PNG_SIGNATURE)
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack('>I4s', data[offset:offset + 8])
+        body_start = offset + 8
+        body_end = body_start + length
+        if body_end + 4 > len(data):
+            raise ValueError(f"Truncated PNG chunk: {chunk_type!r}")
+        chunks.append((chunk_type, data[body_start:body_end]))
+        offset = body_end + 4 # CRCを読み飛ばす
+        if chunk_type == b'IEND':
+            break
+    return chunks
+
+def build_png_chunk(chunk_type: bytes, body: bytes) -> bytes:
+    """チャンクタイプと本体から、長さ/CRC付きのチャンクバイト列を生成する。"""
+    crc = zlib.crc32(chunk_type + body) & 0xFFFFFFFF
+    return struct.pack('>I', len(body)) + chunk_type + body + struct.pack('>I', crc)
+
+def write_png_chunks(chunks: List[PngChunk]) -> bytes:
+    """チャンクのリストをPNGバイト列に組み立てる。"""
+    return PNG_SIGNATURE + b''.join(build_png_chunk(t, b) for t, b in chunks)
+
+def parse_png_header(ihdr_body: bytes) -> PngHeader:
+    """
+    IHDRチャンク本体を辞書に変換する。
+
+    Raises:
+        ValueError: IHDRの長さ・カラータイプ・ビット深度が不正な場合
+    """
+    if len(ihdr_body) != IHDR_LENGTH:
+        raise ValueError(f"Invalid IHDR chunk length: {len(ihdr_body)}")
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack('>IIBBBBB', ihdr_body)
+    if color_type not in COLOR_TYPE_CHANNELS:
+        raise ValueError(f"Unsupported PNG color type: {color_type}")
+    if bit_depth not in COLOR_TYPE_BIT_DEPTHS[color_type]:
+        raise ValueError(f"Invalid bit depth {bit_depth} for PNG color type {color_type}")
+    return {
+        'width': width,
+        'height': height,
+        'bitDepth': bit_depth,
+        'colorType': color_type,
+        'interlace': interlace,
+    }
+
+def build_png_header(header: PngHeader) -> bytes:
+    """辞書からIHDRチャンク本体を生成する。"""
+    return struct.pack(
+        '>IIBBBBB',
+        header['width'],
+        header['height'],
+        header['bitDepth'],
+        header['colorType'],
+        0, # compression method
+        0, # filter method
+        header.get('interlace', 0),
+    )
+
+def get_row_stride(header: PngHeader) -> int:
+    """1スキャンラインのバイト数 (フィルタバイトを除く) を返す。"""
+    bits_per_pixel = COLOR_TYPE_CHANNELS[header['colorType']] * header['bitDepth']
+    return (header['width'] * bits_per_pixel + 7) // 8
+
+def get_filter_unit(header: PngHeader) -> int:
+    """フィルタ計算に使用する1ピクセルあたりのバイト数 (最小1) を返す。"""
+    return max(1, COLOR_TYPE_CHANNELS[header['colorType']] * header['bitDepth'] // 8)
+
+# --- フィルタ処理 ---
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa = abs(p - a)
+    pb = abs(p - b)
+    pc = abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    if pb <= pc:
+        return b
+    return c
+
+def unfilter_scanlines(raw: bytes, header: PngHeader) -> List[bytearray]:
+    """
+    展開済みIDATデータからフィルタを除去し、スキャンラインのリストを返す。
+
+    Raises:
+        ValueError: データ長やフィルタタイプが不正な場合
+    """
+    stride = get_row_stride(header)
+    bpp = get_filter_unit(header)
+    height = header['height']
+    if len(raw) < (stride + 1) * height:
+        raise ValueError("PNG image data is shorter than expected.")
+
+    rows: List[bytearray] = []
+    prev = bytearray(stride)
+    offset = 0
+    for _ in range(height):
+        filter_type = raw[offset]
+        row = bytearray(raw[offset + 1:offset + 1 + stride])
+        offset += stride + 1
+
+        if filter_type == 1: # Sub
+            for i in range(bpp, stride):
+                row[i] = (row[i] + row[i - bpp]) & 0xFF
+        elif filter_type == 2: # Up
+            row = bytearray((x + y) & 0xFF for x, y in zip(row, prev))
+        elif filter_type == 3: # Average
+            for i in range(stride):
+                left = row[i - bpp] if i >= bpp else 0
+                row[i] = (row[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif filter_type == 4: # Paeth
+            for i in range(stride):
+                left = row[i - bpp] if i >= bpp else 0
+                upper_left = prev[i - bpp] if i >= bpp else 0
+                row[i] = (row[i] + _paeth(left, prev[i], upper_left)) & 0xFF
+        elif filter_type != 0:
+            raise ValueError(f"Unknown PNG filter type: {filter_type}")
+
+        rows.append(row)
+        prev = row
+    return rows
+
+def filter_scanline(filter_type: int, row: bytes, prev: bytes, bpp: int) -> bytearray:
+    """1スキャンラインに指定のフィルタを適用し、先頭にフィルタバイトを付けて返す。"""
+    out = bytearray([filter_type])
+    if filter_type == 0:
+        out.extend(row)
+    elif filter_type == 1:
+        out.extend((row[i] - (row[i - bpp] if i >= bpp else 0)) & 0xFF for i in range(len(row)))
+    elif filter_type == 2:
+        out.extend((x - y) & 0xFF for x, y in zip(row, prev))
+    elif filter_type == 3:
+        out.extend(
+            (row[i] - (((row[i - bpp] if i >= bpp else 0) + prev[i]) >> 1)) & 0xFF
+            for i in range(len(row))
+        )
+    elif filter_type == 4:
+        out.extend(
+            (row[i] - _paeth(
+                row[i - bpp] if i >= bpp else 0,
+                prev[i],
+                prev[i - bpp] if i >= bpp else 0,
+            )) & 0xFF
+            for i in range(len(row))
+        )
+    else:
+        raise ValueError(f"Unknown PNG filter type: {filter_type}")
+    return out
+
+def filter_scanlines(rows: List[bytes], bpp: int, filter_type: Optional[int] = None) -> bytes:
+    """
+    全スキャンラインにフィルタを適用する。
+
+    Args:
+        rows: フィルタ前のスキャンライン
+        bpp: フィルタ計算に使用する1ピクセルあたりのバイト数
+        filter_type: 固定で使うフィルタ。Noneの場合は行ごとに絶対値和が最小のフィルタを選ぶ
+    """
+    out = bytearray()
+    prev = bytes(len(rows[0])) if rows else b''
+    for row in rows:
+        if filter_type is not None:
+            out.extend(filter_scanline(filter_type, row, prev, bpp))
+        else:
+            # 最小絶対値和ヒューリスティック (libpngの適応フィルタと同じ考え方)
+            candidates = [filter_scanline(t, row, prev, bpp) for t in range(5)]
+            out.extend(min(
+                candidates,
+                key=lambda c: sum(v if v < 128 else 256 - v for v in c[1:])
+            ))
+        prev = row
+    return bytes(out)
+
+# --- デコード/エンコード ---
+
+def _read_ihdr(chunks: List[PngChunk]) -> PngHeader:
+    """先頭チャンクがIHDRであることを確認し、ヘッダを返す。"""
+    if not chunks or chunks[0][0] != b'IHDR':
+        raise ValueError("PNG is missing the IHDR chunk.")
+    return parse_png_header(chunks[0][1])
+
+def decode_png_scanlines(data: bytes) -> Tuple[PngHeader, List[bytearray], List[PngChunk]]:
+    """
+    PNGバイト列をヘッダ・フィルタ除去済みスキャンライン・全チャンクに分解する。
+
+    Raises:
+        ValueError: PNGとして解釈できない、またはインターレースPNGの場合
+    """
+    chunks = read_png_chunks(data)
+    header = _read_ihdr(chunks)
+    if header['interlace']:
+        raise ValueError("Interlaced PNG is not supported by the pure-Python decoder.")
+
+    idat = b''.join(body for chunk_type, body in chunks if chunk_type == b'IDAT')
+    try:
+        raw = zlib.decompress(idat)
+    except zlib.error as e:
+        raise ValueError(f"Failed to inflate PNG image data: {e}") from e
+    return header, unfilter_scanlines(raw, header), chunks
+
+def unpack_samples(row: bytes, bit_depth: int, count: int) -> List[int]:
+    """1スキャンラインからサンプル値を取り出す (16bitの場合はそのままの値)。"""
+    if bit_depth == 8:
+        return list(row[:count])
+    if bit_depth == 16:
+        return [(row[i] << 8) | row[i + 1] for i in range(0, count * 2, 2)]
+    mask = (1 << bit_depth) - 1
+    samples: List[int] = []
+    for byte in row:
+        for shift in range(8 - bit_depth, -1, -bit_depth):
+            samples.append((byte >> shift) & mask)
+        if len(samples) >= count:
+            break
+    del samples[count:]
+    return samples
+
+def scanlines_to_rgba(header: PngHeader, rows: List[bytearray], chunks: List[PngChunk]) -> RgbaImage:
+    """フィルタ除去済みスキャンラインを8bit RGBA画像に変換する。"""
+    width = header['width']
+    height = header['height']
+    bit_depth = header['bitDepth']
+    color_type = header['colorType']
+    channels = COLOR_TYPE_CHANNELS[color_type]
+
+    palette = b''
+    trns = b''
+    for chunk_type, body in chunks:
+        if chunk_type == b'PLTE':
+            palette = body
+        elif chunk_type == b'tRNS':
+            trns = body
+
+    # サンプル値を8bitに正規化する関数
+    if bit_depth == 16:
+        to_8bit = lambda v: v >> 8
+    elif bit_depth < 8 and color_type != 3:
+        scale = 255 // ((1 << bit_depth) - 1)
+        to_8bit = lambda v: v * scale
+    else:
+        to_8bit = lambda v: v
+
+    # tRNSによる単色透過キー (グレースケール/RGB)
+    transparent_key: Optional[Tuple[int, ...]] = None
+    if trns and len(trns) < {0: 2, 2: 6}.get(color_type, 0):
+        raise ValueError(f"Truncated PNG tRNS chunk: {len(trns)} bytes")
+    if trns and color_type == 0:
+        transparent_key = struct.unpack('>H', trns[:2])
+    elif trns and color_type == 2:
+        transparent_key = struct.unpack('>HHH', trns[:6])
+
+    pixels = bytearray(width * height * 4)
+    out = 0
+    for row in rows:
+        samples = unpack_samples(row, bit_depth, width * channels)
+        for x in range(width):
+            px = samples[x * channels:(x + 1) * channels]
+            if color_type == 3:
+                index = px[0]
+                r, g, b = palette[index * 3:index * 3 + 3]
+                a = trns[index] if index < len(trns) else 255
+            elif color_type == 0:
+                r = g = b = to_8bit(px[0])
+                a = 0 if transparent_key == (px[0],) else 255
+            elif color_type == 4:
+                r = g = b = to_8bit(px[0])
+                a = to_8bit(px[1])
+            elif color_type == 2:
+                r, g, b = (to_8bit(v) for v in px)
+                a = 0 if transparent_key == tuple(px) else 255
+            else:
+                r, g, b, a = (to_8bit(v) for v in px)
+            pixels[out:out + 4] = bytes((r, g, b, a))
+            out += 4
+    return RgbaImage(width, height, pixels)
+
+def decode_png(data: bytes) -> RgbaImage:
+    """
+    PNGバイト列を8bit RGBA画像にデコードする。
+    Pillowが利用可能な場合はPillowを、そうでなければ純Pythonデコーダを使用する。
+
+    Raises:
+        ValueError: PNGとしてデコードできない場合
+    """
+    if Image is not None:
+        import io
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                rgba = img.convert('RGBA')
+                return RgbaImage(rgba.width, rgba.height, bytearray(rgba.tobytes()))
+        except Exception as e:
+            raise ValueError(f"Failed to decode PNG with Pillow: {e}") from e
+
+    header, rows, chunks = decode_png_scanlines(data)
+    return scanlines_to_rgba(header, rows, chunks)
+
+def encode_png(image: RgbaImage, compress_level: int = 9) -> bytes:
+    """
+    8bit RGBA画像をPNGバイト列にエンコードする。
+    Pillowが利用可能な場合はPillowを、そうでなければ純Pythonエンコーダを使用する。
+    """
+    if Image is not None:
+        import io
+        img = Image.frombytes('RGBA', (image.width, image.height), bytes(image.pixels))
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG', compress_level=compress_level)
+        return buffer.getvalue()
+
+    stride = image.width * 4
+    rows = [image.pixels[y * stride:(y + 1) * stride] for y in range(image.height)]
+    header: PngHeader = {
+        'width': image.width,
+        'height': image.height,
+        'bitDepth': 8,
+        'colorType': 6,
+        'interlace': 0,
+    }
+    idat = zlib.compress(filter_scanlines(rows, 4), compress_level)
+    return write_png_chunks([
+        (b'IHDR', build_png_header(header)),
+        (b'IDAT', idat),
+        (b'IEND', b''),
+    ])
+
+def create_blank_image(width: int, height: int) -> RgbaImage:
+    """完全透明のRGBA画像を生成する。"""
+    return RgbaImage(width, height, bytearray(width * height * 4))
+
+def blit_image(dest: RgbaImage, src: RgbaImage, x: int, y: int) -> None:
+    """src画像をdest画像の(x, y)位置にそのままコピーする (アルファ合成は行わない)。"""
+    src_stride = src.width * 4
+    dest_stride = dest.width * 4
+    for row in range(src.height):
+        dest_offset = (y + row) * dest_stride + x * 4
+        src_offset = row * src_stride
+        dest.pixels[dest_offset:dest_offset + src_stride] = src.pixels[src_offset:src_offset + src_stride]
+
+def get_png_size(data: bytes) -> Tuple[int, int]:
+    """
+    IHDRだけを読み、画像の (width, height) を返す。
+
+    Raises:
+        ValueError: PNGとして解釈できない場合
+    """
+    header = _read_ihdr(read_png_chunks(data))
+    return header['width'], header['height']
@@ -0,0 +1,146 @@
+import hashlib
+from typing import Dict, Any, List, Optional
+
+from config import (
+    SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH, PRELOAD_MANIFEST_JSON_PATH,
+)
+from utils.module_config_utils import get_plant_key, get_plant_module_keys, get_local_file_path
+from utils.config_io_utils import load_config, save_config
+
+
+# -------------------------
+
+# マニフェスト形式のバージョン (形式を変更した場合に上げる)
+PRELOAD_MANIFEST_VERSION = 1
+
+# --- データ構造の定義 (型ヒント用) ---
+# プリロード対象の1アセット
+PreloadAsset = Dict[str, Any] # 'moduleKey', 'imgPath', 'zIndex', 'byteSize', 'hash'を含む
+
+# Plant/Seedごとのエントリ
+PreloadEntry = Dict[str, Any] # 'totalBytes', 'assets' (とPlantの場合は 'seedType', 'plantType') を含む
+
+# マニフェスト全体 { 'version': int, 'plants': {PLANT_KEY: PreloadEntry}, 'seeds': {seed: PreloadEntry} }
+PreloadManifest = Dict[str, Any]
+
+# --- ヘルパー関数定義 ---
+
+def describe_asset(module_key: str, module_setting: Dict[str, Any]) -> Optional[PreloadAsset]:
+    """モジュール画像のサイズとハッシュを読み取り、プリロード用の情報を返す (読めない場合はNone)。"""
+    img_path = module_setting.get('imgPath')
+    if not img_path:
+        return None
+    try:
+        with open(get_local_file_path(img_path), 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        print(f"[WARNING] Failed to read image for preload manifest ({module_key}): {e}. Skipping.")
+        return None
+    return {
+        'moduleKey': module_key,
+        'imgPath': img_path,
+        'zIndex': module_setting.get('zIndex', 0),
+        'byteSize': len(data),
+        'hash': hashlib.sha256(data).hexdigest(),
+    }
+
+def sort_assets(assets: List[PreloadAsset]) -> List[PreloadAsset]:
+    """アセットをzIndex順 (同じzIndexならモジュールキー順) に並べる。"""
+    return sorted(assets, key=lambda asset: (asset['zIndex'], asset['moduleKey']))
+
+def build_plant_entry(
+    seed_type: str,
+    plant_type: str,
+    plants_config: Dict[str, Any],
+    modules_config: Dict[str, Any],
+) -> PreloadEntry:
+    """1つのPlantのプリロードエントリを構築する (このPlantの画像だけを読む)。"""
+    assets: List[PreloadAsset] = []
+    for module_key in get_plant_module_keys(seed_type, plant_type, plants_config):
+        asset = describe_asset(module_key, modules_config.get(module_key, {}))
+        if asset is not None:
+            assets.append(asset)
+    return {
+        'seedType': seed_type,
+        'plantType': plant_type,
+        'totalBytes': sum(asset['byteSize'] for asset in assets),
+        'assets': sort_assets(assets),
+    }
+
+def build_seed_entry(seed_type: str, manifest: PreloadManifest) -> PreloadEntry:
+    """マニフェスト内のPlantエントリを集約し、Seedのエントリを構築する (画像は読み直さない)。"""
+    assets_by_path: Dict[str, PreloadAsset] = {}
+    for plant_entry in manifest['plants'].values():
+        if plant_entry['seedType'].lower() != seed_type.lower():
+            continue
+        for asset in plant_entry['assets']:
+            assets_by_path.setdefault(asset['imgPath'], asset)
+    assets = sort_assets(list(assets_by_path.values()))
+    return {
+        'totalBytes': sum(asset['byteSize'] for asset in assets),
+        'assets': assets,
+    }
+
+def load_preload_manifest() -> PreloadManifest:
+    """既存のマニフェストを読み込む (形式が古い/存在しない場合は空のマニフェスト)。"""
+    manifest = load_config(PRELOAD_MANIFEST_JSON_PATH)
+    if manifest.get('version') != PRELOAD_MANIFEST_VERSION:
+        return {'version': PRELOAD_MANIFEST_VERSION, 'plants': {}, 'seeds': {}}
+    return manifest
+
+# --- メインロジック関数 ---
+
+def update_preload_manifest_for_plant(seed_type: str, plant_type: str) -> PreloadManifest:
+    """
+    1つのPlantのエントリと、そのPlantが属するSeedのエントリだけを再生成する。
+    create_new_plant の最後に呼び出され、他のPlantの画像は読み直さない。
+    Plantがカタログから消えている場合はエントリを削除する。
+
+    Args:
+        seed_type: 種のタイプ
+        plant_type: 植物のタイプ
+
+    Returns:
+        更新後のマニフェスト
+    """
+    plants_config = load_config(PLANTS_CONFIG_JSON_PATH)
+    modules_config = load_config(MODULES_CONFIG_JSON_PATH)
+    manifest = load_preload_manifest()
+
+    plant_key = get_plant_key(seed_type, plant_type)
+    if plant_key in plants_config:
+        manifest['plants'][plant_key] = build_plant_entry(seed_type.lower(), plant_type, plants_config, modules_config)
+    else:
+        manifest['plants'].pop(plant_key, None)
+
+    seed_entry = build_seed_entry(seed_type, manifest)
+    if seed_entry['assets']:
+        manifest['seeds'][seed_type.lower()] = seed_entry
+    else:
+        manifest['seeds'].pop(seed_type.lower(), None)
+
+    save_config(PRELOAD_MANIFEST_JSON_PATH, manifest)
+    print(f"[ACTION] Preload manifest updated for {plant_key}: {PRELOAD_MANIFEST_JSON_PATH}")
+    return manifest
+
+def rebuild_preload_manifest() -> PreloadManifest:
+    """カタログ全体からマニフェストを作り直す。"""
+    seeds_config = load_config(SEEDS_CONFIG_JSON_PATH)
+    plants_config = load_config(PLANTS_CONFIG_JSON_PATH)
+    modules_config = load_config(MODULES_CONFIG_JSON_PATH)
+
+    manifest: PreloadManifest = {'version': PRELOAD_MANIFEST_VERSION, 'plants': {}, 'seeds': {}}
+    for seed_type, seed_setting in seeds_config.items():
+        for plant_type in seed_setting.get('plants', {}):
+            plant_key = get_plant_key(seed_type, plant_type)
+            if plant_key in plants_config:
+                manifest['plants'][plant_key] = build_plant_entry(seed_type, plant_type, plants_config, modules_config)
+        seed_entry = build_seed_entry(seed_type, manifest)
+        if seed_entry['assets']:
+            manifest['seeds'][seed_type] = seed_entry
+
+    save_config(PRELOAD_MANIFEST_JSON_PATH, manifest)
+    total_assets = sum(len(entry['assets']) for entry in manifest['plants'].values())
+    print(f"[ACTION] Preload manifest rebuilt ({len(manifest['plants'])} plant(s), {total_assets} asset(s)): {PRELOAD_MANIFEST_JSON_PATH}")
+    return manifest
+
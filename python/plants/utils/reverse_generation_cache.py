@@ -0,0 +1,183 @@
+import os
+import copy
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH, CACHE_DIR
+from utils.config_io_utils import load_config, save_config
+
+
+# -------------------------
+
+# プロセス内LRUキャッシュの最大エントリ数
+REVERSE_CACHE_MAX_ENTRIES = 256
+
+# ディスクキャッシュを使うかどうか (別プロセスのプレビューツールとも結果を共有する)
+REVERSE_CACHE_USE_DISK = True
+REVERSE_CACHE_DISK_PATH = os.path.join(CACHE_DIR, 'reverse_generation_cache.json')
+
+# Trueの場合、フィンガープリントに mtime/size ではなくファイル内容のハッシュを使う
+# (同一時刻・同一サイズの外部編集も検出できるが、毎回ファイル全体を読む)
+REVERSE_CACHE_USE_CONTENT_HASH = False
+
+# 逆生成が参照する設定ファイル
+FINGERPRINT_TARGETS = (SEEDS_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, MODULES_CONFIG_JSON_PATH)
+
+# --- データ構造の定義 (型ヒント用) ---
+# 設定ファイルごとの [mtime_ns, size] または [content_hash]
+ConfigFingerprint = List[List[Any]]
+
+# { 'plantKey': PLANT_KEY, 'fingerprint': ConfigFingerprint, 'result': new_plants.json 形式の辞書 }
+CacheEntry = Dict[str, Any]
+
+# プロセス内LRUキャッシュ { キャッシュキー (get_reverse_cache_key の値): CacheEntry }
+_memory_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+# --- ヘルパー関数定義 ---
+
+def get_reverse_cache_key(seed_type: str, plant_type: str) -> str:
+    """
+    逆生成結果のキャッシュキーを返す。
+    逆生成は seeds_config を小文字のSeedキーと大文字小文字を区別するPlant名で引くため、
+    大文字化した PLANT_KEY ではなく同じ正規化 (Seedのみ小文字) でキーを作る。
+    """
+    return f"{seed_type.lower()}/{plant_type}"
+
+def get_config_fingerprint(use_content_hash: Optional[bool] = None) -> ConfigFingerprint:
+    """
+    3つの設定ファイルのフィンガープリントを返す。
+    デフォルトは stat の mtime/size のみで、JSONのパースは行わない。
+    """
+    if use_content_hash is None:
+        use_content_hash = REVERSE_CACHE_USE_CONTENT_HASH
+
+    fingerprint: ConfigFingerprint = []
+    for path in FINGERPRINT_TARGETS:
+        try:
+            if use_content_hash:
+                with open(path, 'rb') as f:
+                    fingerprint.append([hashlib.sha256(f.read()).hexdigest()])
+            else:
+                stat = os.stat(path)
+                fingerprint.append([stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            fingerprint.append([None])
+    return fingerprint
+
+def _load_disk_cache() -> Dict[str, CacheEntry]:
+    return load_config(REVERSE_CACHE_DISK_PATH) if REVERSE_CACHE_USE_DISK else {}
+
+def _save_disk_cache(disk_cache: Dict[str, CacheEntry]) -> None:
+    if not REVERSE_CACHE_USE_DISK:
+        return
+    try:
+        save_config(REVERSE_CACHE_DISK_PATH, disk_cache)
+    except IOError as e:
+        print(f"[WARNING] Failed to write reverse generation cache: {e}")
+
+def _remember(cache_key: str, entry: CacheEntry) -> None:
+    """LRUキャッシュにエントリを追加し、上限を超えた古いエントリを捨てる。"""
+    _memory_cache[cache_key] = entry
+    _memory_cache.move_to_end(cache_key)
+    while len(_memory_cache) > REVERSE_CACHE_MAX_ENTRIES:
+        _memory_cache.popitem(last=False)
+
+# --- メインロジック関数 ---
+
+def lookup_reverse_result(cache_key: str) -> Tuple[Optional[Dict[str, Any]], ConfigFingerprint]:
+    """
+    キャッシュから逆生成結果を探す。
+    プロセス内LRU → ディスクの順に参照し、現在の設定ファイルのフィンガープリントと一致する場合のみヒットとする。
+
+    Args:
+        cache_key: 対象Plantのキャッシュキー (get_reverse_cache_key の値)
+
+    Returns:
+        (結果のコピー または None, 現在のフィンガープリント)
+        ミスした場合、呼び出し側は計算後にこのフィンガープリントで store_reverse_result を呼ぶ
+    """
+    fingerprint = get_config_fingerprint()
+
+    entry = _memory_cache.get(cache_key)
+    if entry is not None and entry['fingerprint'] == fingerprint:
+        _memory_cache.move_to_end(cache_key)
+        return copy.deepcopy(entry['result']), fingerprint
+
+    disk_entry = _load_disk_cache().get(cache_key)
+    if disk_entry is not None and disk_entry.get('fingerprint') == fingerprint:
+        _remember(cache_key, disk_entry)
+        return copy.deepcopy(disk_entry['result']), fingerprint
+
+    return None, fingerprint
+
+def store_reverse_result(
+    cache_key: str,
+    plant_key: str,
+    fingerprint: ConfigFingerprint,
+    result: Dict[str, Any],
+) -> None:
+    """
+    逆生成結果をキャッシュに保存する。
+    plant_key は invalidate_reverse_result でエントリを破棄するために記録する。
+    fingerprint には計算を始める前に取得した値 (lookup_reverse_result の戻り値) を渡すこと。
+    """
+    entry: CacheEntry = {'plantKey': plant_key, 'fingerprint': fingerprint, 'result': copy.deepcopy(result)}
+    _remember(cache_key, entry)
+
+    if REVERSE_CACHE_USE_DISK:
+        disk_cache = _load_disk_cache()
+        disk_cache[cache_key] = entry
+        _save_disk_cache(disk_cache)
+
+def _update_cached_results(plant_key: Optional[str], previous_fingerprint: ConfigFingerprint) -> None:
+    """
+    plant_key のPlantのエントリ (表記の違う呼び出しごとに複数ありうる) を破棄し、
+    previous_fingerprint のエントリを現在のフィンガープリントに付け替える。
+    """
+    current = get_config_fingerprint()
+
+    if plant_key is not None:
+        for cache_key in [key for key, entry in _memory_cache.items() if entry.get('plantKey') == plant_key]:
+            del _memory_cache[cache_key]
+    for entry in _memory_cache.values():
+        if entry['fingerprint'] == previous_fingerprint:
+            entry['fingerprint'] = current
+
+    if REVERSE_CACHE_USE_DISK and os.path.exists(REVERSE_CACHE_DISK_PATH):
+        disk_cache = _load_disk_cache()
+        if plant_key is not None:
+            disk_cache = {key: entry for key, entry in disk_cache.items() if entry.get('plantKey') != plant_key}
+        for entry in disk_cache.values():
+            if entry.get('fingerprint') == previous_fingerprint:
+                entry['fingerprint'] = current
+        _save_disk_cache(disk_cache)
+
+def invalidate_reverse_result(plant_key: str, previous_fingerprint: ConfigFingerprint) -> None:
+    """
+    create_new_plant / create_new_module が設定ファイルを書き換えた直後に呼び出す。
+    変更されたPlantのエントリだけを破棄し、他のPlantのエントリは
+    書き込み前のフィンガープリントと一致していれば新しいフィンガープリントに付け替えて有効のまま残す。
+
+    Args:
+        plant_key: 変更されたPlantのキー (get_plant_key の値)
+        previous_fingerprint: 書き込み直前に取得したフィンガープリント
+    """
+    _update_cached_results(plant_key, previous_fingerprint)
+
+def retag_reverse_results(previous_fingerprint: ConfigFingerprint) -> None:
+    """
+    flush_config_batch でまとめて書き込んだ直後に呼び出す。
+    変更されたPlantのエントリはバッチ中の invalidate_reverse_result で破棄済みのため、
+    残りのエントリを新しいフィンガープリントに付け替える。
+
+    Args:
+        previous_fingerprint: 書き込み直前に取得したフィンガープリント
+    """
+    _update_cached_results(None, previous_fingerprint)
+
+def clear_reverse_cache() -> None:
+    """プロセス内とディスクのキャッシュをすべて破棄する。"""
+    _memory_cache.clear()
+    if REVERSE_CACHE_USE_DISK and os.path.exists(REVERSE_CACHE_DISK_PATH):
+        os.remove(REVERSE_CACHE_DISK_PATH)
@@ -0,0 +1,444 @@
+import os
+import hashlib
+from typing import Dict, Any, List, Tuple, Optional
+
+from config import (
+    MODULES_CONFIG_JSON_PATH, PLANTS_CONFIG_JSON_PATH, SEEDS_CONFIG_JSON_PATH,
+    ROOT_DIR_KEY, ATLAS_DIR_KEY, PLANTS_DIR_KEY, ATLAS_MANIFEST_JSON_PATH,
+)
+from utils.module_config_utils import get_plant_key, get_plant_module_keys, get_local_file_path
+from utils.config_io_utils import load_config, save_config
+from utils.png_utils import RgbaImage, decode_png, encode_png, create_blank_image, blit_image
+
+
+# -------------------------
+
+# --- データ構造の定義 (型ヒント用) ---
+# (x, y, width, height) の矩形
+Rect = Tuple[int, int, int, int]
+
+# modules_config に記録するアトラスフレームに対応する辞書の型エイリアス
+AtlasFrame = Dict[str, Any] # 'atlasPath', 'x', 'y', 'width', 'height'を含む
+
+# アトラス1枚分の入力定義 { 'atlasPath': str, 'moduleKeys': [str, ...] }
+AtlasGroup = Dict[str, Any]
+
+ATLAS_SCOPES = ('plant', 'seed')
+
+# --- ビンパッキング (MaxRects, Best Short Side Fit) ---
+
+def _split_free_rect(free: Rect, used: Rect) -> List[Rect]:
+    """usedと重なるfree矩形を、重ならない最大4つの矩形に分割する。"""
+    fx, fy, fw, fh = free
+    ux, uy, uw, uh = used
+    if ux >= fx + fw or ux + uw <= fx or uy >= fy + fh or uy + uh <= fy:
+        return [free]
+
+    result: List[Rect] = []
+    if uy > fy: # 上側
+        result.append((fx, fy, fw, uy - fy))
+    if uy + uh < fy + fh: # 下側
+        result.append((fx, uy + uh, fw, fy + fh - (uy + uh)))
+    if ux > fx: # 左側
+        result.append((fx, fy, ux - fx, fh))
+    if ux + uw < fx + fw: # 右側
+        result.append((ux + uw, fy, fx + fw - (ux + uw), fh))
+    return result
+
+def _prune_free_rects(free_rects: List[Rect]) -> List[Rect]:
+    """他の矩形に完全に含まれる空き矩形を除去する。"""
+    pruned: List[Rect] = []
+    for i, (ax, ay, aw, ah) in enumerate(free_rects):
+        contained = False
+        for j, (bx, by, bw, bh) in enumerate(free_rects):
+            if i == j:
+                continue
+            if ax >= bx and ay >= by and ax + aw <= bx + bw and ay + ah <= by + bh:
+                # 同一矩形の場合は先に出現した方だけ残す
+                if (ax, ay, aw, ah) != (bx, by, bw, bh) or j < i:
+                    contained = True
+                    break
+        if not contained:
+            pruned.append((ax, ay, aw, ah))
+    return pruned
+
+def _pack_into_width(
+    sizes: List[Tuple[str, int, int]],
+    bin_width: int,
+) -> Optional[Tuple[int, Dict[str, Rect]]]:
+    """
+    固定幅・高さ無制限のビンに矩形を詰める。
+
+    Returns:
+        (使用した高さ, {key: 配置矩形}) / 幅に収まらない矩形がある場合はNone
+    """
+    bin_height = sum(h for _, _, h in sizes)
+    free_rects: List[Rect] = [(0, 0, bin_width, bin_height)]
+    placements: Dict[str, Rect] = {}
+
+    for key, w, h in sizes:
+        best: Optional[Rect] = None
+        best_score: Tuple[int, int, int] = (0, 0, 0)
+        for fx, fy, fw, fh in free_rects:
+            if w > fw or h > fh:
+                continue
+            short_side = min(fw - w, fh - h)
+            long_side = max(fw - w, fh - h)
+            # 高さを抑えるため、同スコアの場合は上にある空きを優先する
+            score = (fy, short_side, long_side)
+            if best is None or score < best_score:
+                best = (fx, fy, w, h)
+                best_score = score
+        if best is None:
+            return None
+
+        placements[key] = best
+        split_rects: List[Rect] = []
+        for free in free_rects:
+            split_rects.extend(_split_free_rect(free, best))
+        free_rects = _prune_free_rects(split_rects)
+
+    used_height = max((y + h for _, y, _, h in placements.values()), default=0)
+    return used_height, placements
+
+def pack_rectangles(
+    sizes: Dict[str, Tuple[int, int]],
+    max_width: int = 2048,
+    padding: int = 2,
+) -> Tuple[int, int, Dict[str, Rect]]:
+    """
+    矩形群を1枚のシートに詰め込む (回転なし)。
+    2の累乗の候補幅を順に試し、面積が最小になる配置を採用する。
+
+    Args:
+        sizes: {key: (width, height)}
+        max_width: シートの最大幅
+        padding: 矩形同士の間隔 (ピクセル)
+
+    Returns:
+        (シート幅, シート高さ, {key: (x, y, width, height)}) ※矩形はパディングを含まない
+
+    Raises:
+        ValueError: max_widthより幅の広い矩形がある場合
+    """
+    if not sizes:
+        return 0, 0, {}
+
+    # 面積の大きい順に詰めると充填率が上がる
+    padded = sorted(
+        ((key, w + padding, h + padding) for key, (w, h) in sizes.items()),
+        key=lambda item: (item[1] * item[2], max(item[1], item[2])),
+        reverse=True,
+    )
+    widest = max(w for _, w, _ in padded)
+    if widest - padding > max_width:
+        raise ValueError(f"Image width {widest - padding}px exceeds atlas max width {max_width}px.")
+
+    candidate_widths: List[int] = []
+    width = 1
+    while width < widest:
+        width *= 2
+    while width < max_width:
+        candidate_widths.append(width)
+        width *= 2
+    candidate_widths.append(max_width + padding)
+
+    best_result: Optional[Tuple[int, int, Dict[str, Rect]]] = None
+    for bin_width in candidate_widths:
+        packed = _pack_into_width(padded, bin_width)
+        if packed is None:
+            continue
+        used_height, placements = packed
+        used_width = max(x + w for x, _, w, _ in placements.values())
+        if best_result is None or used_width * used_height < best_result[0] * best_result[1]:
+            best_result = (used_width, used_height, placements)
+
+    assert best_result is not None # 最大幅では必ず配置できる
+    sheet_width, sheet_height, placements = best_result
+    frames = {
+        key: (x, y, w - padding, h - padding)
+        for key, (x, y, w, h) in placements.items()
+    }
+    return sheet_width - padding, sheet_height - padding, frames
+
+# --- アトラスの構成 ---
+
+def get_atlas_path(seed_type: str, plant_type: Optional[str] = None) -> str:
+    """
+    アトラスPNGの保存パスを生成する。
+
+    Returns:
+        Plant単位: 'public/assets/images/plantModules/atlases/science/plants/tulipb.png'
+        Seed単位:  'public/assets/images/plantModules/atlases/science/science.png'
+    """
+    if plant_type is None:
+        return os.path.join(ROOT_DIR_KEY, ATLAS_DIR_KEY, seed_type.lower(), f"{seed_type.lower()}.png")
+    return os.path.join(
+        ROOT_DIR_KEY, ATLAS_DIR_KEY, seed_type.lower(), PLANTS_DIR_KEY, f"{plant_type.lower()}.png"
+    )
+
+def collect_atlas_groups(
+    seeds_config: Dict[str, Any],
+    plants_config: Dict[str, Any],
+    scope: str = 'plant',
+    seed_type: Optional[str] = None,
+    plant_type: Optional[str] = None,
+) -> Dict[str, AtlasGroup]:
+    """
+    設定カタログからアトラスの単位 (Plantごと / Seedごと) を列挙する。
+
+    Args:
+        scope: 'plant' (Plantごとに1枚) または 'seed' (Seedごとに1枚)
+        seed_type: 指定した場合、このSeedのみを対象にする
+        plant_type: 指定した場合、このPlantのみを対象にする (scope='plant'のみ)
+
+    Returns:
+        {グループ名: {'atlasPath': str, 'moduleKeys': [str, ...]}}
+    """
+    if scope not in ATLAS_SCOPES:
+        raise ValueError(f"Unknown atlas scope: {scope}. Use one of {ATLAS_SCOPES}.")
+
+    groups: Dict[str, AtlasGroup] = {}
+    for seed_key, seed_setting in seeds_config.items():
+        if seed_type and seed_key != seed_type.lower():
+            continue
+
+        seed_module_keys: List[str] = []
+        for plant_key in seed_setting.get('plants', {}):
+            if plant_type and scope == 'plant' and plant_key.lower() != plant_type.lower():
+                continue
+            module_keys = get_plant_module_keys(seed_key, plant_key, plants_config)
+            if scope == 'plant':
+                groups[get_plant_key(seed_key, plant_key)] = {
+                    'atlasPath': get_atlas_path(seed_key, plant_key),
+                    'moduleKeys': module_keys,
+                }
+            else:
+                seed_module_keys.extend(module_keys)
+
+        if scope == 'seed' and seed_module_keys:
+            groups[seed_key.upper()] = {
+                'atlasPath': get_atlas_path(seed_key),
+                'moduleKeys': seed_module_keys,
+            }
+    return groups
+
+def read_module_images(
+    module_keys: List[str],
+    modules_config: Dict[str, Any],
+) -> Dict[str, bytes]:
+    """モジュールの imgPath から画像バイト列を読み込む (読めないものは警告してスキップ)。"""
+    images: Dict[str, bytes] = {}
+    for module_key in module_keys:
+        img_path = modules_config.get(module_key, {}).get('imgPath')
+        if not img_path:
+            print(f"[WARNING] Module Setting or imgPath not found for key: {module_key}. Skipping.")
+            continue
+        try:
+            with open(get_local_file_path(img_path), 'rb') as f:
+                images[module_key] = f.read()
+        except OSError as e:
+            print(f"[WARNING] Failed to read image for {module_key}: {e}. Skipping.")
+    return images
+
+def compute_atlas_input_hash(images: Dict[str, bytes], max_width: int, padding: int) -> str:
+    """アトラスの入力 (モジュールキー・画像内容・パッキング設定) からハッシュを計算する。"""
+    hasher = hashlib.sha256(f"{max_width}:{padding}".encode('utf-8'))
+    for module_key in sorted(images):
+        hasher.update(module_key.encode('utf-8'))
+        hasher.update(hashlib.sha256(images[module_key]).digest())
+    return hasher.hexdigest()
+
+def render_atlas(
+    images: Dict[str, bytes],
+    max_width: int,
+    padding: int,
+) -> Tuple[Optional[bytes], Dict[str, Rect]]:
+    """
+    画像群をデコードして1枚のアトラスPNGにまとめる。
+
+    Returns:
+        (アトラスPNGバイト列, {module_key: フレーム矩形}) / 有効な画像が無い場合は (None, {})
+
+    Raises:
+        ValueError: max_widthより幅の広い画像がある場合
+    """
+    decoded: Dict[str, RgbaImage] = {}
+    for module_key, data in images.items():
+        try:
+            decoded[module_key] = decode_png(data)
+        except ValueError as e:
+            print(f"[WARNING] Failed to decode PNG for {module_key}: {e}. Excluded from atlas.")
+
+    if not decoded:
+        return None, {}
+
+    sheet_width, sheet_height, frames = pack_rectangles(
+        {key: (img.width, img.height) for key, img in decoded.items()},
+        max_width=max_width,
+        padding=padding,
+    )
+    sheet = create_blank_image(sheet_width, sheet_height)
+    for module_key, (x, y, _, _) in frames.items():
+        blit_image(sheet, decoded[module_key], x, y)
+    return encode_png(sheet), frames
+
+def apply_atlas_frames(
+    modules_config: Dict[str, Any],
+    module_keys: List[str],
+    atlas_path: str,
+    frames: Dict[str, Rect],
+) -> bool:
+    """
+    modules_config の各モジュールに atlasFrame を記録する。
+    アトラスに含まれなかったモジュールからは古い atlasFrame を削除する。
+
+    Returns:
+        modules_config が変更されたかどうか
+    """
+    changed = False
+    for module_key in module_keys:
+        module_setting = modules_config.get(module_key)
+        if module_setting is None:
+            continue
+        if module_key in frames:
+            x, y, w, h = frames[module_key]
+            new_frame: AtlasFrame = {'atlasPath': atlas_path, 'x': x, 'y': y, 'width': w, 'height': h}
+            if module_setting.get('atlasFrame') != new_frame:
+                module_setting['atlasFrame'] = new_frame
+                changed = True
+        elif module_setting.get('atlasFrame', {}).get('atlasPath') == atlas_path:
+            del module_setting['atlasFrame']
+            changed = True
+    return changed
+
+def find_conflicting_atlas_frames(modules_config: Dict[str, Any], groups: Dict[str, AtlasGroup]) -> List[str]:
+    """
+    別のアトラス (もう一方のスコープでビルドしたものなど) の atlasFrame を持つモジュールを列挙する。
+    atlasFrame はモジュールごとに1つしか持てないため、スコープを混在させると互いに上書きしてしまう。
+    """
+    conflicts: List[str] = []
+    for group in groups.values():
+        for module_key in group['moduleKeys']:
+            atlas_frame = modules_config.get(module_key, {}).get('atlasFrame')
+            if atlas_frame and atlas_frame.get('atlasPath') != group['atlasPath']:
+                conflicts.append(module_key)
+    return conflicts
+
+def discard_atlases(atlas_paths: List[str]) -> List[str]:
+    """
+    アトラスPNGとアトラスマニフェストのエントリを削除する (次回のビルドで必ず作り直される)。
+
+    Returns:
+        削除したアトラスPNGのパス
+    """
+    atlas_manifest = load_config(ATLAS_MANIFEST_JSON_PATH)
+    removed: List[str] = []
+    for atlas_path in atlas_paths:
+        atlas_manifest.pop(atlas_path, None)
+        if os.path.exists(atlas_path):
+            os.remove(atlas_path)
+            removed.append(atlas_path)
+    save_config(ATLAS_MANIFEST_JSON_PATH, atlas_manifest)
+    return removed
+
+# --- メインロジック関数 ---
+
+def build_sprite_atlases(
+    scope: str = 'plant',
+    seed_type: Optional[str] = None,
+    plant_type: Optional[str] = None,
+    max_width: int = 2048,
+    padding: int = 2,
+    force: bool = False,
+) -> Dict[str, str]:
+    """
+    モジュール画像をPlant単位またはSeed単位のアトラスPNGにまとめ、
+    各モジュールのフレーム矩形を modules_config.json に記録する。
+    入力 (画像内容とパッキング設定) が前回ビルドから変わっていないアトラスは再生成しない。
+
+    Args:
+        scope: 'plant' または 'seed'
+        seed_type: 対象のSeedを絞り込む (Noneの場合はすべて)
+        plant_type: 対象のPlantを絞り込む (Noneの場合はすべて)
+        max_width: アトラスの最大幅
+        padding: フレーム間の余白 (ピクセル)
+        force: Trueの場合、入力が変わっていなくても再生成し、別スコープの atlasFrame も置き換える
+
+    Returns:
+        {グループ名: 'built' | 'skipped' | 'empty' | 'failed'}
+        別スコープの atlasFrame を持つモジュールがあり force=False の場合は何も変更せず空の辞書を返す
+    """
+    print(f"\n--- [START] Building Sprite Atlases (scope: {scope}, force: {force}) ---")
+
+    seeds_config = load_config(SEEDS_CONFIG_JSON_PATH)
+    plants_config = load_config(PLANTS_CONFIG_JSON_PATH)
+    modules_config = load_config(MODULES_CONFIG_JSON_PATH)
+    atlas_manifest = load_config(ATLAS_MANIFEST_JSON_PATH)
+
+    groups = collect_atlas_groups(seeds_config, plants_config, scope, seed_type, plant_type)
+
+    conflicts = find_conflicting_atlas_frames(modules_config, groups)
+    if conflicts:
+        if not force:
+            print(
+                f"[FATAL ERROR] {len(conflicts)} module(s) already have atlas frames from another atlas "
+                f"(e.g. {conflicts[0]}). Mixing atlas scopes is not supported. "
+                "Re-run with --force to replace them with this scope."
+            )
+            return {}
+        print(f"[WARNING] Replacing atlas frames of {len(conflicts)} module(s) built with another atlas scope.")
+
+    results: Dict[str, str] = {}
+    modules_changed = False
+
+    for group_name, group in groups.items():
+        atlas_path = group['atlasPath']
+        module_keys = group['moduleKeys']
+        images = read_module_images(module_keys, modules_config)
+        input_hash = compute_atlas_input_hash(images, max_width, padding)
+
+        previous = atlas_manifest.get(atlas_path, {})
+        if not force and previous.get('inputHash') == input_hash and os.path.exists(atlas_path):
+            # 入力が同じなら前回のフレームを再適用するだけ (create_new_moduleで消えた場合に備える)
+            frames = {key: tuple(rect) for key, rect in previous.get('frames', {}).items()}
+            modules_changed |= apply_atlas_frames(modules_config, module_keys, atlas_path, frames)
+            results[group_name] = 'skipped'
+            print(f"[INFO] Atlas up to date, skipped: {atlas_path}")
+            continue
+
+        try:
+            atlas_bytes, frames = render_atlas(images, max_width, padding)
+        except ValueError as e:
+            # 最大幅に収まらない画像がある場合は、このグループだけを諦める (既存のアトラスとフレームはそのまま)
+            results[group_name] = 'failed'
+            print(f"[WARNING] Failed to pack atlas for {group_name}: {e}. Atlas not written.")
+            continue
+        if atlas_bytes is None:
+            modules_changed |= apply_atlas_frames(modules_config, module_keys, atlas_path, {})
+            atlas_manifest.pop(atlas_path, None)
+            results[group_name] = 'empty'
+            print(f"[WARNING] No decodable module images for {group_name}. Atlas not written.")
+            continue
+
+        os.makedirs(os.path.dirname(atlas_path), exist_ok=True)
+        with open(atlas_path, 'wb') as f:
+            f.write(atlas_bytes)
+        print(f"[ACTION] Atlas saved to: {atlas_path} ({len(frames)} frame(s), {len(atlas_bytes)} bytes)")
+
+        atlas_manifest[atlas_path] = {
+            'inputHash': input_hash,
+            'frames': {key: list(rect) for key, rect in frames.items()},
+        }
+        modules_changed |= apply_atlas_frames(modules_config, module_keys, atlas_path, frames)
+        results[group_name] = 'built'
+
+    if modules_changed:
+        save_config(MODULES_CONFIG_JSON_PATH, modules_config)
+        print(f"[ACTION] Atlas frames saved back to: {MODULES_CONFIG_JSON_PATH}")
+    save_config(ATLAS_MANIFEST_JSON_PATH, atlas_manifest)
+
+    built = sum(1 for status in results.values() if status == 'built')
+    failed = sum(1 for status in results.values() if status == 'failed')
+    print(f"--- [SUCCESS] Sprite atlas build completed. Built: {built}, Failed: {failed}, Total: {len(results)} ---")
+    return results
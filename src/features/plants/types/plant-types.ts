@@ -8,12 +8,35 @@ export interface ModuleStructure {
   moduleType: string;
 }
 
+/**
+ * スプライトアトラス内でのモジュール画像の位置
+ */
+export interface ModuleAtlasFrame {
+  atlasPath: string; // アトラス画像のパス
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+}
+
+/**
+ * モジュール画像の解像度違いのバリエーション (LOD)
+ */
+export interface ModuleImageVariant {
+  scale: number; // 元画像に対する倍率 (1, 0.5, 0.25 など)
+  imgPath: string; // 画像パス
+  width: number;
+  height: number;
+}
+
 /**
  * 静的なモジュール設定情報（画像パスなど）
  */
 export interface ModuleSetting {
   imgPath: string; // 画像パス
   zIndex: number; // レンダリングのためのZ-Index
+  atlasFrame?: ModuleAtlasFrame; // アトラスビルド済みの場合のみ存在
+  variants?: ModuleImageVariant[]; // 縮小画像を生成した場合のみ存在 (倍率の降順)
 }
 
 /**
@@ -58,3 +81,33 @@ export interface PlantConfigs {
   PLANT_SETTINGS: Record<string, PlantSetting>;
   MODULE_SETTINGS: Record<string, ModuleSetting>;
 }
+
+/**
+ * プリロード対象の1アセット (preload_manifest.json)
+ */
+export interface PreloadAsset {
+  moduleKey: string;
+  imgPath: string;
+  zIndex: number;
+  byteSize: number; // 進捗表示に使うファイルサイズ
+  hash: string; // 画像内容のSHA-256
+}
+
+/**
+ * Plant/Seedごとのプリロード情報 (assetsはzIndex順)
+ */
+export interface PreloadEntry {
+  seedType?: string; // Plantのエントリのみ
+  plantType?: string; // Plantのエントリのみ
+  totalBytes: number;
+  assets: PreloadAsset[];
+}
+
+/**
+ * Python側のカタログ生成時に出力されるプリロードマニフェスト
+ */
+export interface PreloadManifest {
+  version: number;
+  plants: Record<string, PreloadEntry>;
+  seeds: Record<string, PreloadEntry>;
+}